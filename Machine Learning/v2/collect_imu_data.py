@@ -1,3 +1,5 @@
+import os
+import sys
 import board
 import adafruit_tca9548a
 import time
@@ -5,22 +7,14 @@ import numpy as np
 import csv
 from micropython_bmi270 import bmi270
 
-class I2CWrapper:
-    def __init__(self, i2c_obj, address):
-        self._i2c = i2c_obj
-        self._address = address
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
 
-    def readfrom_mem(self, addr, reg, length, *_):
-        self._i2c.writeto(self._address, bytes([reg]))
-        result = bytearray(length)
-        self._i2c.readfrom_into(self._address, result)
-        return result
-
-    def writeto_mem(self, addr, reg, data, *_):
-        self._i2c.writeto(self._address, bytes([reg]) + bytes(data))
+# The same register access and gap filling the recognizer uses, so recorded data matches what it sees
+from signspeak.imu import BMI270_ADDRESS, I2CWrapper
+from signspeak.multibus import fill_gaps
 
 # Constants
-address_bmi270 = 0x68
+address_bmi270 = BMI270_ADDRESS
 
 # Initialize I2C and multiplexer
 i2c = board.I2C()
@@ -39,6 +33,7 @@ for channel in range(8):
 
 # Initialize sensors only on valid channels
 sensors = {}
+imu_buses = {}
 for channel in used_channels:
     if tca[channel].try_lock():
         addresses = tca[channel].scan()
@@ -46,38 +41,59 @@ for channel in used_channels:
             print(f"Initializing BMI270 on channel {channel}")
             wrapped_i2c = I2CWrapper(tca[channel], address_bmi270)
             sensors[channel] = bmi270.BMI270(wrapped_i2c)
+            wrapped_i2c.load_scales()
+            imu_buses[channel] = wrapped_i2c
         tca[channel].unlock()
 
-def collect_reading(used_channels, sensors):
+def read_channel(channel, deadline):
+    """Reads one IMU, retrying a busy bus or failed transfer until the tick deadline; None if it never succeeds."""
+    while True:
+        if tca[channel].try_lock():
+            try:
+                return imu_buses[channel].read_imu()
+            except OSError:
+                pass
+            finally:
+                tca[channel].unlock()
+            time.sleep(0.0005)  # Back off so a failing sensor does not flood the bus
+        if time.perf_counter() >= deadline:
+            return None
+
+def collect_reading(used_channels, imu_buses):
     for j in range(3, 0, -1):
         print(f"Starting in {j} seconds...")
         time.sleep(1)
     print("Now: Perform Gesture")
 
     start_total = time.perf_counter()
-    gesture_data_list = []
 
     gesture_length_seconds = 1
     gesture_datapoints = 10
     datapoints_per_reading = 6
-    max_readings = len(used_channels) * datapoints_per_reading * gesture_datapoints
-    curr_reading = 0
+    period = gesture_length_seconds / gesture_datapoints
 
-    while curr_reading < max_readings:
-        for channel in used_channels:
-            if tca[channel].try_lock():
-                sensor = sensors[channel]
-                for datapt in sensor.acceleration:
-                    gesture_data_list.append(datapt)
-                for datapt in sensor.gyro:
-                    gesture_data_list.append(datapt)
-                curr_reading += datapoints_per_reading
-                tca[channel].unlock()
-        time.sleep(gesture_length_seconds / gesture_datapoints)
+    # One slot per (tick, sensor) so a missed read can never shift later readings
+    frames = np.zeros((gesture_datapoints, len(used_channels), datapoints_per_reading))
+    valid = np.zeros((gesture_datapoints, len(used_channels)), dtype=bool)
+    for t in range(gesture_datapoints):
+        deadline = start_total + (t + 1) * period
+        for i, channel in enumerate(used_channels):
+            reading = read_channel(channel, deadline)
+            if reading is not None:
+                frames[t, i] = reading
+                valid[t, i] = True
+        time.sleep(max(0.0, deadline - time.perf_counter()))
 
     duration = time.perf_counter() - start_total
     print(f"[⏱] Data collection time: {duration:.3f} seconds")
-    return gesture_data_list
+    try:
+        missed = fill_gaps(frames, valid)
+    except RuntimeError as e:
+        print(e)
+        return []  # A sensor never answered, nothing to interpolate from
+    if missed:
+        print(f"Interpolated {missed} missed readings")
+    return frames.reshape(-1).tolist()
 
 # Define gestures
 gestures = ["food", "hello", "yes", "no", "thank you"]
@@ -86,7 +102,7 @@ for gesture in gestures:
     batch = []
     while sample < 25:
         print(f"\nGesture: {gesture} | Sample {sample+1}/25")
-        reading = collect_reading(used_channels, sensors)
+        reading = collect_reading(used_channels, imu_buses)
         if len(reading) == 300:  # 5 IMUs × 6 × 10 = 300
             batch.append(reading + [gesture])
             sample += 1
@@ -1,3 +1,5 @@
+import os
+import sys
 import board
 import adafruit_tca9548a
 import bmi270
@@ -7,24 +9,13 @@ import numpy as np
 import Adafruit_BBIO
 from micropython_bmi270 import bmi270
 
-class I2CWrapper:
-    def __init__(self, i2c_obj, address):
-        self._i2c = i2c_obj
-        self._address = address
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
 
-    def readfrom_mem(self, addr, reg, length, *_):
-        """Reads data from the specified register."""
-        self._i2c.writeto(self._address, bytes([reg]))  # Set register
-        result = bytearray(length)
-        self._i2c.readfrom_into(self._address, result)
-        return result
-
-    def writeto_mem(self, addr, reg, data, *_):
-        """Writes data to the specified register."""
-        self._i2c.writeto(self._address, bytes([reg]) + bytes(data))
+# The recognizer's register access, so this script reads the sensors exactly as it does
+from signspeak.imu import BMI270_ADDRESS, I2CWrapper
 
 # Constants
-address_bmi270 = 0x68  # I2C address of the BMI270 sensor
+address_bmi270 = BMI270_ADDRESS  # I2C address of the BMI270 sensor
 address_multiplexer = 0x68
 
 # Initialize I2C bus
@@ -65,7 +56,18 @@ for channel in range(8):
 #         print(f"Error initializing BMI270 on channel {channel}: {e}")
 
 
-def collect_reading(used_channels):
+# --- Pre-initialize sensors once ---
+sensors = {}
+imu_buses = {}
+for channel in used_channels:
+    if tca[channel].try_lock():
+        wrapped_i2c = I2CWrapper(tca[channel], address_bmi270)
+        sensors[channel] = bmi270.BMI270(wrapped_i2c)
+        wrapped_i2c.load_scales()
+        imu_buses[channel] = wrapped_i2c
+        tca[channel].unlock()
+
+def collect_reading(used_channels, imu_buses):
     """
     returns a list of one gesture's readings over 1s
     """
@@ -79,12 +81,7 @@ def collect_reading(used_channels):
     while curr_reading < max_readings:
         for channel in used_channels:
             if tca[channel].try_lock():
-                wrapped_i2c = I2CWrapper(tca[channel], address_bmi270)
-                sensor = bmi270.BMI270(wrapped_i2c)
-                for datapt in sensor.acceleration:
-                    gesture_data_list.append(datapt)
-                for datapt in sensor.gyro:
-                    gesture_data_list.append(datapt)
+                gesture_data_list.extend(imu_buses[channel].read_imu())
                 curr_reading += datapoints_per_reading
             tca[channel].unlock()
         time.sleep(gesture_length_seconds/gesture_datapoints)
@@ -92,5 +89,5 @@ def collect_reading(used_channels):
 
 # to use, just put in the list of the channels used on multiplexer (0, 1, 2, 3, 7)
 # it returns a 300 point list of data points
-reading1 = collect_reading(used_channels)
+reading1 = collect_reading(used_channels, imu_buses)
 print(reading1)
\ No newline at end of file
@@ -1,6 +1,10 @@
+import os
+import sys
+
 import numpy as np
-import tensorflow.lite as tflite # This is for laptops/desktops
-# import tflite_runtime.interpreter as tflite # This is for BeagleBoneBlack
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from signspeak.batch import BatchInterpreter  # tflite_runtime on the BeagleBone, tensorflow.lite elsewhere
 
 # Load label mapping manually from a text file
 label_mapping = {}                                                           # Dictionary to store label mappings
@@ -27,26 +31,17 @@ with open("test.csv", "r") as f:                                             # O
 
 x_test = np.array(x_test, dtype=np.float32)                                  # Convert features to NumPy array
 
-# Load TensorFlow Lite model
-interpreter = tflite.Interpreter(model_path="SIGNSPEAK_MLP.tflite")          # Load trained TFLite model
-interpreter.allocate_tensors()                                               # Allocate memory for tensors
-
-input_details = interpreter.get_input_details()                              # Get input tensor details
-output_details = interpreter.get_output_details()                            # Get output tensor details
+# Load TensorFlow Lite model, with its batch dimension resized to the whole test set
+model = BatchInterpreter("SIGNSPEAK_MLP.tflite", max_batch=len(x_test))      # Load trained TFLite model
 
 correct_predictions = 0                                                      # Initialize correct predictions counter
 predictions_list = []                                                        # List to store (predicted, actual) pairs
 
-# Run inference on all test samples
-for i in range(len(x_test)):
-    sample = x_test[i]                                                       # Get one sample
-    sample = sample.reshape(1, 300)                                          # Ensure correct shape (1, 300)
-
-    interpreter.set_tensor(input_details[0]['index'], sample)                # Load input tensor
-    interpreter.invoke()                                                      # Run model inference
-    predictions = interpreter.get_tensor(output_details[0]['index'])         # Get model output
+# Run inference on all test samples in one invoke
+all_predictions = model.predict(x_test)                                      # One row of probabilities per sample
 
-    predicted_class = np.argmax(predictions)                                 # Get index of highest probability class
+for i in range(len(x_test)):
+    predicted_class = np.argmax(all_predictions[i])                          # Get index of highest probability class
     if predicted_class in label_mapping:                                     # Check if label exists
         predicted_gesture = label_mapping[predicted_class]                   # Convert index to gesture
     else:
@@ -1,3 +1,7 @@
+import os                                                                     # For locating the signspeak package
+import sys                                                                    # For importing the signspeak package
+
+import numpy as np                                                            # For the representative dataset
 import pandas as pd                                                           # For handling dataset operations
 import tensorflow as tf                                                       # For building and training the model
 
@@ -6,6 +10,9 @@ from sklearn.preprocessing import LabelEncoder                                #
 from tensorflow.keras import layers                                           # For defining neural network layers
 from tensorflow.keras.optimizers import Adam                                  # For optimizing training
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from signspeak.batch import compare_models                                    # For the float vs INT8 report
+
 # Load Dataset
 print("\n---- Dataset Info ----")
 gesture_data = pd.read_csv("final_data.csv", header=0)                        # Read dataset from CSV file and treat first row as header
@@ -71,4 +78,26 @@ tflite_model = converter.convert()                                            #
 tflite_model_path = "SIGNSPEAK_MLP_FINAL.tflite"                                    # Define TFLite model save path
 with open(tflite_model_path, "wb") as f:                                      # Open file to write
     f.write(tflite_model)                                                     # Save converted TFLite model
-print(f"TFLite model saved: {tflite_model_path}")                             # Print confirmation
\ No newline at end of file
+print(f"TFLite model saved: {tflite_model_path}")                             # Print confirmation
+
+# Full-integer INT8 model: weights, activations, input and output all int8
+def representative_dataset():
+    for sample in x_train[:300]:                                              # Calibrate on real windows from the dataset
+        yield [np.asarray(sample, dtype=np.float32).reshape(1, -1)]
+
+converter = tf.lite.TFLiteConverter.from_keras_model(model)                   # Convert model again for INT8
+converter.optimizations = [tf.lite.Optimize.DEFAULT]                          # Enable quantization
+converter.representative_dataset = representative_dataset                     # Activation ranges from training data
+converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]   # Integer-only kernels
+converter.inference_input_type = tf.int8                                      # The runtime quantizes windows itself
+converter.inference_output_type = tf.int8                                     # and dequantizes probabilities
+int8_model = converter.convert()                                              # Convert model to INT8 TFLite format
+
+int8_model_path = "SIGNSPEAK_MLP_INT8.tflite"                                 # Define INT8 model save path
+with open(int8_model_path, "wb") as f:                                        # Open file to write
+    f.write(int8_model)                                                       # Save INT8 model
+print(f"INT8 TFLite model saved: {int8_model_path}")                          # Print confirmation
+
+# Compare float and INT8 models on the test set
+print("\n---- Float vs INT8 ----")
+compare_models([tflite_model_path, int8_model_path], np.asarray(x_test, dtype=np.float32), y_test)
@@ -0,0 +1,68 @@
+# Host-side benchmark for BMI270.load_config in test2.py, run with CPython from this folder.
+# Counts I2C transactions and bytes on a fake bus for the old 2-byte upload and for
+# several burst sizes, and estimates the time each would take on a 400 kHz bus.
+
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import test2
+from signspeak.i2cdev import FakeI2C
+
+BUS_HZ = 400000
+BURSTS = [2, 16, 32, 64, 256, len(test2.CONFIG_BLOB)]
+
+
+class SleepCounter:
+    """Stands in for the time module so required delays are added up instead of waited."""
+
+    def __init__(self):
+        self.total = 0.0
+
+    def sleep(self, seconds):
+        self.total += seconds
+
+
+def fake_sensor_bus():
+    regs = bytearray(256)
+    regs[test2.CHIP_ID_REG] = 0x24
+    regs[test2.INTERNAL_STATUS_REG] = 0x01  # init OK
+    return FakeI2C({test2.I2C_ADDRESS: regs}, ports={test2.I2C_ADDRESS: {test2.CONFIG_WRITE_REG}})
+
+
+def legacy_load_config(sensor):
+    """The upload as it was: 2-byte writes with a 1 ms pause after each."""
+    sensor.write_byte(test2.INIT_CTRL_REG, 0x00)
+    test2.time.sleep(0.1)
+    for i in range(0, len(test2.CONFIG_DATA), 2):
+        sensor.i2c.writeto_mem(sensor.address, test2.CONFIG_WRITE_REG, bytes(test2.CONFIG_DATA[i:i + 2]))
+        test2.time.sleep(0.001)
+    sensor.write_byte(test2.INIT_CTRL_REG, 0x01)
+    test2.time.sleep(0.1)
+    sensor.read_bytes(test2.INIT_CTRL_REG, 1)
+
+
+def run(name, load):
+    bus = fake_sensor_bus()
+    sensor = test2.BMI270(bus)
+    test2.time = SleepCounter()
+    with contextlib.redirect_stdout(io.StringIO()):  # load_config's progress prints
+        load(sensor)
+    uploaded = bus.port_data[(test2.I2C_ADDRESS, test2.CONFIG_WRITE_REG)]
+    assert uploaded == test2.CONFIG_BLOB, "config blob arrived incomplete or out of order"
+    # start + address byte + payload bytes (9 clocks each with ACK) + stop per transaction
+    bus_s = (bus.transfers * (2 + 9) + bus.bytes * 9) / BUS_HZ
+    sleep_s = test2.time.total
+    print(f"{name:>12} {bus.transfers:>12} {bus.bytes:>8} {bus_s * 1000:>9.1f} {sleep_s * 1000:>9.1f} "
+          f"{(bus_s + sleep_s) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    print(f"{'upload':>12} {'transactions':>12} {'bytes':>8} {'bus ms':>9} {'sleep ms':>9} {'total ms':>9}")
+    run("legacy 2 B", legacy_load_config)
+    for burst in BURSTS:
+        run(f"burst {burst} B", lambda sensor: sensor.load_config(burst))
+    print("Per sensor; multiply by five for a full glove.")
@@ -0,0 +1,86 @@
+# Benchmark of the NumPy MLP engine against tflite.Interpreter, run with CPython:
+#   python bench_mlp_engine.py [model.tflite]   (default: Machine Learning/v3/SIGNSPEAK_MLP_FINAL.tflite)
+# Extracts the model's weights to an .npz, then loads each engine in a fresh interpreter
+# and reports import time, model load time, peak RSS and per-window latency, and how far
+# the NumPy outputs are from the TFLite ones on the same random windows.
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WINDOWS = 1000
+TOLERANCE = 1e-4
+DEFAULT_MODEL = os.path.join(ROOT, "Machine Learning", "v3", "SIGNSPEAK_MLP_FINAL.tflite")
+
+
+def measure(engine, model_path):
+    """Child side: time the import and the model, print the results as JSON."""
+    start = time.perf_counter()
+    if engine == "numpy":
+        from signspeak.npmlp import NumpyMLP as Engine
+    else:
+        from signspeak.batch import BatchInterpreter as Engine  # Imports tflite_runtime (or tensorflow.lite)
+    import_s = time.perf_counter() - start
+    import numpy as np
+
+    start = time.perf_counter()
+    model = Engine(model_path, max_batch=1)
+    model.warm()
+    load_s = time.perf_counter() - start
+
+    windows = np.random.default_rng(0).normal(0, 50, (WINDOWS,) + model.input_shape[1:]).astype(np.float32)
+    outputs = np.empty((WINDOWS, model.outputs), dtype=np.float32)
+    start = time.perf_counter()
+    for i in range(WINDOWS):
+        outputs[i] = model.predict([windows[i:i + 1]])[0]
+    latency_ms = (time.perf_counter() - start) / WINDOWS * 1e3
+    print(json.dumps({"import_s": import_s, "load_s": load_s, "latency_ms": latency_ms,
+                      "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                      "outputs": outputs.tolist()}))
+
+
+def run(engine, model_path):
+    result = subprocess.run([sys.executable, __file__, model_path, "--measure", engine],
+                            capture_output=True, text=True)
+    if result.returncode:
+        print(f"{engine}: failed\n{result.stderr.strip().splitlines()[-1]}")
+        return None
+    return json.loads(result.stdout)
+
+
+def main(model_path):
+    import numpy as np
+    from signspeak.npmlp import extract
+
+    with tempfile.TemporaryDirectory() as tmp:
+        npz_path = os.path.join(tmp, "model.npz")
+        extract(model_path, npz_path)
+        results = {"tflite": run("tflite", model_path), "numpy": run("numpy", npz_path)}
+    print(f"\n{'Engine':<8} {'Import':>9} {'Load':>9} {'Peak RSS':>9} {'Per window':>11}")
+    for engine, r in results.items():
+        if r is not None:
+            print(f"{engine:<8} {r['import_s'] * 1e3:>6.0f} ms {r['load_s'] * 1e3:>6.1f} ms "
+                  f"{r['rss_mb']:>6.1f} MB {r['latency_ms']:>8.3f} ms")
+    if all(results.values()):
+        diff = np.abs(np.array(results["numpy"]["outputs"]) - np.array(results["tflite"]["outputs"])).max()
+        print(f"\nMax output difference over {WINDOWS} windows: {diff:.2e} "
+              f"({'within' if diff <= TOLERANCE else 'OUTSIDE'} {TOLERANCE:g})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the NumPy MLP engine with tflite.Interpreter")
+    parser.add_argument("model_path", nargs="?", default=DEFAULT_MODEL, help=".tflite model to benchmark")
+    parser.add_argument("--measure", choices=("tflite", "numpy"), help=argparse.SUPPRESS)  # Child process side
+    args = parser.parse_args()
+    if args.measure:
+        measure(args.measure, args.model_path)
+    else:
+        main(args.model_path)
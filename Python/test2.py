@@ -1,4 +1,3 @@
-from machine import I2C, Pin
 import time
 import struct
 
@@ -11,8 +10,11 @@ ACC_DATA_START = 0x12
 GYR_DATA_START = 0x0C
 ACC_CONF = 0x40
 GYR_CONF = 0x42
+INTERNAL_STATUS_REG = 0x21
 INIT_CTRL_REG = 0x59
+INIT_ADDR_0_REG = 0x5B  # INIT_ADDR_1 follows at 0x5C
 CONFIG_WRITE_REG = 0x5E
+PWR_CONF_REG = 0x7C
 
 # Placeholder configuration data
 CONFIG_DATA = [
@@ -448,12 +450,18 @@ CONFIG_DATA = [
     0xc1, 0x80, 0x2e, 0x00, 0xc1, 0x80, 0x2e, 0x00, 0xc1, 0x80, 0x2e, 0x00, 0xc1, 0x80, 0x2e, 0x00, 0xc1, 0x80, 0x2e,
     0x00, 0xc1, 0x80, 0x2e, 0x00, 0xc1, 0x80, 0x2e, 0x00, 0xc1, 0x80, 0x2e, 0x00, 0xc1, 0x80, 0x2e, 0x00, 0xc1, 0x80,
     0x2e, 0x00, 0xc1]
+CONFIG_BLOB = bytes(CONFIG_DATA)
+
+# Bytes per INIT_DATA write. The RP2040 takes the whole blob in one transfer;
+# lower this (keeping it even) for a bus with a transfer size limit.
+MAX_BURST = len(CONFIG_BLOB)
 
 class BMI270:
     def __init__(self, i2c, address=I2C_ADDRESS):
         self.i2c = i2c
         self.address = address
         self.config_loaded = False
+        self._init_addr = bytearray(2)
 
     def write_byte(self, register, value):
         self.i2c.writeto_mem(self.address, register, bytes([value]))
@@ -467,25 +475,31 @@ class BMI270:
         if chip_id != 0x24:
             raise Exception("Invalid CHIP ID. Check your sensor.")
 
-    def load_config(self):
+    def load_config(self, burst=MAX_BURST):
         print("Starting configuration...")
-        self.write_byte(INIT_CTRL_REG, 0x00)  # Reset configuration process
-        time.sleep(0.1)
+        burst -= burst % 2  # INIT_ADDR counts 16-bit words
+        self.write_byte(PWR_CONF_REG, 0x00)  # Advanced power save off, or bursts get dropped
+        time.sleep(0.001)  # Writes need 450 us spacing until power save is off
+        self.write_byte(INIT_CTRL_REG, 0x00)  # Prepare config load
 
-        for i in range(0, len(CONFIG_DATA), 2):
-            chunk = CONFIG_DATA[i:i+2]
-            self.i2c.writeto_mem(self.address, CONFIG_WRITE_REG, bytes(chunk))
-            time.sleep(0.001)
+        # Each burst sets INIT_ADDR to its word offset, then writes to INIT_DATA
+        blob = memoryview(CONFIG_BLOB)
+        addr = self._init_addr
+        for start in range(0, len(blob), burst):
+            addr[0] = (start // 2) & 0x0F
+            addr[1] = (start // 2) >> 4
+            self.i2c.writeto_mem(self.address, INIT_ADDR_0_REG, addr)
+            self.i2c.writeto_mem(self.address, CONFIG_WRITE_REG, blob[start:start + burst])
 
         self.write_byte(INIT_CTRL_REG, 0x01)  # Signal end of configuration
-        time.sleep(0.1)
+        time.sleep(0.02)  # The ASIC needs up to 20 ms to initialize
 
-        status = self.read_bytes(INIT_CTRL_REG, 1)[0]
-        if status & 0x01:
+        status = self.read_bytes(INTERNAL_STATUS_REG, 1)[0] & 0x0F
+        if status == 0x01:
             print("Configuration loaded successfully.")
             self.config_loaded = True
         else:
-            raise Exception("Configuration failed to load.")
+            raise Exception("Configuration failed to load, INTERNAL_STATUS 0x%02x" % status)
 
     def get_raw_acc_data(self):
         raw_data = self.read_bytes(ACC_DATA_START, 6)
@@ -497,24 +511,27 @@ class BMI270:
         x, y, z = struct.unpack('<hhh', raw_data)
         return x, y, z
 
-# Initialize I2C
-i2c = I2C(0, scl=Pin(1), sda=Pin(0), freq=400000)
-devices = i2c.scan()
-print("I2C devices found:", devices)
+if __name__ == "__main__":
+    from machine import I2C, Pin
+
+    # Initialize I2C
+    i2c = I2C(0, scl=Pin(1), sda=Pin(0), freq=400000)
+    devices = i2c.scan()
+    print("I2C devices found:", devices)
 
-# Create BMI270 instance
-bmi270 = BMI270(i2c)
+    # Create BMI270 instance
+    bmi270 = BMI270(i2c)
 
-try:
-    bmi270.check_chip_id()
-    bmi270.load_config()
-    print("BMI270 initialized successfully.")
-except Exception as e:
-    print(f"Initialization error: {e}")
+    try:
+        bmi270.check_chip_id()
+        bmi270.load_config()
+        print("BMI270 initialized successfully.")
+    except Exception as e:
+        print(f"Initialization error: {e}")
 
-# Main loop
-for i in range(100):
-    acc_data = bmi270.get_raw_acc_data()
-    gyr_data = bmi270.get_raw_gyr_data()
-    print(f"{i}th run: Accel: {acc_data}, Gyro: {gyr_data}")
-    time.sleep(0.5)
\ No newline at end of file
+    # Main loop
+    for i in range(100):
+        acc_data = bmi270.get_raw_acc_data()
+        gyr_data = bmi270.get_raw_gyr_data()
+        print(f"{i}th run: Accel: {acc_data}, Gyro: {gyr_data}")
+        time.sleep(0.5)
\ No newline at end of file
@@ -0,0 +1 @@
+"""Shared acquisition and inference helpers for the SignSpeak glove scripts."""
@@ -0,0 +1,646 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from signspeak.audio import SpeechWorker, load_clip, open_player
+from signspeak.bmi270_fifo import FifoReader
+from signspeak.buslock import lock_bus
+from signspeak.decimate import Decimator, decimate_window, grid_timesteps
+from signspeak.display import display_text, open_display
+from signspeak.drdy import DataReadySampler, enable_data_ready, export_gpio
+from signspeak.i2cdev import I2CDev
+from signspeak.imu import BMI270_ADDRESS, I2CWrapper
+from signspeak.multibus import MultiBusSampler, SensorSlot, fill_gaps, parse_topology
+from signspeak.mux import MuxManager
+from signspeak.npmlp import NumpyMLP, StreamingMLP, open_model
+from signspeak.pipeline import AsyncStageQueue, Pipeline
+from signspeak.procinfer import InferenceProcess
+from signspeak.replay import ReplayBus, ReplaySensor, ReplaySource
+from signspeak.ring import WindowRing
+from signspeak.runtime import GpioWatch, cancel_tasks, stop_on_signals
+from signspeak.stream import StabilityFilter, motion_level
+from signspeak.topology import TopologyCache, read_state, sensor_ready
+from signspeak.wake import AnyMotionWake
+import warnings
+warnings.filterwarnings("ignore", category=UserWarning, module="tensorflow")
+
+
+def load_labels(path):
+    """{class index: gesture} from lines of "<gesture> <index>"; gestures may contain spaces."""
+    label_mapping = {}
+    with open(path, "r") as f:
+        for line in f:
+            label, index = line.strip().rsplit(" ", 1)
+            label_mapping[int(index)] = label
+    return label_mapping
+
+
+def preprocess(window):
+    """Preprocess stage: the model's input row (a view of the ring) and the window's motion level."""
+    return window.reshape(1, -1), motion_level(window)
+
+
+class SignSpeak:
+    """The glove: sensors, model, display and speaker wired up from a Config.
+
+    Constructing it brings up the hardware the config selects (or replays a
+    recording, prints the screen and stays silent), finds and initializes
+    the IMUs and loads the model. Then either run() the recognizer until
+    stopped, run_on_button() for one gesture per button press, or call
+    run_once() for a single timed gesture; close() when done.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        boot_start = time.perf_counter()
+        print("Initializing I2C and OLED...")
+        self.replay_source = None
+        if config.sensors == "replay":
+            self.replay_source = ReplaySource.from_csv(config.replay_csv, config.replay_speed)
+            self.bus = ReplayBus(range(self.replay_source.sensors), BMI270_ADDRESS,
+                                 latency_s=config.replay_bus_latency_s, contention=config.replay_contention)
+        elif config.i2c_device is None:
+            import board
+            import busio
+            self.bus = busio.I2C(board.SCL, board.SDA)
+        else:
+            self.bus = I2CDev(config.i2c_device)  # One ioctl per register read instead of a write and a read
+        self.tca = MuxManager(self.bus)  # Caches the selected channel; the OLED must share it too
+
+        self.oled = open_display(config.display, self.tca[config.display_channel] if config.display == "oled" else None)
+        self.oled.fill(0)
+        self.oled.show()
+        display_text(self.oled, "Initializing...")
+
+        # Reuse last boot's topology and sensor init when the cache still matches the hardware
+        boot_mark = time.perf_counter()
+        topology_cache = None
+        if config.topology_cache and self.replay_source is None:
+            topology_cache = TopologyCache(config.topology_cache)
+        cached = topology_cache is not None and topology_cache.load()
+        cached_states = topology_cache.states if cached else {}
+        if config.topology is not None:
+            slots = parse_topology(config.topology, BMI270_ADDRESS)
+        elif cached:
+            slots = topology_cache.slots
+        else:
+            slots = self.scan_topology()
+        scan_time = time.perf_counter() - boot_mark
+
+        boot_mark = time.perf_counter()
+        self.sensors = {}
+        try:
+            self.imu_ports, sensor_states, reinitialized = self.init_topology(slots, cached_states)
+        except OSError:
+            if config.topology is not None or not cached:
+                raise
+            # A cached sensor stopped answering (rewired glove?); start over from a scan
+            print("Cached topology is stale, rescanning...")
+            topology_cache.clear()
+            cached = False
+            slots = self.scan_topology()
+            self.imu_ports, sensor_states, reinitialized = self.init_topology(slots, {})
+        init_time = time.perf_counter() - boot_mark
+        if topology_cache is not None and (slots != topology_cache.slots or sensor_states != topology_cache.states):
+            topology_cache.save(slots, sensor_states)
+        self.num_sensors = num_sensors = len(self.imu_ports)
+        ports = [port for _, port, _, _ in self.imu_ports]
+        addresses = [address for _, _, _, address in self.imu_ports]
+
+        # Timesteps per window come from the model's input shape, not from the acquisition rate
+        self.model = open_model(config.model_path, config.infer_batch, num_threads=config.tflite_threads,
+                                xnnpack=config.tflite_xnnpack, warmup=config.tflite_warmup)
+        self.gesture_datapoints = grid_timesteps(self.model.input_shape, num_sensors)
+
+        window_ticks = int(round(config.gesture_length_seconds * config.acquisition_hz))
+        self.raw_block = np.empty((window_ticks, num_sensors, 6), dtype=np.float32)
+        # Continuous mode: each hop is polled into hop_block and decimated as it lands
+        self.hop_ticks = max(1, round(config.hop_seconds * config.acquisition_hz))
+        self.hop_block = np.empty((self.hop_ticks, num_sensors, 6), dtype=np.float32)
+        factor, remainder = divmod(len(self.raw_block), self.gesture_datapoints)
+        if config.continuous and remainder:
+            raise ValueError(f"Continuous mode needs a whole number of raw samples per timestep, "
+                             f"got {len(self.raw_block)} for {self.gesture_datapoints}")
+        self.decimator = Decimator(factor, num_sensors, mode=config.decimation) if config.continuous else None
+
+        # Room for every window the queues can hold, plus the infer batch and the one being filled;
+        # overlapping streamed windows advance by at most a hop's timesteps each
+        window_rows = max(self.gesture_datapoints, self.hop_ticks // max(factor, 1) + 1)
+        ring_capacity = ((config.preprocess_queue[0] + config.infer_queue[0] + config.infer_batch + 2)
+                         * window_rows)
+        self.inference_process = None
+        if config.inference_process:
+            self.inference_process = InferenceProcess(config.model_path, num_sensors, ring_capacity,
+                                                      self.model.outputs, max_batch=config.infer_batch,
+                                                      num_threads=config.tflite_threads,
+                                                      xnnpack=config.tflite_xnnpack, warmup=config.tflite_warmup)
+            self.sample_ring = self.inference_process.ring  # Windows are written straight into shared memory
+            self.model = None
+        else:
+            self.model.warm()  # Every batch size allocated now, none resized while recognizing
+            self.sample_ring = WindowRing(num_sensors, ring_capacity)
+
+        self.streaming = None
+        if config.incremental_first_layer:
+            if not isinstance(self.model, NumpyMLP):
+                raise ValueError("incremental_first_layer needs an .npz model_path and inference_process off")
+            if config.decimation == "fir":
+                raise ValueError("incremental_first_layer needs \"mean\" or \"pick\" decimation, fir spans timesteps")
+            self.streaming = StreamingMLP(self.model, self.gesture_datapoints, verify=config.verbose_stats)
+            self.streamed = {}  # sample_ring row -> probabilities finished as that window closed
+
+        if config.data_ready_gpios and self.replay_source is None:
+            if len(config.data_ready_gpios) not in (1, num_sensors):
+                raise ValueError(f"data_ready_gpios needs 1 or {num_sensors} pins, got {config.data_ready_gpios}")
+            # A single pin is the first IMU's INT1; the others only get the rate, their push-pull pins stay off it
+            shared = len(config.data_ready_gpios) == 1
+            for index, (port, address) in enumerate(zip(ports, addresses)):
+                lock_bus(port)
+                try:
+                    enable_data_ready(port, address, config.acquisition_hz, None if shared and index else 1)
+                finally:
+                    port.unlock()
+            self.bus_sampler = DataReadySampler([(port, reader) for _, port, reader, _ in self.imu_ports],
+                                                [export_gpio(number) for number in config.data_ready_gpios],
+                                                config.acquisition_hz)
+        else:
+            self.bus_sampler = MultiBusSampler([(bus, port, reader) for bus, port, reader, _ in self.imu_ports],
+                                               1 / config.acquisition_hz, len(self.raw_block))
+
+        self.fifo_reader = None
+        if config.use_fifo and self.replay_source is None:
+            self.fifo_reader = FifoReader(ports, range(num_sensors), addresses, config.acquisition_hz)
+            if self.fifo_reader.capacity_s < config.gesture_length_seconds:
+                raise ValueError(f"FIFO holds only {self.fifo_reader.capacity_s:.2f} s at {config.acquisition_hz} Hz")
+            self.fifo_reader.configure()
+
+        self.wake = None
+        self.last_motion_time = time.monotonic()
+        if config.idle_wake and self.replay_source is None:
+            self.wake = AnyMotionWake(ports, addresses, gpio_path=config.wake_gpio_path)
+
+        print(f"[⏱] Startup: {time.perf_counter() - boot_start:.2f} s "
+              f"({'cached' if cached else 'scanned'} topology {scan_time:.2f} s, "
+              f"IMU init {init_time:.2f} s with {reinitialized} of {num_sensors} re-initialized)")
+
+        self.label_mapping = load_labels(config.labels_path)
+        self.stability = StabilityFilter(config.stable_hops, config.min_confidence)
+        self.player = open_player(config.audio, config.pwm_pin, config.pwm_frequency, config.audio_out)
+        self.speech = SpeechWorker(functools.partial(load_clip, directory=config.audio_dir), self.player.play,
+                                   config.speech_policy, config.speech_queue_size, config.max_age_seconds)
+        self.speech_started = False
+        self.pause_event = asyncio.Event()
+        self.pause_event.set()  # Start in running state
+        self.loop = None
+        self.executor = None
+        self.display_updates = None
+
+    # --------------------- Boot ---------------------
+
+    def scan_topology(self):
+        """Find the BMI270s behind channels 0-6 of the mux on the default bus."""
+        slots = []
+        for channel in range(7):
+            if self.tca[channel].try_lock():
+                addresses = self.tca[channel].scan()
+                if len(addresses) > 1:
+                    slots.append(SensorSlot(None, self.tca.address, channel, BMI270_ADDRESS))
+                self.tca[channel].unlock()
+        return slots
+
+    def init_topology(self, slots, cached_states):
+        """Open every bus and mux named in the topology and bring up its BMI270s.
+
+        A sensor whose cached state still verifies keeps its init; the others
+        get the full driver init with its config blob upload. Returns one
+        (bus, port, reader, address) per slot, each slot's state and how many
+        sensors were re-initialized.
+        """
+        buses = {None: self.bus}
+        muxes = {(None, self.tca.address): self.tca}
+        ports = []
+        states = {}
+        reinitialized = 0
+        for slot in slots:
+            if slot.bus not in buses:
+                if self.config.i2c_device is None:
+                    from adafruit_extended_bus import ExtendedI2C  # Only needed for extra /dev/i2c-N buses
+                    buses[slot.bus] = ExtendedI2C(slot.bus)
+                else:
+                    buses[slot.bus] = I2CDev(slot.bus)
+            if slot.mux is None:
+                port = buses[slot.bus]
+            else:
+                if (slot.bus, slot.mux) not in muxes:
+                    muxes[(slot.bus, slot.mux)] = MuxManager(buses[slot.bus], slot.mux)
+                port = muxes[(slot.bus, slot.mux)][slot.channel]
+            lock_bus(port)
+            try:
+                if self.replay_source is not None:
+                    reader = ReplaySensor(self.replay_source, len(ports), self.config.replay_bus_latency_s)
+                    state = None
+                else:
+                    reader = I2CWrapper(port, slot.address)
+                    state = cached_states.get(slot)
+                    if state is None or not sensor_ready(port, slot.address, state):
+                        from micropython_bmi270 import bmi270
+                        self.sensors[slot] = bmi270.BMI270(reader)
+                        state = read_state(port, slot.address)
+                        reinitialized += 1
+                    reader.load_scales()
+            finally:
+                port.unlock()
+            states[slot] = state
+            ports.append((slot.bus, port, reader, slot.address))
+        return ports, states, reinitialized
+
+    # --------------------- Blocking helpers ---------------------
+
+    def show(self, text):
+        """Put text on the display: straight away, or through the display task while the loop runs.
+
+        Safe from the loop and from executor threads.
+        """
+        if self.loop is None:
+            display_text(self.oled, text)
+        else:
+            self.loop.call_soon_threadsafe(self.display_updates.put_nowait, text)
+
+    def collect_window(self):
+        """Blocking: acquire one gesture and return it as a window of sample_ring."""
+        config = self.config
+        print("Collecting new gesture...")
+        for i in range(2):
+            self.show(f"Perform gesture in {2-i}s")
+        self.tca.reset_counters()
+        if self.streaming is not None:
+            return self.collect_window_streamed()
+        if self.fifo_reader is not None:
+            self.fifo_reader.start_window()
+            time.sleep(config.gesture_length_seconds)
+            try:
+                self.fifo_reader.read_window(self.gesture_datapoints, mode=config.decimation,
+                                             out=self.sample_ring.reserve(self.gesture_datapoints))
+                self.sample_ring.commit(self.gesture_datapoints)
+                if config.verbose_stats:
+                    print(f"[⏱] FIFO window: {self.tca.summary()}")
+                return self.sample_ring.window(self.gesture_datapoints)
+            except RuntimeError as e:
+                print(f"{e}, falling back to polling")
+
+        self.bus_sampler.collect(self.raw_block)
+        fill_gaps(self.raw_block, self.bus_sampler.valid)  # Missed reads are interpolated, not shifted into other slots
+        decimate_window(self.raw_block, self.gesture_datapoints, config.decimation,
+                        out=self.sample_ring.reserve(self.gesture_datapoints))
+        if config.verbose_stats:
+            print(f"[⏱] Sampler: {self.bus_sampler.summary()}, {self.tca.summary()}")
+        self.sample_ring.commit(self.gesture_datapoints)
+        return self.sample_ring.window(self.gesture_datapoints)
+
+    def collect_window_streamed(self):
+        """Blocking: poll one gesture a timestep at a time, feeding each into the model's first layer.
+
+        Its probabilities are finished as the last timestep lands and kept
+        for run_model() under the window's ring row.
+        """
+        config, sampler, streaming = self.config, self.bus_sampler, self.streaming
+        steps = self.gesture_datapoints
+        bounds = np.arange(steps + 1) * len(self.raw_block) // steps
+        out = self.sample_ring.reserve(steps)
+        streaming.start()
+        start_ns = None
+        for t in range(steps):
+            # One summary for the gesture, not just its last timestep
+            block = sampler.collect(self.raw_block[bounds[t]:bounds[t + 1]], start_ns, accumulate=t > 0)
+            start_ns = sampler.next_ns  # The multiply below runs inside the next timestep's first tick
+            fill_gaps(block, sampler.valid)
+            decimate_window(block, 1, config.decimation, out=out[t:t + 1])
+            streaming.add(out[t])
+        self.sample_ring.commit(steps)
+        window = self.sample_ring.window(steps)
+        self.streamed[self.sample_ring.offset(window)] = streaming.finish(window)
+        if config.verbose_stats:
+            print(f"[⏱] Sampler: {sampler.summary()}, {self.tca.summary()}, {streaming.summary()}")
+        return window
+
+    def run_model(self, rows):
+        """Blocking: class probabilities shaped (len(rows), labels) for input rows (ring views)."""
+        if self.streaming is not None:
+            ready = [self.streamed.pop(self.sample_ring.offset(row), None) for row in rows]
+            if all(probabilities is not None for probabilities in ready):
+                return np.concatenate(ready)
+        if self.inference_process is not None:
+            return self.inference_process.predict(rows)
+        return self.model.predict(rows)
+
+    def idle_due(self, window):
+        """True once the hand has been still for idle_timeout_seconds and the IMUs should sleep."""
+        now = time.monotonic()
+        if self.wake is None or motion_level(window) >= self.config.motion_threshold_dps:
+            self.last_motion_time = now
+            return False
+        return now - self.last_motion_time >= self.config.idle_timeout_seconds
+
+    def sleep_while_idle(self):
+        """Blocking: park the IMUs on any-motion until the hand moves (or shutdown cancels the wait)."""
+        print("Idle, waiting for motion...")
+        self.show("Idle: move to wake")
+        woken_by = self.wake.sleep_until_motion()
+        if woken_by is None:
+            return
+        print(f"Motion on IMU {woken_by}, resuming")
+        self.show("System Running")
+        if self.fifo_reader is not None:
+            self.fifo_reader.configure()
+        self.last_motion_time = time.monotonic()
+
+    def run_once(self, countdown_s=0):
+        """Blocking: count down, read one gesture, classify it and speak it; returns the gesture.
+
+        Prints how long collection, inference and playback took.
+        """
+        for remaining in range(countdown_s, 0, -1):
+            print(f"Starting in {remaining} seconds...")
+            self.show(f"Starting in {remaining} seconds...")
+            time.sleep(1)
+        self.show("Perform Gesture")
+        start_total = time.perf_counter()
+
+        window = self.collect_window()
+        end_collect = time.perf_counter()
+        print(f"[⏱] Data collection time: {end_collect - start_total:.3f} seconds")
+
+        predictions = self.run_model([window.reshape(1, -1)])
+        end_infer = time.perf_counter()
+        print(f"[⏱] Inference time: {end_infer - end_collect:.3f} seconds")
+        predicted_gesture = self.label_mapping.get(int(np.argmax(predictions)), "Unknown")
+        print(f"Predicted Gesture: {predicted_gesture}")
+
+        self.show(f"gesture: {predicted_gesture}")
+        clip = self.speech.clip(predicted_gesture)
+        if clip is not None:
+            self.player.play(clip, threading.Event(), lambda: None)
+        end_audio = time.perf_counter()
+        print(f"[⏱] Audio playback time: {end_audio - end_infer:.3f} seconds")
+        print(f"[⏱] Total time: {end_audio - start_total:.3f} seconds")
+        return predicted_gesture
+
+    # --------------------- Tasks ---------------------
+
+    async def offload(self, func, *args):
+        """Run a blocking call (I2C, TFLite, sleeps) on the executor and await it."""
+        return await self.loop.run_in_executor(self.executor, func, *args)
+
+    async def gesture_windows(self):
+        """Acquire stage for countdown mode: one window per gesture."""
+        while True:
+            await self.pause_event.wait()
+            try:
+                reading = await self.offload(self.collect_window)
+            except RuntimeError as e:
+                print(f"{e}, skipping this window")  # A sensor gave nothing to interpolate from
+                continue
+            if self.idle_due(reading):
+                await self.offload(self.sleep_while_idle)
+                continue
+            yield reading
+            await asyncio.sleep(0.1)  # Small delay before next collection cycle
+
+    async def stream_windows(self):
+        """Acquire stage for continuous mode: poll without gaps and yield the latest window every hop.
+
+        Each hop is decimated once as it lands and appended to sample_ring,
+        so overlapping windows share their timesteps instead of re-decimating
+        every raw frame in each window it falls in.
+        """
+        bus_sampler, sample_ring, decimator = self.bus_sampler, self.sample_ring, self.decimator
+        steps = self.gesture_datapoints
+        hop_ticks = self.hop_ticks
+        start_ns = None
+        stream_start = sample_ring.count
+        while True:
+            if not self.pause_event.is_set():
+                await self.pause_event.wait()
+                start_ns = None
+            if start_ns is not None and time.monotonic_ns() > start_ns + hop_ticks * bus_sampler.period_ns:
+                start_ns = None  # Fell a hop behind; catching up would bunch the reads together
+            if start_ns is None:
+                # Restart the grid, older samples do not line up with it
+                decimator.reset()
+                stream_start = sample_ring.count
+            hop_block = await self.offload(bus_sampler.collect, self.hop_block, start_ns)
+            try:
+                fill_gaps(hop_block, bus_sampler.valid)
+            except RuntimeError as e:
+                print(f"{e}, restarting the stream")
+                start_ns = None
+                continue
+            start_ns = bus_sampler.next_ns
+            decimated = decimator.push(hop_block)
+            sample_ring.reserve(len(decimated))[:] = decimated
+            sample_ring.commit(len(decimated))
+            if sample_ring.count - stream_start < steps:
+                continue
+
+            if self.idle_due(sample_ring.window(steps)):
+                await self.offload(self.sleep_while_idle)
+                start_ns = None
+                continue
+            yield sample_ring.window(steps)  # If inference is behind, the queue drops stale hops
+            if self.config.verbose_stats:
+                print(f"[⏱] Sampler: {bus_sampler.summary()}, {self.tca.summary()}")
+            self.tca.reset_counters()  # Mux counters cover the hops since the last window
+
+    def classify(self, predictions, motion):
+        """Hand a window's gesture to the speech thread (in continuous mode once it is stable)."""
+        predicted_class = np.argmax(predictions)
+        if self.config.continuous:
+            predicted_class = self.stability.update(predictions, motion >= self.config.motion_threshold_dps)
+            if predicted_class is None:
+                return
+        predicted_gesture = self.label_mapping.get(predicted_class, "Unknown")
+        print(f"Predicted Gesture: {predicted_gesture}")
+        self.speech.say(predicted_gesture)  # Returns at once; the audio thread plays it
+
+    async def infer_stage(self, items):
+        """Infer stage: score every waiting window, in one invoke on the executor or in the inference process."""
+        await self.pause_event.wait()
+        if not self.config.continuous:
+            print("Running inference...")
+        rows = [row for row, _ in items]
+        if self.inference_process is None:
+            predictions = await self.offload(self.run_model, rows)
+        else:
+            # No thread: the batch is one request and waits on the reply pipe
+            predictions = await self.inference_process.predict_async(rows)
+        for probabilities, (_, motion) in zip(predictions, items):
+            self.classify(probabilities, motion)
+        return [None] * len(items)
+
+    def button_path(self):
+        """Export the button pin (falling edges) and return its value file."""
+        if self.config.button_gpio is None:
+            raise ValueError("No button_gpio configured")
+        try:
+            return export_gpio(self.config.button_gpio, "falling")
+        except OSError as e:
+            print("GPIO setup failed:", e)
+            return f"/sys/class/gpio/gpio{self.config.button_gpio}/value"
+
+    async def button_monitor(self):
+        """Toggle pause/resume on each press; the loop sleeps until the pin has an edge."""
+        button = GpioWatch(await self.offload(self.button_path))
+        print("Press button to toggle pause/resume")
+        self.show("Btn: Pause/Resume")
+        try:
+            while True:
+                if await button.edge() != "0":  # Falling edge = button press
+                    continue
+                if self.pause_event.is_set():
+                    print("System Paused")
+                    self.show("System Paused")
+                    self.pause_event.clear()
+                else:
+                    print("System Running")
+                    self.show("System Running")
+                    self.pause_event.set()
+
+                # Wait for button release
+                while button.value() != "1":
+                    await asyncio.sleep(0.05)
+                button.value()  # Clear interrupt after release
+        finally:
+            button.close()
+
+    async def gesture_on_press(self, countdown_s):
+        async def attempt():
+            try:
+                await self.offload(self.run_once, countdown_s)
+            except Exception as e:
+                print("Error during inference:", e)
+            print("Press the button to start inference...")
+            self.show("Press button to start...")
+
+        button = GpioWatch(await self.offload(self.button_path))
+        print("Press the button to start inference...")
+        self.show("Press button to start...")
+        running = None
+        try:
+            while True:
+                if await button.edge() != "0":
+                    continue
+                if running is not None and not running.done():
+                    print("Inference already running, ignoring button press.")
+                else:
+                    print("Button pressed, running inference...")
+                    self.show("Starting inference")
+                    running = asyncio.create_task(attempt(), name="gesture")
+
+                while button.value() != "1":
+                    await asyncio.sleep(0.05)
+                button.value()
+        finally:
+            button.close()
+            if running is not None:
+                await cancel_tasks([running])
+
+    async def display_refresher(self):
+        """Draw the newest requested screen; the OLED shares the bus, so only this task writes it."""
+        while True:
+            text, _ = await self.display_updates.get()
+            await self.offload(display_text, self.oled, text)
+
+    async def report_stats(self, pipeline):
+        while True:
+            await asyncio.sleep(10)
+            print(f"[⏱] Pipeline:\n{pipeline.summary()}\n{self.speech.summary()}")
+            if self.inference_process is not None:
+                print(f"[⏱] {self.inference_process.summary()}")
+            else:
+                print(f"[⏱] {self.model.summary()}")
+            if self.streaming is not None:
+                print(f"[⏱] {self.streaming.summary()}")
+
+    # --------------------- Start Tasks ---------------------
+
+    async def serve(self, launch):
+        """Run the tasks `launch()` creates, plus the display, until a signal or run_duration.
+
+        If any of the tasks raises, the rest are shut down and its exception is raised from here.
+        """
+        self.loop = asyncio.get_running_loop()
+        self.executor = ThreadPoolExecutor(self.config.blocking_workers, thread_name_prefix="blocking")
+        self.display_updates = AsyncStageQueue("display", policy="coalesce")  # Only the newest screen matters
+        stop = asyncio.Event()
+        stop_on_signals(stop)
+
+        tasks = launch()
+        tasks.append(asyncio.create_task(self.display_refresher(), name="display"))
+        stopping = asyncio.create_task(stop.wait(), name="stop")
+        # None of the tasks ends on its own, so one that does (most likely by raising) stops everything
+        done, _ = await asyncio.wait(tasks + [stopping], timeout=self.config.run_duration,
+                                     return_when=asyncio.FIRST_COMPLETED)
+        ended = next((task for task in tasks if task in done), None)
+        error = None if ended is None or ended.cancelled() else ended.exception()
+        if ended is not None:
+            print(f"Task {ended.get_name()} {'failed' if error else 'ended'}, stopping...")
+        elif done:
+            print("Stopping...")
+        else:
+            print(f"{self.config.run_duration} seconds elapsed. Exiting...")
+        await cancel_tasks(tasks + [stopping])
+        if self.wake is not None:
+            self.wake.cancel()  # An idle wait would otherwise hold the executor
+        self.executor.shutdown(wait=True, cancel_futures=True)  # At most the window being read finishes
+        self.loop = None
+        if error is not None:
+            raise error
+
+    def launch_pipeline(self):
+        self.show("System Running")
+        if not self.speech_started:
+            self.speech.start()
+            self.speech_started = True
+        pipeline = Pipeline()
+        pipeline.add("acquire", self.stream_windows if self.config.continuous else self.gesture_windows)
+        pipeline.add("preprocess", preprocess,
+                     AsyncStageQueue("preprocess", *self.config.preprocess_queue, self.config.max_age_seconds))
+        pipeline.add("infer", self.infer_stage,
+                     AsyncStageQueue("infer", *self.config.infer_queue, self.config.max_age_seconds),
+                     batch=self.config.infer_batch)
+        tasks = pipeline.start()
+        if self.config.button_gpio is not None:
+            tasks.append(asyncio.create_task(self.button_monitor(), name="button"))
+        if self.config.verbose_stats:
+            tasks.append(asyncio.create_task(self.report_stats(pipeline), name="stats"))
+        return tasks
+
+    async def start(self):
+        """Run the recognizer (countdown or continuous mode) on the running loop until stopped."""
+        await self.serve(self.launch_pipeline)
+
+    def run(self):
+        """Blocking: start() on a new event loop, then close()."""
+        try:
+            asyncio.run(self.start())
+        finally:
+            self.close()
+
+    def run_on_button(self, countdown_s=3):
+        """Blocking: run_once() on every button press until stopped, then close()."""
+        try:
+            asyncio.run(self.serve(lambda: [asyncio.create_task(self.gesture_on_press(countdown_s),
+                                                                name="button")]))
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop the inference process and leave the display saying so."""
+        if self.inference_process is not None:
+            self.inference_process.stop()
+            self.inference_process = None
+        display_text(self.oled, "Exiting...")
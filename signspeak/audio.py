@@ -0,0 +1,212 @@
+import collections
+import os
+import struct
+import threading
+import time
+import wave
+
+SPEECH_POLICIES = ("queue", "interrupt", "skip_repeat")
+
+
+def load_wav_as_array(filename):
+    """Samples of a mono 8- or 16-bit WAV as signed ints and its sample rate, or (None, None)."""
+    try:
+        wav = wave.open(filename, "rb")
+    except FileNotFoundError:
+        print(f"Audio file {filename} not found.")
+        return None, None
+
+    sample_width = wav.getsampwidth()
+    sample_rate = wav.getframerate()
+    n_frames = wav.getnframes()
+
+    if wav.getnchannels() != 1:
+        print("Error: Only mono WAV files are supported.")
+        return None, None
+
+    frames = wav.readframes(n_frames)
+    wav.close()
+    if sample_width == 2:
+        samples = list(struct.unpack(f"<{n_frames}h", frames))
+    elif sample_width == 1:
+        samples = [sample - 128 for sample in frames]
+    else:
+        print("Unsupported sample width.")
+        return None, None
+    return samples, sample_rate
+
+
+def load_clip(word, directory=""):
+    """A word's WAV as PWM duty cycles (0-100) and its sample rate, or None without a clip."""
+    wav_samples, sample_rate = load_wav_as_array(os.path.join(directory, f"{word}.wav"))
+    if not wav_samples:
+        return None
+
+    min_val = min(wav_samples)
+    max_val = max(wav_samples)
+    span = (max_val - min_val) or 1
+    return [(sample - min_val) / span * 100 for sample in wav_samples], sample_rate
+
+
+class NullPlayer:
+    """Plays nothing but takes as long as the clip, so timing matches the glove."""
+
+    def play(self, clip, stop, started):
+        wav_samples, sample_rate = clip
+        started()
+        stop.wait(len(wav_samples) / sample_rate)
+
+
+class FilePlayer(NullPlayer):
+    """Writes each word it plays to `directory` as an 8-bit WAV, in real time."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.count = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def play(self, clip, stop, started):
+        wav_samples, sample_rate = clip
+        self.count += 1
+        with wave.open(os.path.join(self.directory, f"{self.count:04d}.wav"), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(1)
+            wav.setframerate(sample_rate)
+            wav.writeframes(bytes(int(duty * 2.55) for duty in wav_samples))
+        super().play(clip, stop, started)
+
+
+class PwmPlayer:
+    """Plays duty-cycle clips on a BeagleBone PWM pin, busy-waiting each sample."""
+
+    def __init__(self, pin="P9_14", frequency=44000):
+        import Adafruit_BBIO.PWM as PWM
+        self.pwm = PWM
+        self.pin = pin
+        self.frequency = frequency
+
+    def play(self, clip, stop, started):
+        """Play a clip, returning early once `stop` is set."""
+        wav_samples, sample_rate = clip
+        self.pwm.start(self.pin, 50, self.frequency)
+        frame_duration = 1.0 / sample_rate
+        start_time = time.time()
+
+        try:
+            for i, duty_cycle in enumerate(wav_samples):
+                self.pwm.set_duty_cycle(self.pin, duty_cycle)
+                if i == 0:
+                    started()
+                if stop.is_set():
+                    break
+                while time.time() < start_time + (i * frame_duration):
+                    pass
+        finally:
+            self.pwm.stop(self.pin)
+            self.pwm.cleanup()
+
+
+def open_player(kind, pin="P9_14", frequency=44000, directory="spoken"):
+    """The audio backend named `kind` ("pwm", "file" or "null")."""
+    if kind == "pwm":
+        return PwmPlayer(pin, frequency)
+    if kind == "file":
+        return FilePlayer(directory)
+    return NullPlayer()
+
+
+class SpeechWorker:
+    """Plays predicted words on its own thread so inference never waits for audio.
+
+    `load(word)` returns a clip (or None if there is none); clip() caches it
+    per word, for this thread and for anyone else playing words directly.
+    `play(clip, stop, started)` plays it, calls started() as the first
+    sample goes out and returns early once the `stop` event is set. What
+    say() does while a word is playing depends on `policy`:
+      queue        wait its turn, up to `maxsize` words (the oldest is dropped)
+      interrupt    cut the current word off and drop anything waiting
+      skip_repeat  queue it, unless it is the word playing or waiting last
+    Words that waited longer than `max_age_s` are skipped instead of played.
+    """
+
+    def __init__(self, load, play, policy="queue", maxsize=4, max_age_s=None):
+        if policy not in SPEECH_POLICIES:
+            raise ValueError(f"Unknown speech policy {policy!r}, expected one of {SPEECH_POLICIES}")
+        self.load = load
+        self.play = play
+        self.policy = policy
+        self.maxsize = maxsize
+        self.max_age_ns = None if max_age_s is None else int(max_age_s * 1e9)
+        self.clips = {}
+        self.current = None
+        self._pending = collections.deque()  # (word, predicted_ns)
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.played = 0
+        self.interrupted = 0
+        self.skipped = 0     # repeats, stale words and words pushed out of a full queue
+        self.latency_ns_total = 0
+        self.latency_ns_max = 0
+
+    def say(self, word, predicted_ns=None):
+        """Hand over a word without blocking; predicted_ns is when inference produced it."""
+        predicted_ns = time.monotonic_ns() if predicted_ns is None else predicted_ns
+        with self._cond:
+            if self.policy == "skip_repeat":
+                last = self._pending[-1][0] if self._pending else self.current
+                if word == last:
+                    self.skipped += 1
+                    return
+            elif self.policy == "interrupt":
+                self.skipped += len(self._pending)
+                self._pending.clear()
+                if self.current is not None:
+                    self._stop.set()
+            if len(self._pending) >= self.maxsize:
+                self._pending.popleft()
+                self.skipped += 1
+            self._pending.append((word, predicted_ns))
+            self._cond.notify()
+
+    def clip(self, word):
+        """The word's clip, loaded on first use."""
+        if word not in self.clips:
+            self.clips[word] = self.load(word)
+        return self.clips[word]
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                word, predicted_ns = self._pending.popleft()
+                if self.max_age_ns is not None and time.monotonic_ns() - predicted_ns > self.max_age_ns:
+                    self.skipped += 1
+                    continue
+                self.current = word
+                self._stop.clear()
+            clip = self.clip(word)
+            if clip is not None:
+                def started(predicted_ns=predicted_ns):
+                    latency = time.monotonic_ns() - predicted_ns
+                    self.latency_ns_total += latency
+                    self.latency_ns_max = max(self.latency_ns_max, latency)
+                    self.played += 1
+                self.play(clip, self._stop, started)
+                if self._stop.is_set():
+                    self.interrupted += 1
+            with self._cond:
+                self.current = None
+
+    def start(self):
+        threading.Thread(target=self.run, name="speech", daemon=True).start()
+        return self
+
+    def summary(self):
+        mean_ms = self.latency_ns_total / self.played / 1e6 if self.played else 0.0
+        return (f"speech ({self.policy}): {self.played} played, {self.interrupted} interrupted, "
+                f"{self.skipped} skipped, {len(self._pending)} waiting, prediction to first sample "
+                f"{mean_ms:.1f}/{self.latency_ns_max / 1e6:.1f} ms mean/max")
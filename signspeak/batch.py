@@ -0,0 +1,163 @@
+import os
+import time
+
+import numpy as np
+try:
+    import tflite_runtime.interpreter as tflite  # BeagleBone
+except ImportError:
+    import tensorflow.lite as tflite  # Laptops/desktops
+
+from signspeak.quant import dequantize, quantize_into, tensor_quantization
+
+
+class BatchInterpreter:
+    """Scores several model input rows with one invoke().
+
+    TFLite fixes the batch dimension when tensors are allocated, so resizing
+    per call would re-plan the whole graph. Instead one interpreter is kept
+    per batch size: resized and allocated the first time that size is
+    needed (or up front with warm()) and reused from then on. predict()
+    splits anything longer than `max_batch` rows into chunks.
+
+    A full-integer model (int8 input and output) takes and returns floats
+    like the float one: windows are quantized with the input tensor's
+    scale and zero point on the way in and probabilities dequantized on
+    the way out.
+
+    Windows are written into, and probabilities read from, the tensors'
+    own buffers through interpreter.tensor() accessors bound once, instead
+    of the copies set_tensor() and get_tensor() make. Each new interpreter
+    runs `warmup` invokes so one-time setup never lands on a real window.
+    `num_threads` goes to the interpreter; `xnnpack` False turns off the
+    delegates the runtime applies by default (XNNPACK in recent builds),
+    a path loads that delegate library, and None leaves the default.
+    """
+
+    def __init__(self, model_path, max_batch=8, num_threads=None, xnnpack=None, warmup=2):
+        self.model_path = model_path
+        self.max_batch = max_batch
+        self.warmup = warmup
+        self._options = {}
+        if num_threads is not None:
+            self._options["num_threads"] = num_threads
+        # tflite_runtime has these at the top level, tensorflow.lite under experimental
+        experimental = getattr(tflite, "experimental", tflite)
+        if xnnpack is False:
+            self._options["experimental_op_resolver_type"] = \
+                experimental.OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+        elif isinstance(xnnpack, str):
+            self._options["experimental_delegates"] = [experimental.load_delegate(xnnpack)]
+        probe = tflite.Interpreter(model_path=model_path)  # Shapes only, never allocated
+        input_details = probe.get_input_details()[0]
+        output_details = probe.get_output_details()[0]
+        self.input_shape = tuple(input_details['shape'])
+        self.outputs = int(output_details['shape'][-1])
+        self.input_quantization = tensor_quantization(input_details)
+        self.output_quantization = tensor_quantization(output_details)
+        self._by_size = {}  # batch size -> (interpreter, input tensor accessor, output index)
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.invokes = 0
+        self.rows = 0
+        self.fill_ns = 0     # windows into the input tensor (and quantizing them)
+        self.invoke_ns = 0
+        self.read_ns = 0     # probabilities out of the output tensor (and dequantizing them)
+        self.warmup_ns = 0
+        self.first_invoke_ns = 0
+
+    def _interpreter(self, size):
+        entry = self._by_size.get(size)
+        if entry is None:
+            interpreter = tflite.Interpreter(model_path=self.model_path, **self._options)
+            input_index = interpreter.get_input_details()[0]['index']
+            if size != self.input_shape[0]:
+                interpreter.resize_tensor_input(input_index, (size,) + self.input_shape[1:])
+            interpreter.allocate_tensors()
+            entry = (interpreter, interpreter.tensor(input_index),
+                     interpreter.tensor(interpreter.get_output_details()[0]['index']))
+            self._by_size[size] = entry
+            for i in range(self.warmup):
+                start = time.perf_counter_ns()
+                interpreter.invoke()  # Inputs are zeros; this pays the first-invoke setup
+                elapsed = time.perf_counter_ns() - start
+                self.warmup_ns += elapsed
+                if i == 0:
+                    self.first_invoke_ns = max(self.first_invoke_ns, elapsed)
+        return entry
+
+    def warm(self, sizes=None):
+        """Allocate and warm up the interpreters for `sizes` (default 1..max_batch) before they are needed."""
+        for size in sizes or range(1, self.max_batch + 1):
+            self._interpreter(size)
+
+    def predict(self, rows):
+        """Probabilities shaped (len(rows), outputs), in the order of `rows`.
+
+        `rows` is an array of input rows or a list of them; each row may
+        keep a leading batch dimension of 1 (a ring window's reshape(1, -1)).
+        """
+        results = np.empty((len(rows), self.outputs), dtype=np.float32)
+        for start in range(0, len(rows), self.max_batch):
+            chunk = rows[start:start + self.max_batch]
+            interpreter, input_tensor, output_tensor = self._interpreter(len(chunk))
+            began = time.perf_counter_ns()
+            self._load(input_tensor, chunk)
+            filled = time.perf_counter_ns()
+            interpreter.invoke()
+            invoked = time.perf_counter_ns()
+            self._read(output_tensor, results[start:start + len(chunk)])
+            self.fill_ns += filled - began
+            self.invoke_ns += invoked - filled
+            self.read_ns += time.perf_counter_ns() - invoked
+            self.invokes += 1
+            self.rows += len(chunk)
+        return results
+
+    # invoke() refuses to run while a view of a tensor buffer is alive, so the
+    # views from the tensor accessors only ever live inside these two calls
+    def _load(self, input_tensor, chunk):
+        inputs = input_tensor()
+        if isinstance(chunk, np.ndarray):
+            self._fill(inputs, chunk.reshape(inputs.shape))
+        else:
+            for i, row in enumerate(chunk):
+                self._fill(inputs[i], row.reshape(inputs.shape[1:]))  # Ring view straight into the input buffer
+
+    def _read(self, output_tensor, out):
+        outputs = output_tensor()
+        if self.output_quantization is None:
+            out[:] = outputs
+        else:
+            out[:] = dequantize(outputs, self.output_quantization)
+
+    def _fill(self, inputs, values):
+        if self.input_quantization is None:
+            inputs[:] = values
+        else:
+            quantize_into(values, inputs, self.input_quantization)
+
+    def summary(self):
+        if not self.invokes:
+            return "model: idle"
+        kind = "float" if self.input_quantization is None else "int8"
+        per_invoke = self.invokes * 1e3
+        return (f"{kind} model: {self.rows} windows in {self.invokes} invokes ({self.rows / self.invokes:.1f} per invoke), "
+                f"fill {self.fill_ns / per_invoke:.0f} + invoke {self.invoke_ns / per_invoke:.0f} + "
+                f"read {self.read_ns / per_invoke:.0f} us per invoke, warm-up {self.warmup_ns / 1e6:.1f} ms "
+                f"(first invoke {self.first_invoke_ns / 1e6:.1f} ms), interpreters for batch sizes {sorted(self._by_size)}")
+
+
+def compare_models(paths, x, y, repeats=200):
+    """Print each .tflite model's size, one-window latency and accuracy on (x, y) side by side."""
+    print(f"{'Model':<32} {'Size':>10} {'Latency':>10} {'Accuracy':>9}")
+    for path in paths:
+        model = BatchInterpreter(path, max_batch=len(x))
+        accuracy = np.mean(np.argmax(model.predict(x), axis=1) == y)
+        model.predict(x[:1])  # Allocate the batch-of-one interpreter outside the timing
+        start = time.perf_counter()
+        for i in range(repeats):
+            model.predict(x[i % len(x)][None])
+        latency_ms = (time.perf_counter() - start) / repeats * 1e3
+        print(f"{os.path.basename(path):<32} {os.path.getsize(path) / 1024:>7.1f} KB "
+              f"{latency_ms:>7.3f} ms {accuracy * 100:>8.2f}%")
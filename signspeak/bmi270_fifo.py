@@ -0,0 +1,175 @@
+import time
+import numpy as np
+
+from signspeak.buslock import lock_bus
+from signspeak.decimate import decimate_window
+
+# --------------------- BMI270 Registers ---------------------
+# Addresses and bit layouts follow bmi2_defs.h from the Bosch API
+# (Embedded System/updated_system/EmbeddedSystem).
+
+FIFO_LENGTH_0 = 0x24
+FIFO_DATA = 0x26
+ACC_CONF = 0x40
+ACC_RANGE = 0x41
+GYR_CONF = 0x42
+GYR_RANGE = 0x43
+FIFO_DOWNS = 0x45
+FIFO_CONFIG_0 = 0x48
+FIFO_CONFIG_1 = 0x49
+PWR_CONF = 0x7C
+PWR_CTRL = 0x7D
+CMD = 0x7E
+
+FIFO_FLUSH_CMD = 0xB0
+FIFO_HEADERLESS_GYR_ACC = 0xC0  # fifo_gyr_en | fifo_acc_en, header disabled
+FIFO_SIZE_BYTES = 2048
+FRAME_BYTES = 12  # gyr x, y, z then acc x, y, z as little-endian int16
+
+# ODR field values shared by ACC_CONF and GYR_CONF (bits 3:0)
+ODR_CODES = {25: 0x06, 50: 0x07, 100: 0x08, 200: 0x09, 400: 0x0A, 800: 0x0B, 1600: 0x0C}
+CONF_PERF_NORMAL = 0xA0  # filter_perf=1, bwp=normal
+
+# LSB per unit for each range setting, matching micropython_bmi270
+ACC_LSB_PER_G = {0: 16384.0, 1: 8192.0, 2: 4096.0, 3: 2048.0}
+GYR_LSB_PER_DPS = {0: 16.4, 1: 32.8, 2: 65.6, 3: 131.2, 4: 262.4}
+GRAVITY = 9.80665
+
+# Raw int16 patterns the FIFO returns instead of samples
+EMPTY_WORD = -0x8000        # 0x00 0x80, returned when reading past the fill level
+DUMMY_ACC_WORD = 0x7F01     # 0x01 0x7F, headerless dummy accel frame
+DUMMY_GYR_WORD = 0x7F02     # 0x02 0x7F, headerless dummy gyro frame
+
+
+# --------------------- Decoding ---------------------
+
+def decode_frames(raw, scale):
+    """Decode headerless gyr+acc FIFO bytes into an (n, 6) array of acc/gyr values.
+
+    Dummy and empty frames are dropped. Columns are reordered to
+    acc x, y, z, gyr x, y, z to match sensor.acceleration + sensor.gyro.
+    """
+    usable = len(raw) - len(raw) % FRAME_BYTES
+    words = np.frombuffer(raw, dtype="<i2", count=usable // 2).reshape(-1, 6)
+    gyr = words[:, 0:3]
+    acc = words[:, 3:6]
+
+    empty = np.all(words == EMPTY_WORD, axis=1)
+    dummy_gyr = (gyr[:, 0] == DUMMY_GYR_WORD) & (gyr[:, 1] == EMPTY_WORD)
+    dummy_acc = (acc[:, 0] == DUMMY_ACC_WORD) & (acc[:, 1] == EMPTY_WORD)
+    valid = ~(empty | dummy_gyr | dummy_acc)
+
+    frames = np.empty((int(valid.sum()), 6), dtype=np.float32)
+    frames[:, 0:3] = acc[valid]
+    frames[:, 3:6] = gyr[valid]
+    frames *= scale
+    return frames
+
+
+# --------------------- Reader ---------------------
+
+class FifoReader:
+    """Batch acquisition of every IMU through its hardware FIFO.
+
+    Each BMI270 buffers headerless acc+gyro frames at a fixed ODR. A window
+    is one flush of every FIFO, a sleep, then one length read and one burst
+    read per channel, instead of four transactions per channel per sample.
+    """
+
+    def __init__(self, tca, channels, address=0x68, odr_hz=100):
+        """`tca` maps each channel to a lockable bus (a mux or a list of ports).
+
+        `address` is one I2C address for every sensor or a list, one per channel.
+        """
+        if odr_hz not in ODR_CODES:
+            raise ValueError(f"Unsupported ODR {odr_hz} Hz, choose from {sorted(ODR_CODES)}")
+        self.tca = tca
+        self.channels = list(channels)
+        if isinstance(address, int):
+            address = [address] * len(self.channels)
+        self.addresses = dict(zip(self.channels, address))
+        self.odr_hz = odr_hz
+        self.scales = {}
+        self._len_buf = bytearray(2)
+        self._data_buf = bytearray(FIFO_SIZE_BYTES)
+
+    @property
+    def capacity_s(self):
+        """Longest window the FIFO can hold at this ODR before the oldest frames are overwritten."""
+        return (FIFO_SIZE_BYTES // FRAME_BYTES) / self.odr_hz
+
+    # I2C helpers; the caller must hold the channel lock
+    def _write(self, bus, address, reg, value):
+        bus.writeto(address, bytes([reg, value]))
+
+    def _read(self, bus, address, reg, buf, length=None):
+        bus.writeto_then_readfrom(address, bytes([reg]), buf, in_end=length)
+        return buf
+
+    def _lock(self, channel):
+        bus = self.tca[channel]
+        lock_bus(bus)
+        return bus
+
+    def configure(self):
+        """Set ODR, enable headerless acc+gyro FIFO and read back the ranges."""
+        conf = CONF_PERF_NORMAL | ODR_CODES[self.odr_hz]
+        for channel in self.channels:
+            address = self.addresses[channel]
+            bus = self._lock(channel)
+            try:
+                self._write(bus, address, PWR_CONF, 0x02)  # adv_power_save off, fifo_self_wakeup on
+                self._write(bus, address, PWR_CTRL, 0x0E)  # acc, gyr and temp on
+                self._write(bus, address, ACC_CONF, conf)
+                self._write(bus, address, GYR_CONF, conf)
+                self._write(bus, address, FIFO_DOWNS, 0x00)
+                self._write(bus, address, FIFO_CONFIG_0, 0x00)  # overwrite oldest, no sensortime
+                self._write(bus, address, FIFO_CONFIG_1, FIFO_HEADERLESS_GYR_ACC)
+                ranges = self._read(bus, address, ACC_RANGE, bytearray(3))  # ACC_RANGE, GYR_CONF, GYR_RANGE
+            finally:
+                bus.unlock()
+            acc_scale = GRAVITY / ACC_LSB_PER_G[ranges[0] & 0x03]
+            gyr_scale = 1.0 / GYR_LSB_PER_DPS[ranges[2] & 0x07]
+            self.scales[channel] = np.array([acc_scale] * 3 + [gyr_scale] * 3, dtype=np.float32)
+        time.sleep(0.05)  # let the new ODR settle before the first flush
+
+    def start_window(self):
+        """Flush every FIFO so the next read covers exactly one window."""
+        for channel in self.channels:
+            bus = self._lock(channel)
+            try:
+                self._write(bus, self.addresses[channel], CMD, FIFO_FLUSH_CMD)
+            finally:
+                bus.unlock()
+
+    def drain(self, channel):
+        """Read everything buffered on one channel and return the decoded frames."""
+        address = self.addresses[channel]
+        bus = self._lock(channel)
+        try:
+            self._read(bus, address, FIFO_LENGTH_0, self._len_buf)
+            length = self._len_buf[0] | (self._len_buf[1] & 0x3F) << 8
+            length -= length % FRAME_BYTES
+            if length >= FIFO_SIZE_BYTES - FRAME_BYTES:
+                print(f"FIFO full on channel {channel}, window start was overwritten")
+            if length:
+                self._read(bus, address, FIFO_DATA, self._data_buf, length)
+        finally:
+            bus.unlock()
+        return decode_frames(memoryview(self._data_buf)[:length], self.scales[channel])
+
+    def read_window(self, timesteps, out=None, mode="pick"):
+        """Drain every channel into a (timesteps, sensors, 6) float32 window.
+
+        The ODR-rate frames are reduced to the model grid with
+        decimate_window (`mode` is pick, mean or fir). Pass `out` (e.g. rows
+        reserved in a WindowRing) to decode in place.
+        """
+        if out is None:
+            out = np.empty((timesteps, len(self.channels), 6), dtype=np.float32)
+        for i, channel in enumerate(self.channels):
+            frames = self.drain(channel)
+            if len(frames) < timesteps:
+                raise RuntimeError(f"FIFO underrun on channel {channel}: {len(frames)} frames for {timesteps} timesteps")
+            decimate_window(frames, timesteps, mode, out=out[:, i, :])
+        return out
@@ -0,0 +1,25 @@
+import time
+
+LOCK_BACKOFF_S = 0.0001      # first pause after a busy try_lock()
+LOCK_BACKOFF_MAX_S = 0.002   # pauses double up to this
+
+
+def lock_bus(bus, deadline_ns=None):
+    """Take a busio-style bus lock, sleeping with backoff while someone else holds it.
+
+    Spinning on try_lock() would keep the GIL from the thread holding the
+    bus (an OLED refresh, another sensor thread), so it could not finish.
+    With `deadline_ns` (time.monotonic_ns()) gives up then and returns
+    False; otherwise waits as long as it takes. Returns True once locked.
+    """
+    pause = LOCK_BACKOFF_S
+    while not bus.try_lock():
+        sleep_s = pause
+        if deadline_ns is not None:
+            remaining_s = (deadline_ns - time.monotonic_ns()) / 1e9
+            if remaining_s <= 0:
+                return False
+            sleep_s = min(sleep_s, remaining_s)
+        time.sleep(sleep_s)
+        pause = min(2 * pause, LOCK_BACKOFF_MAX_S)
+    return True
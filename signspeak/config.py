@@ -0,0 +1,133 @@
+import json
+
+SENSOR_BACKENDS = ("i2c", "replay")
+DISPLAY_BACKENDS = ("oled", "console", "null")
+AUDIO_BACKENDS = ("pwm", "file", "null")
+
+DEFAULTS = {
+    # Backends: the glove, or recorded data / the terminal / silence for any Linux box
+    "sensors": "i2c",             # "i2c" or "replay" (recorded CSV, see replay_*)
+    "display": "oled",            # "oled" (SSD1306 on mux channel display_channel), "console" or "null"
+    "audio": "pwm",               # "pwm" (speaker on pwm_pin), "file" (one WAV per word in audio_out) or "null"
+
+    # The float model, the full-integer SIGNSPEAK_MLP_INT8.tflite from train.py, or an .npz of
+    # either's weights (python -m signspeak.npmlp) to run in NumPy without importing tflite
+    "model_path": "SIGNSPEAK_MLP_FINAL.tflite",
+    "labels_path": "gesture_labels.txt",
+    "audio_dir": "",              # Where the <word>.wav clips are
+    "audio_out": "spoken",        # Directory the "file" audio backend writes to
+    "pwm_pin": "P9_14",
+    "pwm_frequency": 44000,
+    "display_channel": 7,
+    "button_gpio": "60",          # Pause/resume button; None for none
+    "gesture_length_seconds": 1,
+
+    "use_fifo": True,             # Drain each BMI270's hardware FIFO once per window instead of polling
+    "acquisition_hz": 100,        # Raw sample rate (FIFO ODR or polling rate), decimated to the model's grid
+    # How raw samples reach the model's grid. The deployed model was trained on plain 10 Hz
+    # point samples, which "pick" reproduces; "mean" (interval average) and "fir" (windowed-sinc
+    # low-pass) anti-alias, but only suit a model retrained on data decimated the same way.
+    "decimation": "pick",
+    "verbose_stats": False,       # Print per-window sampler and mux counters and pipeline reports
+    "i2c_device": None,           # e.g. 2 to drive /dev/i2c-2 directly with combined I2C_RDWR transfers
+
+    # Continuous mode streams the sensors without countdowns and scores an overlapping
+    # window every hop; a word is spoken once it wins stable_hops windows in a row.
+    # Streaming always polls, use_fifo only applies to the countdown cycle. Each hop is
+    # decimated once as it lands, so a window ends on the last whole timestep polled.
+    "continuous": False,
+    "hop_seconds": 0.25,
+    "stable_hops": 2,
+    "min_confidence": 0.8,
+    "motion_threshold_dps": 20.0,  # Windows whose gyro spread stays below this are idle
+
+    # After idle_timeout_seconds of idle windows, park the IMUs in low-power any-motion
+    # detection until the hand moves again. The wake-up is a poll() on wake_gpio_path
+    # (a pin wired to an IMU's INT1), or a status read per IMU every 0.1 s when None.
+    "idle_wake": False,
+    "idle_timeout_seconds": 10,
+    "wake_gpio_path": None,
+
+    # Sample on the IMUs' data-ready interrupt: GPIO numbers wired to INT1, one per IMU in
+    # feature order, or a single one wired to the first IMU's INT1 that clocks them all
+    # (INT1 is push-pull, so never join several IMUs' pins). None polls on a fixed grid.
+    "data_ready_gpios": None,
+
+    # Where each IMU sits, in the model's feature order; None scans channels 0-6 of the
+    # mux on the default bus. Entries are {"bus": N or None, "mux": address or None,
+    # "channel": c, "address": a}; several buses get one reader thread each.
+    "topology": None,
+    # Boot reuses the IMUs found and initialized last time, verified with a few register
+    # reads. Delete the file after adding sensors; None disables it.
+    "topology_cache": "topology_cache.json",
+
+    "replay_csv": "Machine Learning/v3/final_data.csv",
+    "replay_speed": 1.0,
+    "replay_bus_latency_s": 0.0,  # Added to every sensor read and mux/display write
+    "replay_contention": 0.0,     # Fraction of time something else holds the bus
+
+    # acquire -> preprocess -> infer run as asyncio tasks joined by bounded queues of
+    # [size, policy] ("block", "drop_oldest" or "coalesce"); anything older than
+    # max_age_seconds by the time a stage takes it is dropped.
+    "preprocess_queue": (2, "drop_oldest"),
+    "infer_queue": (2, "drop_oldest"),
+    "max_age_seconds": 3.0,
+    # The infer stage scores every window waiting in its queue, up to infer_batch, with one
+    # invoke; an interpreter is allocated per batch size at boot.
+    "infer_batch": 4,
+    # TFLite interpreter options: threads per invoke (None = runtime default), xnnpack False to
+    # turn off the default delegates or a path to a delegate library to load, and how many
+    # warm-up invokes each interpreter runs at boot
+    "tflite_threads": None,
+    "tflite_xnnpack": None,
+    "tflite_warmup": 2,
+    # Countdown gestures with an .npz model: poll a timestep at a time and add each into the
+    # first layer as it lands, so only its bias and ReLU and the later layers are left when
+    # the window closes. Polls even with use_fifo; needs "mean" or "pick" decimation.
+    "incremental_first_layer": False,
+    "blocking_workers": 2,        # Executor threads for blocking I2C and TFLite calls
+    "run_duration": 60 * 60 * 4,  # seconds
+    # Run the model in a child process fed through shared memory; infer_batch and the tflite_*
+    # options apply there, one request per batch
+    "inference_process": False,
+
+    # Words play on their own thread; one predicted while another plays is handled by
+    # speech_policy: "queue", "interrupt" or "skip_repeat".
+    "speech_policy": "queue",
+    "speech_queue_size": 2,
+}
+
+CHOICES = {"sensors": SENSOR_BACKENDS, "display": DISPLAY_BACKENDS, "audio": AUDIO_BACKENDS}
+
+
+class Config:
+    """Runtime settings as attributes: DEFAULTS, then a JSON file, then keyword overrides."""
+
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+    def __repr__(self):
+        return f"Config({self.__dict__!r})"
+
+
+def load_config(path=None, **overrides):
+    """Read settings from `path` (a JSON object of DEFAULTS keys) and apply `overrides`."""
+    values = dict(DEFAULTS)
+    layers = [overrides]
+    if path is not None:
+        with open(path) as f:
+            layers.insert(0, json.load(f))
+    for layer in layers:
+        unknown = set(layer) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown settings {sorted(unknown)} in {path if layer is not overrides else 'overrides'}")
+        values.update(layer)
+    for key, choices in CHOICES.items():
+        if values[key] not in choices:
+            raise ValueError(f"{key} must be one of {choices}, got {values[key]!r}")
+    gpios, topology = values["data_ready_gpios"], values["topology"]
+    if gpios is not None and topology is not None and len(gpios) not in (1, len(topology)):
+        raise ValueError(f"data_ready_gpios needs one pin (the first IMU's INT1) or one per IMU, got {gpios}")
+    for key in ("preprocess_queue", "infer_queue"):
+        values[key] = tuple(values[key])  # JSON has no tuples
+    return Config(values)
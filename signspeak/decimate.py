@@ -0,0 +1,114 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+MODES = ("pick", "mean", "fir")
+
+
+def grid_timesteps(input_shape, sensors, axes=6):
+    """Timesteps per window implied by a flat model input of sensors x axes features."""
+    features = int(np.prod(input_shape[1:]))
+    if features % (sensors * axes):
+        raise ValueError(f"Model input of {features} features does not fit {sensors} sensors x {axes} axes")
+    return features // (sensors * axes)
+
+
+def fir_taps(factor, numtaps=None):
+    """Hamming-windowed sinc low-pass for decimating by `factor`, normalized to unit gain."""
+    if numtaps is None:
+        numtaps = 4 * factor + 1
+    n = np.arange(numtaps) - (numtaps - 1) / 2
+    taps = np.sinc(n / factor) * np.hamming(numtaps)
+    return (taps / taps.sum()).astype(np.float32)
+
+
+def decimate_window(frames, timesteps, mode="mean", out=None):
+    """Reduce one window of (n, ...) raw frames to (timesteps, ...) on the model grid.
+
+    n need not be a multiple of timesteps, which suits FIFO drains whose
+    frame count varies by a few frames from window to window.
+      pick: the raw frame at the start of each output interval (what 10 Hz polling saw)
+      mean: average of every raw frame in the interval
+      fir:  windowed-sinc low-pass centred on each interval, edges padded
+    """
+    n = len(frames)
+    if n < timesteps:
+        raise ValueError(f"{n} frames cannot fill {timesteps} timesteps")
+    if out is None:
+        out = np.empty((timesteps,) + frames.shape[1:], dtype=np.float32)
+    starts = np.arange(timesteps) * n // timesteps
+
+    if mode == "pick":
+        out[:] = frames[starts]
+    elif mode == "mean":
+        counts = np.diff(np.append(starts, n)).reshape((-1,) + (1,) * (frames.ndim - 1))
+        np.divide(np.add.reduceat(frames, starts, axis=0), counts, out=out)
+    elif mode == "fir":
+        taps = fir_taps(max(n // timesteps, 1))
+        half = len(taps) // 2
+        centres = (starts + np.append(starts[1:], n)) // 2
+        padded = np.pad(frames, [(half, half)] + [(0, 0)] * (frames.ndim - 1), mode="edge")
+        windows = sliding_window_view(padded, len(taps), axis=0)[centres]
+        np.matmul(windows, taps, out=out)
+    else:
+        raise ValueError(f"Unknown decimation mode {mode!r}, choose from {MODES}")
+    return out
+
+
+class Decimator:
+    """Streaming decimation by an integer factor for chunks of (n, sensors, axes) frames.
+
+    push() accepts any number of frames (one FIFO drain, one polling tick, ...)
+    and returns every output sample completed so far, computed with one
+    strided matmul per call. Output k covers input interval [k*factor, (k+1)*factor);
+    the fir filter reaches back into earlier intervals, so it lags by about
+    half its length.
+    """
+
+    def __init__(self, factor, sensors, axes=6, mode="mean"):
+        if mode == "pick":
+            taps = np.ones(1, dtype=np.float32)
+        elif mode == "mean":
+            taps = np.full(factor, 1.0 / factor, dtype=np.float32)
+        elif mode == "fir":
+            taps = fir_taps(factor)
+        else:
+            raise ValueError(f"Unknown decimation mode {mode!r}, choose from {MODES}")
+        self.factor = factor
+        self.mode = mode
+        self.taps = taps
+        self._pad = max(len(taps) - factor, 0)
+        self._work = np.empty((len(taps) + 4 * factor, sensors, axes), dtype=np.float32)
+        self._fill = 0
+        self._primed = False
+
+    def reset(self):
+        self._fill = 0
+        self._primed = False
+
+    def push(self, frames):
+        """Append raw frames and return the newly completed (m, sensors, axes) outputs."""
+        if not self._primed and len(frames):
+            # Seed the filter history with the first frame so startup has no transient
+            self._work[:self._pad] = frames[0]
+            self._fill = self._pad
+            self._primed = True
+        need = self._fill + len(frames)
+        if need > len(self._work):
+            grown = np.empty((2 * need,) + self._work.shape[1:], dtype=np.float32)
+            grown[:self._fill] = self._work[:self._fill]
+            self._work = grown
+        self._work[self._fill:need] = frames
+        self._fill = need
+
+        size = len(self.taps)
+        if self._fill < size:
+            return self._work[:0]
+        count = min((self._fill - size) // self.factor + 1, self._fill // self.factor)
+        if count <= 0:
+            return self._work[:0]
+        windows = sliding_window_view(self._work[:self._fill], size, axis=0)[:count * self.factor:self.factor]
+        result = windows @ self.taps
+        consumed = count * self.factor
+        self._work[:self._fill - consumed] = self._work[consumed:self._fill]
+        self._fill -= consumed
+        return result
@@ -0,0 +1,47 @@
+def display_text(oled, text):
+    oled.fill(0)
+    oled.text(text, 0, 0, 1)
+    oled.show()
+
+
+class ConsoleDisplay:
+    """Stands in for the SSD1306 off-device and prints each new screen of text."""
+
+    def __init__(self):
+        self._lines = []
+        self._shown = None
+
+    def fill(self, color):
+        self._lines = []
+
+    def text(self, text, x, y, color):
+        self._lines.append(text)
+
+    def show(self):
+        screen = " | ".join(self._lines)
+        if screen and screen != self._shown:
+            print(f"[OLED] {screen}")
+        self._shown = screen
+
+
+class NullDisplay:
+    """Display that shows nothing, for headless runs."""
+
+    def fill(self, color):
+        pass
+
+    def text(self, text, x, y, color):
+        pass
+
+    def show(self):
+        pass
+
+
+def open_display(kind, port=None):
+    """The display backend named `kind`; "oled" drives a 128x64 SSD1306 on `port`."""
+    if kind == "oled":
+        import adafruit_ssd1306
+        return adafruit_ssd1306.SSD1306_I2C(128, 64, port)
+    if kind == "console":
+        return ConsoleDisplay()
+    return NullDisplay()
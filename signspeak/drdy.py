@@ -0,0 +1,279 @@
+import os
+import select
+import stat
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from signspeak.bmi270_fifo import ACC_CONF, CONF_PERF_NORMAL, GYR_CONF, ODR_CODES
+from signspeak.buslock import lock_bus
+from signspeak.multibus import batch_bus, read_batch
+from signspeak.mux import MuxChannel
+
+# --------------------- BMI270 Registers ---------------------
+
+INT1_IO_CTRL = 0x53          # INT2_IO_CTRL follows at 0x54
+INT_MAP_DATA = 0x58
+DRDY_INT1 = 0x04             # drdy_int mapped to INT1; INT2 is bit 6
+DRDY_INT2 = 0x40
+INT_OUTPUT_PUSH_PULL_HIGH = 0x0A  # output_en | active high, push-pull
+
+
+def enable_data_ready(bus, address, odr_hz, pin=1):
+    """Run acc and gyro at `odr_hz` and pulse INT1 (or INT2) on new data; the caller holds the lock.
+
+    The output is push-pull, so no two sensors' pins may share a line.
+    pin None only sets the rate, for a sensor clocked by another one's pin.
+    """
+    code = CONF_PERF_NORMAL | ODR_CODES[odr_hz]
+    bus.writeto(address, bytes([ACC_CONF, code]))
+    bus.writeto(address, bytes([GYR_CONF, code]))
+    if pin is None:
+        return
+    mapping = bytearray(1)
+    bus.writeto_then_readfrom(address, bytes([INT_MAP_DATA]), mapping)
+    bus.writeto(address, bytes([INT_MAP_DATA, mapping[0] | (DRDY_INT1 if pin == 1 else DRDY_INT2)]))
+    bus.writeto(address, bytes([INT1_IO_CTRL + pin - 1, INT_OUTPUT_PUSH_PULL_HIGH]))
+
+
+def export_gpio(number, edge="rising"):
+    """Export a sysfs GPIO as an edge-triggered input and return its value file."""
+    base = f"/sys/class/gpio/gpio{number}"
+    if not os.path.exists(base):
+        with open("/sys/class/gpio/export", "w") as f:
+            f.write(str(number))
+    with open(f"{base}/direction", "w") as f:
+        f.write("in")
+    with open(f"{base}/edge", "w") as f:
+        f.write(edge)
+    return f"{base}/value"
+
+
+class GpioEdges:
+    """Waits for edges on several GPIO value files with one poller.
+
+    sysfs value files signal an edge with POLLPRI and are re-armed by
+    reading from offset 0. A named pipe (see FakeGpio) signals with POLLIN
+    and is drained instead, so a test harness can stand in for the pins.
+    Edges arriving faster than they are acknowledged coalesce, as on sysfs.
+    cancel() from another thread makes a blocked wait() return [] at once.
+    """
+
+    def __init__(self, paths):
+        self.poller = select.poll()
+        self._fds = []
+        self._pin = {}
+        self._fifo = {}
+        self._cancel_read, self._cancel_write = os.pipe()
+        os.set_blocking(self._cancel_read, False)
+        self.poller.register(self._cancel_read, select.POLLIN)
+        for pin, path in enumerate(paths):
+            fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            fifo = stat.S_ISFIFO(os.fstat(fd).st_mode)
+            self.poller.register(fd, select.POLLIN if fifo else select.POLLPRI | select.POLLERR)
+            self._fds.append(fd)
+            self._pin[fd] = pin
+            self._fifo[fd] = fifo
+            self._ack(fd)  # Clear the initial event
+
+    def _ack(self, fd):
+        if self._fifo[fd]:
+            self._drain(fd)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.read(fd, 8)
+
+    @staticmethod
+    def _drain(fd):
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def wait(self, timeout_ms=None):
+        """Block until at least one pin fires (or the timeout) and return the pins that did."""
+        fired = []
+        for fd, _ in self.poller.poll(timeout_ms):
+            if fd == self._cancel_read:
+                self._drain(fd)
+                return []
+            self._ack(fd)
+            fired.append(self._pin[fd])
+        return fired
+
+    def cancel(self):
+        os.write(self._cancel_write, b"\0")
+
+    def clear(self):
+        """Drop edges that arrived before now."""
+        self.wait(0)
+
+    def close(self):
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = []
+        if self._cancel_read is not None:
+            os.close(self._cancel_read)
+            os.close(self._cancel_write)
+            self._cancel_read = self._cancel_write = None
+
+
+class FakeGpio:
+    """Stand-in for a sysfs GPIO value file for exercising data-ready code off-device.
+
+    `path` is a named pipe to hand to GpioEdges; pulse() makes one edge and
+    start(rate_hz) pulses from a background thread, like a sensor's INT pin.
+    """
+
+    def __init__(self):
+        self._dir = tempfile.mkdtemp(prefix="fake_gpio_")
+        self.path = os.path.join(self._dir, "value")
+        os.mkfifo(self.path)
+        self._fd = None
+        self._running = False
+        self._thread = None
+
+    def pulse(self):
+        if self._fd is None:  # Needs a reader, so open on first use
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_NONBLOCK)
+        os.write(self._fd, b"1")
+
+    def start(self, rate_hz):
+        self._running = True
+
+        def run():
+            next_time = time.monotonic()
+            while self._running:
+                next_time += 1 / rate_hz
+                time.sleep(max(0.0, next_time - time.monotonic()))
+                self.pulse()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        if self._fd is not None:
+            os.close(self._fd)
+        os.remove(self.path)
+        os.rmdir(self._dir)
+
+
+class DataReadySampler:
+    """Reads each sensor exactly when its data-ready pin says a new sample exists.
+
+    `sensors` is a list of (port, reader) in feature order and `pins` the
+    GPIO value files: one per sensor, or a single one (the first sensor's
+    INT1) whose edges clock every sensor. A
+    sensor's k-th edge of a window lands in row k, so there are no fixed
+    sleeps, no stale repeats and no samples read twice. Rows a sensor never
+    reached, or whose read failed, are False in `valid` for fill_gaps().
+    Has the same collect()/summary() interface as MultiBusSampler, but
+    everything runs on the calling thread around one poller. Sensors on
+    one bus that are due on the same edges are read in one combined
+    transfer where batch_bus() allows it.
+    """
+
+    def __init__(self, sensors, pins, odr_hz, timeout_periods=3):
+        """A window gives up `timeout_periods` sample periods after it was due to finish."""
+        if len(pins) not in (1, len(sensors)):
+            raise ValueError(f"Need one data-ready pin or one per sensor, got {len(pins)} for {len(sensors)}")
+        self.sensors = list(sensors)
+        self.edges = GpioEdges(pins)
+        self.pin_sensors = [range(len(sensors))] if len(pins) == 1 else [[i] for i in range(len(sensors))]
+        groups = {}
+        for index, (port, _) in enumerate(self.sensors):
+            bus = port.mux.i2c if isinstance(port, MuxChannel) else port
+            groups.setdefault(id(bus), []).append(index)
+        self.bus_groups = [(indices, batch_bus([self.sensors[i] for i in indices])) for indices in groups.values()]
+        self.period_ns = int(1e9 / odr_hz)
+        self.timeout_periods = timeout_periods
+        self.valid = np.ones((0, len(sensors)), dtype=bool)
+        self.next_ns = 0
+        self.ticks = 0
+        self.missed = 0
+        self.edge_count = 0
+        self.start_ns = 0
+        self.began_ns = 0
+        self.end_ns = 0
+
+    def _read(self, port, reader, out):
+        lock_bus(port)  # OLED updates hold the default bus briefly
+        try:
+            reader.read_imu_into(out)
+            return True
+        except OSError:
+            return False  # This sample is gone; the next edge brings a fresh one
+        finally:
+            port.unlock()
+
+    def _read_batch(self, bus, mux, indices, rows):
+        lock_bus(bus)
+        try:
+            read_batch(bus, mux, [self.sensors[index] for index in indices], rows)
+            return True
+        except OSError:
+            return False  # Retried per sensor so one dead sensor only costs its own sample
+        finally:
+            bus.unlock()
+
+    def collect(self, block, start_ns=None, accumulate=False):
+        """Fill a (ticks, sensors, 6) block with the next len(block) samples of every sensor.
+
+        start_ns is accepted for MultiBusSampler compatibility; the sensors'
+        own clock sets the timing, so consecutive calls continue seamlessly.
+        With `accumulate`, summary() also covers the blocks collected since
+        the last call without it.
+        """
+        ticks = len(block)
+        if self.valid.shape[0] != ticks:
+            self.valid = np.zeros((ticks, len(self.sensors)), dtype=bool)
+        self.valid[:] = False
+        filled = [0] * len(self.sensors)
+        if not accumulate:
+            self.ticks = 0
+            self.missed = 0
+            self.edge_count = 0
+        if start_ns is None:
+            self.edges.clear()  # A fresh window wants samples from now on, not queued ones
+        self.start_ns = time.monotonic_ns()
+        if not accumulate:
+            self.began_ns = self.start_ns
+        # A sensor whose pin goes quiet must not stall the window while the others keep firing
+        deadline_ns = self.start_ns + (ticks + self.timeout_periods) * self.period_ns
+        while min(filled) < ticks:
+            remaining_ms = (deadline_ns - time.monotonic_ns()) / 1e6
+            fired = self.edges.wait(max(remaining_ms, 0))
+            if not fired:
+                break  # Out of time; leave the remaining rows invalid
+            self.edge_count += len(fired)
+            due = {index for pin in fired for index in self.pin_sensors[pin] if filled[index] < ticks}
+            for indices, batch in self.bus_groups:
+                indices = [index for index in indices if index in due]
+                rows = [block[filled[index], index] for index in indices]
+                if batch is not None and indices and self._read_batch(*batch, indices, rows):
+                    self.valid[[filled[index] for index in indices], indices] = True
+                else:
+                    for index, row in zip(indices, rows):
+                        port, reader = self.sensors[index]
+                        self.valid[filled[index], index] = self._read(port, reader, row)
+                for index in indices:
+                    filled[index] += 1
+        self.end_ns = time.monotonic_ns()
+        self.next_ns = self.end_ns
+        self.ticks += ticks
+        self.missed += int((~self.valid).sum())
+        return block
+
+    def summary(self):
+        return (f"{self.ticks} ticks on data-ready in {(self.end_ns - self.began_ns) / 1e9:.3f} s, "
+                f"{self.edge_count} edges, {self.missed} reads missed")
@@ -0,0 +1,232 @@
+import ctypes
+import errno
+import fcntl
+import json
+import os
+import threading
+
+I2C_RDWR = 0x0707       # linux/i2c-dev.h
+I2C_M_RD = 0x0001       # linux/i2c.h, message is a read
+I2C_RDWR_MAX_MSGS = 42  # I2C_RDWR_IOCTL_MAX_MSGS, the kernel rejects longer arrays
+REG_POINTER = [bytes([reg]) for reg in range(256)]  # register pointer writes, built once
+
+
+class i2c_msg(ctypes.Structure):
+    _fields_ = [("addr", ctypes.c_uint16), ("flags", ctypes.c_uint16),
+                ("len", ctypes.c_uint16), ("buf", ctypes.POINTER(ctypes.c_uint8))]
+
+
+class i2c_rdwr_ioctl_data(ctypes.Structure):
+    _fields_ = [("msgs", ctypes.POINTER(i2c_msg)), ("nmsgs", ctypes.c_uint32)]
+
+
+def reg_read_msgs(address, reg, buf):
+    """The register pointer write and data read messages of one register block read."""
+    return [(address, 0, REG_POINTER[reg]), (address, I2C_M_RD, buf)]
+
+
+class I2CMessageBus:
+    """busio.I2C-compatible front end built on transfer() of raw I2C messages.
+
+    A message is (address, flags, buffer); reads fill their buffer in place.
+    All messages passed to one transfer() go out as a single combined
+    transaction with repeated starts between them, so a register read is
+    one transfer instead of a writeto() and a readfrom_into() with a STOP
+    in between. Also offers the machine.I2C readfrom_mem/writeto_mem calls
+    the BMI270 driver uses, so it can replace I2CWrapper's bus directly.
+    Subclasses only implement _submit(). Pass an open text file as `log` to
+    record every transaction as a JSON line that ReplayI2C can play back.
+    """
+
+    def __init__(self, log=None):
+        self.log = log
+        self._lock = threading.Lock()
+        self.transfers = 0  # combined transactions (one syscall each on /dev/i2c-N)
+        self.messages = 0
+        self.bytes = 0      # payload bytes, register pointers included
+
+    # busio.I2C locking
+    def try_lock(self):
+        return self._lock.acquire(False)
+
+    def unlock(self):
+        self._lock.release()
+
+    def deinit(self):
+        pass
+
+    def transfer(self, msgs):
+        """Run messages as combined transactions, split at the kernel's message limit."""
+        for first in range(0, len(msgs), I2C_RDWR_MAX_MSGS):
+            chunk = msgs[first:first + I2C_RDWR_MAX_MSGS]
+            self._submit(chunk)
+            if self.log is not None:
+                record = [{"addr": address, "flags": flags, "data": bytes(buf).hex()}
+                          for address, flags, buf in chunk]
+                self.log.write(json.dumps(record) + "\n")
+            self.transfers += 1
+            self.messages += len(chunk)
+            self.bytes += sum(len(buf) for _, _, buf in chunk)
+
+    def _submit(self, msgs):
+        raise NotImplementedError
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        self.transfer([(address, 0, memoryview(buffer)[start:end])])
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        self.transfer([(address, I2C_M_RD, memoryview(buffer)[start:end])])
+
+    def writeto_then_readfrom(self, address, buffer_out, buffer_in, *,
+                              out_start=0, out_end=None, in_start=0, in_end=None):
+        self.transfer([(address, 0, memoryview(buffer_out)[out_start:out_end]),
+                       (address, I2C_M_RD, memoryview(buffer_in)[in_start:in_end])])
+
+    def scan(self):
+        found = []
+        probe = bytearray(1)
+        for address in range(0x08, 0x78):
+            try:
+                self.readfrom_into(address, probe)
+            except OSError:
+                continue
+            found.append(address)
+        return found
+
+    # machine.I2C style register access
+    def readfrom_mem(self, address, reg, length, *_):
+        return self.readfrom_mem_into(address, reg, bytearray(length))
+
+    def readfrom_mem_into(self, address, reg, buf, *_):
+        self.writeto_then_readfrom(address, bytes([reg]), buf)
+        return buf
+
+    def writeto_mem(self, address, reg, data, *_):
+        self.writeto(address, bytes([reg]) + bytes(data))
+
+    def read_regs(self, reads):
+        """Read several (address, reg, buf) blocks in one combined transaction.
+
+        Reads for different sensors on the same bus cost one syscall instead
+        of one per sensor. MuxManager.read_regs() does the same for sensors
+        behind a mux, with the select writes in the same transaction.
+        """
+        msgs = []
+        for address, reg, buf in reads:
+            msgs += reg_read_msgs(address, reg, buf)
+        self.transfer(msgs)
+        return [buf for _, _, buf in reads]
+
+    def reset_counters(self):
+        self.transfers = 0
+        self.messages = 0
+        self.bytes = 0
+
+    def summary(self):
+        return f"{self.transfers} transfers, {self.messages} messages, {self.bytes} bytes"
+
+
+class I2CDev(I2CMessageBus):
+    """Linux /dev/i2c-N bus driven with the I2C_RDWR ioctl, one syscall per transfer.
+
+    `bus` is the adapter number or a device path.
+    """
+
+    def __init__(self, bus, log=None):
+        super().__init__(log)
+        self.path = f"/dev/i2c-{bus}" if isinstance(bus, int) else bus
+        self._fd = os.open(self.path, os.O_RDWR)
+
+    def deinit(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _submit(self, msgs):
+        arrays = []
+        structs = (i2c_msg * len(msgs))()
+        for struct, (address, flags, buf) in zip(structs, msgs):
+            length = len(buf)
+            if flags & I2C_M_RD or not memoryview(buf).readonly:
+                array = (ctypes.c_uint8 * length).from_buffer(buf)  # shares memory, reads land in buf
+            else:
+                array = (ctypes.c_uint8 * length).from_buffer_copy(buf)  # read-only write data, e.g. bytes
+            arrays.append(array)  # keep the buffers alive until the ioctl returns
+            struct.addr = address
+            struct.flags = flags
+            struct.len = length
+            struct.buf = ctypes.cast(array, ctypes.POINTER(ctypes.c_uint8))
+        data = i2c_rdwr_ioctl_data(structs, len(msgs))
+        fcntl.ioctl(self._fd, I2C_RDWR, data)
+
+
+class ReplayI2C(I2CMessageBus):
+    """Plays back a recorded transaction log, e.g. from I2CDev on the glove, without hardware.
+
+    Writes must match the log exactly; reads are served from it. A mismatch
+    raises OSError like a NACK would, with the position in the log.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        with open(path) as f:
+            self.records = [json.loads(line) for line in f if line.strip()]
+        self.position = 0
+
+    def _submit(self, msgs):
+        if self.position >= len(self.records):
+            raise OSError(errno.EIO, f"Replay log exhausted after {self.position} transfers")
+        record = self.records[self.position]
+        expected = [(entry["addr"], entry["flags"], len(entry["data"]) // 2) for entry in record]
+        if [(address, flags, len(buf)) for address, flags, buf in msgs] != expected:
+            raise OSError(errno.EIO, f"Transfer {self.position} does not match the log: {record}")
+        for (_, flags, buf), entry in zip(msgs, record):
+            data = bytes.fromhex(entry["data"])
+            if flags & I2C_M_RD:
+                buf[:] = data
+            elif bytes(buf) != data:
+                raise OSError(errno.EIO, f"Transfer {self.position} wrote {bytes(buf).hex()}, log has {entry['data']}")
+        self.position += 1
+
+
+class FakeI2C(I2CMessageBus):
+    """In-memory bus of register-mapped devices for exercising code without hardware.
+
+    `devices` maps each address to a 256-byte register map. A write sets the
+    register pointer from its first byte and stores the rest with
+    auto-increment; a read returns bytes from the pointer on. Registers listed
+    in `ports` (address -> set of registers) are data ports that do not
+    increment, like the BMI270's INIT_DATA; bytes written to them are
+    appended to `port_data[(address, reg)]`. Unknown addresses NACK.
+    """
+
+    def __init__(self, devices, ports=None, log=None):
+        super().__init__(log)
+        self.devices = {address: bytearray(regs) for address, regs in devices.items()}
+        self.ports = ports or {}
+        self.port_data = {}
+        self._pointer = dict.fromkeys(self.devices, 0)
+
+    def _submit(self, msgs):
+        for address, flags, buf in msgs:
+            if address not in self.devices:
+                raise OSError(errno.ENXIO, f"No device at {address:#x}")
+            regs = self.devices[address]
+            ports = self.ports.get(address, ())
+            if flags & I2C_M_RD:
+                reg = self._pointer[address]
+                if reg in ports:
+                    buf[:] = bytes([regs[reg]]) * len(buf)
+                else:
+                    buf[:] = bytes(regs[(reg + i) & 0xFF] for i in range(len(buf)))
+                    self._pointer[address] = (reg + len(buf)) & 0xFF
+            elif len(buf):
+                reg = buf[0]
+                data = bytes(buf[1:])
+                if reg in ports:
+                    self.port_data.setdefault((address, reg), bytearray()).extend(data)
+                    self._pointer[address] = reg
+                else:
+                    for i, value in enumerate(data):
+                        regs[(reg + i) & 0xFF] = value
+                    self._pointer[address] = (reg + len(data)) & 0xFF
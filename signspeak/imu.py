@@ -0,0 +1,65 @@
+import struct
+
+import numpy as np
+
+# --------------------- BMI270 Registers ---------------------
+
+BMI270_ADDRESS = 0x68
+IMU_DATA_REG = 0x0C  # acc x, y, z then gyr x, y, z (12 contiguous bytes)
+IMU_DATA_LEN = 12
+ACC_RANGE_REG = 0x41
+GRAVITY = 9.80665
+
+
+class I2CWrapper:
+    """Register access to one BMI270 in the form the micropython_bmi270 driver expects.
+
+    Also reads all six axes in one burst, scaled to m/s^2 and dps.
+    """
+
+    def __init__(self, i2c_obj, address):
+        self._i2c = i2c_obj
+        self._address = address
+        self._reg = bytearray(1)
+        self._imu_buf = bytearray(IMU_DATA_LEN)
+        self._scale = (1.0,) * 6
+        self._imu_raw = np.frombuffer(self._imu_buf, dtype="<i2")  # Live view of _imu_buf
+        self._scale_arr = np.ones(6, dtype=np.float32)
+
+    def readfrom_mem(self, addr, reg, length, *_):
+        return self._read_reg_into(reg, bytearray(length))
+
+    def _read_reg_into(self, reg, buf):
+        """Reads len(buf) bytes starting at reg in one write-then-read transaction."""
+        self._reg[0] = reg
+        self._i2c.writeto_then_readfrom(self._address, self._reg, buf)
+        return buf
+
+    def writeto_mem(self, addr, reg, data, *_):
+        self._i2c.writeto(self._address, bytes([reg]) + bytes(data))
+
+    def load_scales(self):
+        """Caches the accel (m/s^2) and gyro (dps) scale factors from the range registers."""
+        ranges = self._read_reg_into(ACC_RANGE_REG, bytearray(3))  # ACC_RANGE, GYR_CONF, GYR_RANGE
+        acc = GRAVITY / (16384 >> (ranges[0] & 0x03))
+        gyr = 1.0 / (16.4 * (1 << (ranges[2] & 0x07)))
+        self._scale = (acc, acc, acc, gyr, gyr, gyr)
+        self._scale_arr[:] = self._scale
+
+    def read_imu(self):
+        """Reads acc x, y, z, gyr x, y, z in one burst, scaled like sensor.acceleration + sensor.gyro."""
+        raw = struct.unpack_from("<6h", self._read_reg_into(IMU_DATA_REG, self._imu_buf))
+        return [value * scale for value, scale in zip(raw, self._scale)]
+
+    def read_imu_into(self, out):
+        """Like read_imu, but scales straight into a float32 row of 6 (e.g. a WindowRing slot)."""
+        self._read_reg_into(IMU_DATA_REG, self._imu_buf)
+        self.scale_into(out)
+
+    def imu_request(self):
+        """The (address, reg, buf) read that read_imu_into issues, for batching with other sensors."""
+        return self._address, IMU_DATA_REG, self._imu_buf
+
+    def scale_into(self, out):
+        """Scales the last burst in the data buffer into out, after a batched imu_request() read."""
+        np.multiply(self._imu_raw, self._scale_arr, out=out)
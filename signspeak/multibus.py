@@ -0,0 +1,209 @@
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from signspeak.buslock import lock_bus
+from signspeak.i2cdev import I2CMessageBus
+from signspeak.imu import I2CWrapper
+from signspeak.mux import TCA9548A_ADDRESS, MuxChannel
+from signspeak.sampler import DeadlineSampler
+
+RETRY_BACKOFF_S = 0.0005  # pause after a failed transfer so a dead sensor does not flood the bus
+
+SensorSlot = namedtuple("SensorSlot", ["bus", "mux", "channel", "address"])
+
+
+def parse_topology(entries, default_address=0x68):
+    """Turn topology entries into SensorSlots, keeping their order as the model's feature order.
+
+    Each entry is a dict such as {"bus": 2, "mux": 0x70, "channel": 3}.
+    "bus" None means the board's default bus (the one the OLED is on),
+    "mux" None means the sensor sits directly on the bus, and "address"
+    defaults to the BMI270's 0x68.
+    """
+    slots = []
+    for entry in entries:
+        slot = SensorSlot(entry.get("bus"), entry.get("mux", TCA9548A_ADDRESS),
+                          entry.get("channel"), entry.get("address", default_address))
+        if slot.mux is not None and slot.channel is None:
+            raise ValueError(f"Sensor behind mux {slot.mux:#x} needs a channel: {entry}")
+        if slot in slots:
+            raise ValueError(f"Sensor listed twice in topology: {entry}")
+        slots.append(slot)
+    return slots
+
+
+def fill_gaps(block, valid):
+    """Interpolate missed reads in a (ticks, sensors, axes) block in place; returns how many.
+
+    `valid` is the (ticks, sensors) mask of reads that succeeded. Gaps are
+    filled linearly from the sensor's neighbouring ticks, and gaps at either
+    edge hold the nearest reading. A sensor with no reading at all in the
+    block raises RuntimeError, since there is nothing to fill from.
+    """
+    ticks = np.arange(len(block))
+    for sensor in np.flatnonzero(~valid.all(axis=0)):
+        ok = valid[:, sensor]
+        if not ok.any():
+            raise RuntimeError(f"IMU {sensor} returned no readings in {len(block)} ticks")
+        for axis in range(block.shape[2]):
+            block[~ok, sensor, axis] = np.interp(ticks[~ok], ticks[ok], block[ok, sensor, axis])
+    return int((~valid).sum())
+
+
+def batch_bus(sensors):
+    """The (bus, mux) through which one combined transfer reads every (port, reader), or None.
+
+    That needs I2CWrapper readers on an I2CMessageBus, either all on the
+    bus itself (mux None) or all behind the same MuxManager.
+    """
+    ports = [port for port, _ in sensors]
+    if not all(isinstance(reader, I2CWrapper) for _, reader in sensors):
+        return None
+    if all(port is ports[0] for port in ports) and isinstance(ports[0], I2CMessageBus):
+        return ports[0], None
+    if all(isinstance(port, MuxChannel) and port.mux is ports[0].mux for port in ports) \
+            and isinstance(ports[0].mux.i2c, I2CMessageBus):
+        return ports[0].mux.i2c, ports[0].mux
+    return None
+
+
+def read_batch(bus, mux, sensors, outs):
+    """Read every (port, reader) into its row of outs in one transfer; the caller holds the bus lock."""
+    if mux is None:
+        bus.read_regs([reader.imu_request() for _, reader in sensors])
+    else:
+        mux.read_regs([(port.channel, *reader.imu_request()) for port, reader in sensors])
+    for (_, reader), out in zip(sensors, outs):
+        reader.scale_into(out)
+
+
+class MultiBusSampler:
+    """Polls sensors spread over several I2C buses with one reader thread per bus.
+
+    `sensors` is a list of (bus_key, port, reader) in feature order, where
+    port is the lockable bus or mux channel and reader has read_imu_into(out).
+    Each bus thread runs its own DeadlineSampler against a shared start time,
+    so row t of the frame block holds tick t from every bus no matter which
+    bus finishes first. Threads only synchronize at window start and end.
+    `ticks` sizes the timing buffers; collect() runs as many ticks as its
+    block has rows.
+
+    When batch_bus() allows it, a bus's whole tick is one combined transfer
+    (one ioctl on /dev/i2c-N) instead of one per sensor. If that transfer
+    fails, the tick falls back to per-sensor reads so one dead sensor
+    does not take the others on its bus down with it.
+
+    A busy bus or a failed transfer (OSError) is retried until the tick's
+    deadline, the due time of the next tick. Reads still missing then are
+    marked False in `valid` instead of shifting later readings into the
+    wrong slot; fill_gaps() repairs them.
+    """
+
+    def __init__(self, sensors, period_s, ticks):
+        groups = {}
+        for index, (bus_key, port, reader) in enumerate(sensors):
+            groups.setdefault(bus_key, []).append((index, port, reader))
+        self.bus_keys = list(groups)
+        self.groups = list(groups.values())
+        self.valid = np.ones((ticks, len(sensors)), dtype=bool)
+        self.read_errors = 0  # failed transfers that were retried
+        self.missed = 0       # reads still missing at their tick's deadline
+        self.samplers = [DeadlineSampler(period_s, ticks) for _ in self.groups]
+        self.ticks = ticks
+        self.period_ns = int(period_s * 1e9)
+        self.next_ns = 0  # where the tick after the last collected block is due
+        self._block = None
+        self._start_ns = 0
+        self._errors = []
+        self._accumulate = False
+        self._start = threading.Barrier(len(self.groups) + 1)
+        self._done = threading.Barrier(len(self.groups) + 1)
+        for group, sampler in zip(self.groups, self.samplers):
+            threading.Thread(target=self._bus_worker, args=(group, sampler), daemon=True).start()
+
+    def _bus_worker(self, group, sampler):
+        # Alternate the order so the last sensor of one tick is the first of the
+        # next and a mux keeps its selection across the tick boundary
+        orders = (group, group[::-1])
+        batch = batch_bus([(port, reader) for _, port, reader in group])
+        sensors = [[(port, reader) for _, port, reader in order] for order in orders]
+        indices = [[index for index, _, _ in order] for order in orders]
+
+        def read_tick(t):
+            deadline_ns = sampler.start_ns + (t + 1) * sampler.period_ns
+            if batch is not None and self._read_batch(*batch, sensors[t % 2], indices[t % 2], t, deadline_ns):
+                return
+            for index, port, reader in orders[t % 2]:
+                self.valid[t, index] = self._read(port, reader, self._block[t, index], deadline_ns)
+
+        while True:
+            self._start.wait()
+            try:
+                sampler.run(self.ticks, read_tick, self._start_ns, self._accumulate)
+            except Exception as e:
+                self._errors.append(e)
+            self._done.wait()
+
+    def _read(self, port, reader, out, deadline_ns):
+        while lock_bus(port, deadline_ns):  # OLED updates hold the default bus briefly
+            try:
+                reader.read_imu_into(out)
+                return True
+            except OSError:
+                self.read_errors += 1
+            finally:
+                port.unlock()
+            time.sleep(RETRY_BACKOFF_S)
+            if time.monotonic_ns() >= deadline_ns:
+                break
+        return False
+
+    def _read_batch(self, bus, mux, sensors, indices, t, deadline_ns):
+        if not lock_bus(bus, deadline_ns):
+            return False
+        try:
+            read_batch(bus, mux, sensors, [self._block[t, index] for index in indices])
+        except OSError:
+            self.read_errors += 1
+            return False
+        finally:
+            bus.unlock()
+        self.valid[t, indices] = True
+        return True
+
+    def collect(self, block, start_ns=None, lead_s=0.002, accumulate=False):
+        """Fill a (ticks, sensors, 6) block with one window, every bus in parallel.
+
+        Pass start_ns=self.next_ns to continue the previous block's tick grid
+        without a gap, as continuous streaming does. With `accumulate`,
+        summary() covers this block and the ones collected before it since
+        the last call without it.
+        """
+        if not accumulate:
+            self.read_errors = 0
+            self.missed = 0
+        self._accumulate = accumulate
+        self._block = block
+        self.ticks = len(block)
+        if len(self.valid) != self.ticks:
+            self.valid = np.ones((self.ticks, self.valid.shape[1]), dtype=bool)
+        self._errors.clear()
+        if start_ns is None:
+            start_ns = time.monotonic_ns() + int(lead_s * 1e9)
+        self._start_ns = start_ns
+        self.next_ns = start_ns + self.ticks * self.period_ns
+        self._start.wait()
+        self._done.wait()
+        self.missed += int((~self.valid).sum())
+        if self._errors:
+            raise self._errors[0]
+        return block
+
+    def summary(self):
+        report = "; ".join(f"bus {key}: {sampler.summary()}" for key, sampler in zip(self.bus_keys, self.samplers))
+        if self.missed or self.read_errors:
+            report += f"; {self.missed} reads missed, {self.read_errors} transfer errors retried"
+        return report
@@ -0,0 +1,113 @@
+from signspeak.i2cdev import reg_read_msgs
+
+TCA9548A_ADDRESS = 0x70
+
+
+class MuxManager:
+    """TCA9548A front end that remembers which channel is currently selected.
+
+    adafruit_tca9548a writes the control register on every try_lock() and
+    again on every unlock(). Here a channel stays selected after unlock and
+    the control write is skipped when the next user wants the same channel.
+    Everything on the bus (IMUs and OLED) must go through the same manager,
+    otherwise the cached selection goes stale. Indexing works like
+    TCA9548A, so `tca[channel].try_lock()` call sites keep working.
+    """
+
+    def __init__(self, i2c, address=TCA9548A_ADDRESS):
+        self.i2c = i2c
+        self.address = address
+        self.selected = None
+        self.switches = 0  # control-register writes issued
+        self.saved = 0     # selections skipped because the channel was already active
+        self._select_cmd = [bytes([1 << channel]) for channel in range(8)]
+        self._channels = [MuxChannel(self, channel) for channel in range(8)]
+
+    def __len__(self):
+        return 8
+
+    def __getitem__(self, channel):
+        return self._channels[channel]
+
+    def select(self, channel):
+        """Route the bus to `channel`; the caller must hold the bus lock."""
+        if channel == self.selected:
+            self.saved += 1
+            return
+        try:
+            self.i2c.writeto(self.address, self._select_cmd[channel])
+        except OSError:
+            self.selected = None  # state unknown, force a write next time
+            raise
+        self.selected = channel
+        self.switches += 1
+
+    def read_regs(self, reads):
+        """Read (channel, address, reg, buf) blocks in one combined transaction.
+
+        Needs an I2CMessageBus underneath and the caller must hold the bus
+        lock. A select write goes into the transaction only where the
+        channel changes, so sensors on several channels cost one syscall.
+        """
+        msgs = []
+        selected = self.selected
+        switches = 0
+        for channel, address, reg, buf in reads:
+            if channel != selected:
+                msgs.append((self.address, 0, self._select_cmd[channel]))
+                selected = channel
+                switches += 1
+            msgs += reg_read_msgs(address, reg, buf)
+        try:
+            self.i2c.transfer(msgs)
+        except OSError:
+            self.selected = None  # state unknown, force a write next time
+            raise
+        self.selected = selected
+        self.switches += switches
+        self.saved += len(reads) - switches
+        return [buf for _, _, _, buf in reads]
+
+    def reset_counters(self):
+        self.switches = 0
+        self.saved = 0
+
+    def summary(self):
+        # adafruit_tca9548a writes the control register on both lock and unlock
+        baseline = 2 * (self.switches + self.saved)
+        return f"mux writes {self.switches} of {baseline} ({baseline - self.switches} saved)"
+
+
+class MuxChannel:
+    """busio.I2C-compatible view of one mux channel that selects lazily on lock."""
+
+    def __init__(self, mux, channel):
+        self.mux = mux
+        self.channel = channel
+
+    def try_lock(self):
+        if not self.mux.i2c.try_lock():
+            return False
+        try:
+            self.mux.select(self.channel)
+        except OSError:
+            self.mux.i2c.unlock()
+            raise
+        return True
+
+    def unlock(self):
+        # Leave the channel selected so the next access to it is free
+        self.mux.i2c.unlock()
+
+    def readfrom_into(self, address, buffer, **kwargs):
+        return self.mux.i2c.readfrom_into(address, buffer, **kwargs)
+
+    def writeto(self, address, buffer, **kwargs):
+        return self.mux.i2c.writeto(address, buffer, **kwargs)
+
+    def writeto_then_readfrom(self, address, buffer_out, buffer_in, **kwargs):
+        return self.mux.i2c.writeto_then_readfrom(address, buffer_out, buffer_in, **kwargs)
+
+    def scan(self):
+        # Raw bus scan, mux address included, like the TCA9548A channels it replaces
+        return self.mux.i2c.scan()
@@ -0,0 +1,319 @@
+import argparse
+import struct
+import time
+
+import numpy as np
+
+# TFLite schema numbers the flatbuffer reader needs
+FULLY_CONNECTED = 9
+SOFTMAX = 25
+FUSED_ACTIVATIONS = {0: "linear", 1: "relu"}
+TENSOR_TYPES = {0: np.float32, 1: np.float16, 2: np.int32, 3: np.uint8, 9: np.int8}
+
+
+class _Table:
+    """Just enough of a flatbuffer table to walk a .tflite model without tflite installed."""
+
+    def __init__(self, buf, pos):
+        self.buf = buf
+        self.pos = pos
+        vtable = pos - struct.unpack_from("<i", buf, pos)[0]
+        size = struct.unpack_from("<H", buf, vtable)[0]
+        self._fields = struct.unpack_from(f"<{(size - 4) // 2}H", buf, vtable + 4)
+
+    def _offset(self, field):
+        return self._fields[field] if field < len(self._fields) else 0
+
+    def scalar(self, field, fmt, default=0):
+        offset = self._offset(field)
+        return struct.unpack_from(fmt, self.buf, self.pos + offset)[0] if offset else default
+
+    def _target(self, field):
+        at = self.pos + self._offset(field)
+        return at + struct.unpack_from("<I", self.buf, at)[0]
+
+    def table(self, field):
+        return _Table(self.buf, self._target(field)) if self._offset(field) else None
+
+    def vector(self, field, dtype):
+        """A vector of scalars as a NumPy array (a view of the file for bytes)."""
+        if not self._offset(field):
+            return np.empty(0, dtype)
+        at = self._target(field)
+        length = struct.unpack_from("<I", self.buf, at)[0]
+        return np.frombuffer(self.buf, dtype, length, at + 4)
+
+    def tables(self, field):
+        if not self._offset(field):
+            return []
+        at = self._target(field)
+        length = struct.unpack_from("<I", self.buf, at)[0]
+        items = []
+        for i in range(length):
+            item = at + 4 + 4 * i
+            items.append(_Table(self.buf, item + struct.unpack_from("<I", self.buf, item)[0]))
+        return items
+
+
+def _tflite_tensor(model, tensor):
+    """A constant tensor's values as float32, dequantized with its own scale and zero point."""
+    buffer = model.tables(4)[tensor.scalar(2, "<I")]
+    shape = tuple(tensor.vector(0, "<i4"))
+    values = buffer.vector(0, np.uint8).view(TENSOR_TYPES[tensor.scalar(1, "<b")]).reshape(shape)
+    quantization = tensor.table(4)
+    if values.dtype.kind in "iu" and quantization is not None and len(quantization.vector(2, "<f4")):
+        scale = quantization.vector(2, "<f4")
+        zero_point = quantization.vector(3, "<i8")
+        if len(scale) > 1:  # Per output channel
+            scale = scale.reshape((-1,) + (1,) * (values.ndim - 1))
+            zero_point = zero_point.reshape(scale.shape)
+        return ((values.astype(np.float32) - zero_point) * scale).astype(np.float32)
+    return values.astype(np.float32)
+
+
+def load_tflite_weights(path):
+    """(kernels, biases, activations) of the dense layers of a .tflite MLP, in order."""
+    with open(path, "rb") as f:
+        buf = f.read()
+    model = _Table(buf, struct.unpack_from("<I", buf, 0)[0])
+    codes = [max(code.scalar(0, "<b"), code.scalar(3, "<i")) for code in model.tables(1)]
+    graph = model.tables(2)[0]
+    tensors = graph.tables(0)
+    kernels, biases, activations = [], [], []
+    for op in graph.tables(3):
+        code = codes[op.scalar(0, "<I")]
+        if code == FULLY_CONNECTED:
+            inputs = op.vector(1, "<i4")
+            kernel = _tflite_tensor(model, tensors[inputs[1]]).T  # TFLite stores (out, in)
+            bias = (_tflite_tensor(model, tensors[inputs[2]]) if len(inputs) > 2 and inputs[2] >= 0
+                    else np.zeros(kernel.shape[1], np.float32))
+            fused = op.table(4).scalar(0, "<b") if op.table(4) is not None else 0
+            if fused not in FUSED_ACTIVATIONS:
+                raise ValueError(f"Unsupported fused activation {fused} in {path}")
+            kernels.append(kernel)
+            biases.append(bias)
+            activations.append(FUSED_ACTIVATIONS[fused])
+        elif code == SOFTMAX:
+            activations[-1] = "softmax"
+    if not kernels:
+        raise ValueError(f"No dense layers found in {path}")
+    return kernels, biases, activations
+
+
+def load_h5_weights(path):
+    """(kernels, biases, activations) of the Dense layers of a Keras .h5 model, in order."""
+    import json
+
+    import h5py
+
+    with h5py.File(path, "r") as f:
+        config = json.loads(f.attrs["model_config"])
+        layers = {layer["config"]["name"]: layer["config"] for layer in config["config"]["layers"]}
+        weights = f["model_weights"]
+        kernels, biases, activations = [], [], []
+        for name in weights.attrs["layer_names"]:
+            name = name.decode() if isinstance(name, bytes) else name
+            names = [n.decode() if isinstance(n, bytes) else n for n in weights[name].attrs["weight_names"]]
+            if not names:
+                continue  # Input, Dropout
+            values = {n.rsplit("/", 1)[-1].split(":")[0]: np.asarray(weights[name][n], np.float32) for n in names}
+            kernels.append(values["kernel"])
+            biases.append(values.get("bias", np.zeros(values["kernel"].shape[1], np.float32)))
+            activations.append(layers.get(name, {}).get("activation", "linear"))
+    return kernels, biases, activations
+
+
+def extract(model_path, npz_path):
+    """Save a .tflite or .h5 MLP's weights as an .npz NumpyMLP loads."""
+    load = load_h5_weights if model_path.endswith((".h5", ".keras")) else load_tflite_weights
+    kernels, biases, activations = load(model_path)
+    arrays = {"activations": np.array(activations)}
+    for i, (kernel, bias) in enumerate(zip(kernels, biases)):
+        arrays[f"w{i}"] = np.ascontiguousarray(kernel, np.float32)
+        arrays[f"b{i}"] = np.asarray(bias, np.float32)
+    np.savez(npz_path, **arrays)
+    print(f"{model_path}: {' -> '.join(str(k.shape[0]) for k in kernels)} -> {kernels[-1].shape[1]} "
+          f"({', '.join(activations)}), saved {npz_path}")
+
+
+def activate(out, activation):
+    """Apply a dense layer's activation to its (rows, units) output in place."""
+    if activation == "relu":
+        np.maximum(out, 0, out=out)
+    elif activation == "softmax":
+        out -= out.max(axis=1, keepdims=True)
+        np.exp(out, out=out)
+        out /= out.sum(axis=1, keepdims=True)
+
+
+class NumpyMLP:
+    """The dense ReLU network evaluated with NumPy, so tflite_runtime is never imported.
+
+    Loads an .npz from extract() and has the same interface as
+    BatchInterpreter. Every batch size gets preallocated activation
+    buffers, each layer is a matmul into its buffer with the bias added and
+    ReLU applied in place, and a single window is read straight from its
+    ring view without a copy.
+    """
+
+    input_quantization = None
+
+    def __init__(self, model_path, max_batch=8):
+        self.model_path = model_path
+        self.max_batch = max_batch
+        with np.load(model_path) as data:
+            self.activations = [str(a) for a in data["activations"]]
+            self.kernels = [np.ascontiguousarray(data[f"w{i}"], np.float32) for i in range(len(self.activations))]
+            self.biases = [np.asarray(data[f"b{i}"], np.float32) for i in range(len(self.activations))]
+        self.input_shape = (1, self.kernels[0].shape[0])
+        self.outputs = self.kernels[-1].shape[1]
+        self._buffers = {}  # batch size -> [input, one output per layer]
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.invokes = 0
+        self.rows = 0
+
+    def _buffers_for(self, size):
+        buffers = self._buffers.get(size)
+        if buffers is None:
+            buffers = [np.empty((size, self.input_shape[1]), np.float32)]
+            buffers += [np.empty((size, kernel.shape[1]), np.float32) for kernel in self.kernels]
+            self._buffers[size] = buffers
+        return buffers
+
+    def warm(self, sizes=None):
+        for size in sizes or range(1, self.max_batch + 1):
+            self._buffers_for(size)
+
+    def forward(self, x, buffers, first=0):
+        """Run the layers from `first` on x (rows, features) into `buffers`; returns the last one."""
+        layers = zip(self.kernels[first:], self.biases[first:], self.activations[first:], buffers[first + 1:])
+        for kernel, bias, activation, out in layers:
+            np.matmul(x, kernel, out=out)
+            out += bias
+            activate(out, activation)
+            x = out
+        return x
+
+    def predict(self, rows):
+        """Probabilities shaped (len(rows), outputs), like BatchInterpreter.predict()."""
+        results = np.empty((len(rows), self.outputs), dtype=np.float32)
+        for start in range(0, len(rows), self.max_batch):
+            chunk = rows[start:start + self.max_batch]
+            buffers = self._buffers_for(len(chunk))
+            if isinstance(chunk, np.ndarray):
+                x = chunk.reshape(buffers[0].shape)
+                if x.dtype != np.float32:
+                    buffers[0][:] = x
+                    x = buffers[0]
+            elif len(chunk) == 1 and chunk[0].dtype == np.float32:
+                x = chunk[0].reshape(buffers[0].shape)  # The ring view itself
+            else:
+                x = buffers[0]
+                for i, row in enumerate(chunk):
+                    x[i] = row.reshape(x.shape[1:])
+            results[start:start + len(chunk)] = self.forward(x, buffers)
+            self.invokes += 1
+            self.rows += len(chunk)
+        return results
+
+    def summary(self):
+        if not self.invokes:
+            return "model: idle"
+        return (f"numpy model: {self.rows} windows in {self.invokes} calls ({self.rows / self.invokes:.1f} per call), "
+                f"buffers for batch sizes {sorted(self._buffers)}")
+
+
+class StreamingMLP:
+    """A NumpyMLP fed one timestep at a time, so a prediction is ready as the window closes.
+
+    The first dense layer is linear in its inputs, and a window's inputs
+    arrive a timestep (sensors x axes values) at a time. add() multiplies
+    each timestep into the matching rows of the first kernel as soon as it
+    is sampled and sums the result into the layer's pre-activation; once
+    the last one lands, finish() only has the bias, the activation and the
+    small later layers left. Summing per timestep rounds differently from
+    one matmul, so with `verify` finish() also runs the full forward pass
+    on the window and keeps the largest difference seen.
+    """
+
+    def __init__(self, model, timesteps, verify=False):
+        kernel = model.kernels[0]
+        if kernel.shape[0] % timesteps:
+            raise ValueError(f"{kernel.shape[0]} inputs do not split into {timesteps} timesteps")
+        self.model = model
+        self.timesteps = timesteps
+        step = kernel.shape[0] // timesteps
+        self._rows = [kernel[t * step:(t + 1) * step] for t in range(timesteps)]  # Contiguous views
+        # Own buffers: the infer stage may be running predict() on another thread
+        self._buffers = [np.empty((1, kernel.shape[0]), np.float32)]
+        self._buffers += [np.empty((1, k.shape[1]), np.float32) for k in model.kernels]
+        self._verify_buffers = [np.empty_like(b) for b in self._buffers] if verify else None
+        self._partial = np.empty((1, kernel.shape[1]), np.float32)
+        self.added = 0
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.windows = 0
+        self.add_ns = 0     # Timestep multiplies, spent while the next one is being sampled
+        self.finish_ns = 0  # Everything left after the last timestep
+        self.max_diff = 0.0
+
+    def start(self):
+        """Begin a new window."""
+        self._buffers[1][:] = 0
+        self.added = 0
+
+    def add(self, values):
+        """Accumulate the next timestep, (sensors, axes) or flat, into the first layer."""
+        began = time.perf_counter_ns()
+        np.matmul(values.reshape(1, -1), self._rows[self.added], out=self._partial)
+        self._buffers[1] += self._partial
+        self.added += 1
+        self.add_ns += time.perf_counter_ns() - began
+
+    def finish(self, window=None):
+        """Probabilities shaped (1, outputs) for the window whose timesteps were added.
+
+        Pass the window itself to check the result against the full pass.
+        """
+        if self.added != self.timesteps:
+            raise ValueError(f"Window has {self.added} of {self.timesteps} timesteps")
+        began = time.perf_counter_ns()
+        model, hidden = self.model, self._buffers[1]
+        hidden += model.biases[0]
+        activate(hidden, model.activations[0])
+        result = model.forward(hidden, self._buffers, first=1).copy()
+        self.finish_ns += time.perf_counter_ns() - began
+        self.windows += 1
+        if self._verify_buffers is not None and window is not None:
+            full = model.forward(window.reshape(1, -1), self._verify_buffers)
+            self.max_diff = max(self.max_diff, float(np.abs(result - full).max()))
+        return result
+
+    def summary(self):
+        if not self.windows:
+            return "streamed first layer: idle"
+        per_window = self.windows * 1e3
+        report = (f"streamed first layer: {self.windows} windows, {self.add_ns / per_window / self.timesteps:.0f} us "
+                  f"per timestep while sampling, {self.finish_ns / per_window:.0f} us after the last")
+        if self._verify_buffers is not None:
+            report += f", max difference from the full pass {self.max_diff:.1e}"
+        return report
+
+
+def open_model(model_path, max_batch=8, **tflite_options):
+    """NumpyMLP for an .npz, otherwise a BatchInterpreter (which imports tflite) given `tflite_options`."""
+    if model_path.endswith(".npz"):
+        return NumpyMLP(model_path, max_batch)
+    from signspeak.batch import BatchInterpreter
+    return BatchInterpreter(model_path, max_batch, **tflite_options)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract an MLP's weights for NumpyMLP")
+    parser.add_argument("model_path", help=".tflite or Keras .h5 model")
+    parser.add_argument("npz_path", help="where to write the .npz")
+    args = parser.parse_args()
+    extract(args.model_path, args.npz_path)
@@ -0,0 +1,249 @@
+import asyncio
+import collections
+import inspect
+import time
+
+POLICIES = ("block", "drop_oldest", "coalesce")
+
+
+class AsyncStageQueue:
+    """Bounded hand-off between two pipeline stages running as tasks on one asyncio event loop.
+
+    What a put() does when `maxsize` items are already waiting depends on
+    `policy`:
+      block        wait for room, pushing back on the stage that produces
+      drop_oldest  discard the oldest waiting item to make room
+      coalesce     keep only the newest item; a put replaces whatever waits
+    Every item carries the time it was born (when its window finished
+    acquiring), and get() discards items older than `max_age_s` so the
+    stages after this queue never work on stale data.
+
+    put() and get() are coroutines; put_nowait() suits non-blocking
+    policies and callbacks. It is not thread-safe: from another thread use
+    loop.call_soon_threadsafe(queue.put_nowait, item).
+    """
+
+    def __init__(self, name, maxsize=1, policy="block", max_age_s=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy {policy!r}, expected one of {POLICIES}")
+        self.name = name
+        self.maxsize = 1 if policy == "coalesce" else maxsize
+        self.policy = policy
+        self.max_age_ns = None if max_age_s is None else int(max_age_s * 1e9)
+        self._items = collections.deque()  # (item, born_ns, queued_ns)
+        self._cond = asyncio.Condition()
+        self._ready = asyncio.Event()  # set while items are waiting
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.puts = 0
+        self.dropped = 0     # pushed out by drop_oldest/coalesce
+        self.stale = 0       # older than max_age_s when taken
+        self.peak_depth = 0
+        self.blocked_ns = 0  # producer time spent waiting for room
+        self.waited = 0
+        self.wait_ns_total = 0
+        self.wait_ns_max = 0
+
+    @property
+    def depth(self):
+        return len(self._items)
+
+    @property
+    def full(self):
+        return len(self._items) >= self.maxsize
+
+    def _pop(self):
+        """The oldest item as (item, born_ns), or None if it had gone stale."""
+        item, born_ns, queued_ns = self._items.popleft()
+        now = time.monotonic_ns()
+        if self.max_age_ns is not None and now - born_ns > self.max_age_ns:
+            self.stale += 1
+            return None
+        wait_ns = now - queued_ns
+        self.waited += 1
+        self.wait_ns_total += wait_ns
+        self.wait_ns_max = max(self.wait_ns_max, wait_ns)
+        return item, born_ns
+
+    def put_nowait(self, item, born_ns=None):
+        if self.policy == "block" and self.full:
+            raise asyncio.QueueFull(self.name)
+        now = time.monotonic_ns()
+        if self.full:
+            self._items.popleft()
+            self.dropped += 1
+        self._items.append((item, now if born_ns is None else born_ns, now))
+        self.puts += 1
+        self.peak_depth = max(self.peak_depth, len(self._items))
+        self._ready.set()
+
+    async def put(self, item, born_ns=None):
+        if self.policy == "block" and self.full:
+            now = time.monotonic_ns()
+            async with self._cond:
+                await self._cond.wait_for(lambda: not self.full)
+            self.blocked_ns += time.monotonic_ns() - now
+        self.put_nowait(item, born_ns)
+
+    async def get(self):
+        """Wait for the oldest fresh item; returns (item, born_ns)."""
+        while True:
+            await self._ready.wait()
+            if not self._items:
+                self._ready.clear()
+                continue
+            entry = self._pop()
+            if not self._items:
+                self._ready.clear()
+            async with self._cond:
+                self._cond.notify_all()
+            if entry is not None:
+                return entry
+
+    async def get_batch(self, limit):
+        """Wait for one fresh item, then take up to `limit` - 1 more that are already waiting."""
+        batch = [await self.get()]
+        while len(batch) < limit and self._items:
+            entry = self._pop()
+            if entry is not None:
+                batch.append(entry)
+        if not self._items:
+            self._ready.clear()
+        async with self._cond:
+            self._cond.notify_all()
+        return batch
+
+    def summary(self):
+        mean_ms = self.wait_ns_total / self.waited / 1e6 if self.waited else 0.0
+        text = (f"{self.name}: depth {self.depth}/{self.maxsize} (peak {self.peak_depth}, {self.policy}), "
+                f"wait {mean_ms:.1f}/{self.wait_ns_max / 1e6:.1f} ms mean/max")
+        if self.dropped:
+            text += f", {self.dropped} dropped"
+        if self.stale:
+            text += f", {self.stale} stale"
+        if self.blocked_ns:
+            text += f", producer blocked {self.blocked_ns / 1e9:.2f} s"
+        return text
+
+
+class AsyncStage:
+    """One pipeline step running as an asyncio task.
+
+    A source stage has no inbox and iterates `func()` (an async generator),
+    stamping each item it yields as born now. Other stages call `func(item)`
+    (a plain function or a coroutine) on each item from `inbox`. A result of
+    None is consumed here; anything else goes to `outbox` with the birth
+    time of the item it came from, so `age_ns_*` measures from acquisition
+    to the end of this stage. Blocking work belongs in
+    loop.run_in_executor() inside `func` so the loop stays responsive.
+
+    With `batch` set, the stage takes every waiting item up to that many and
+    calls `func(items)` once; it returns one result per item, in order, and
+    each result goes on with its own item's birth time.
+    """
+
+    def __init__(self, name, func, inbox=None, outbox=None, batch=None):
+        self.name = name
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.batch = batch
+        self.task = None
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.items = 0
+        self.calls = 0
+        self.busy_ns = 0
+        self.age_ns_total = 0
+        self.age_ns_max = 0
+
+    def _account(self, born_ns_list, started_ns):
+        now = time.monotonic_ns()
+        self.calls += 1
+        self.busy_ns += now - started_ns
+        for born_ns in born_ns_list:
+            self.items += 1
+            self.age_ns_total += now - born_ns
+            self.age_ns_max = max(self.age_ns_max, now - born_ns)
+
+    async def run(self):
+        if self.inbox is None:
+            started_ns = time.monotonic_ns()
+            async for result in self.func():
+                now = time.monotonic_ns()
+                self._account((now,), started_ns)
+                await self.outbox.put(result, now)
+                started_ns = time.monotonic_ns()
+            return
+        while True:
+            if self.batch is None:
+                entries = [await self.inbox.get()]
+            else:
+                entries = await self.inbox.get_batch(self.batch)
+            started_ns = time.monotonic_ns()
+            items = [item for item, _ in entries]
+            results = self.func(items if self.batch is not None else items[0])
+            if inspect.isawaitable(results):
+                results = await results
+            if self.batch is None:
+                results = [results]
+            self._account([born_ns for _, born_ns in entries], started_ns)
+            for result, (_, born_ns) in zip(results, entries):
+                if result is not None and self.outbox is not None:
+                    await self.outbox.put(result, born_ns)
+
+    def start(self):
+        self.task = asyncio.create_task(self.run(), name=self.name)
+        return self.task
+
+    def summary(self):
+        if not self.items:
+            return f"{self.name}: idle"
+        text = f"{self.name}: {self.items} items, {self.busy_ns / self.items / 1e6:.1f} ms each, "
+        if self.batch is not None:
+            text += f"{self.items / self.calls:.1f} per batch, "
+        return text + f"age {self.age_ns_total / self.items / 1e6:.0f}/{self.age_ns_max / 1e6:.0f} ms mean/max"
+
+
+class Pipeline:
+    """AsyncStages chained by AsyncStageQueues: pipeline.add() each stage in order, then start().
+
+    start(), called on the running loop, returns the stages' tasks.
+    """
+
+    def __init__(self):
+        self.stages = []
+        self.queues = []
+
+    def add(self, name, func, queue=None, batch=None):
+        """Append a stage; `queue` is the AsyncStageQueue feeding it (None for the source).
+
+        With `batch` the stage takes up to that many waiting items per call (see AsyncStage).
+        """
+        inbox = None
+        if self.stages:
+            if queue is None:
+                raise ValueError(f"Stage {name!r} needs a queue from {self.stages[-1].name!r}")
+            inbox = queue
+            self.stages[-1].outbox = queue
+            self.queues.append(queue)
+        stage = AsyncStage(name, func, inbox, batch=batch)
+        self.stages.append(stage)
+        return stage
+
+    def start(self):
+        return [stage.start() for stage in self.stages]
+
+    def reset_counters(self):
+        for part in self.stages + self.queues:
+            part.reset_counters()
+
+    def summary(self):
+        lines = []
+        for i, stage in enumerate(self.stages):
+            if i:
+                lines.append("  " + self.queues[i - 1].summary())
+            lines.append(stage.summary())
+        return "\n".join(lines)
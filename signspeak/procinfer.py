@@ -0,0 +1,239 @@
+import argparse
+import asyncio
+import os
+import struct
+import subprocess
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from signspeak.npmlp import open_model
+from signspeak.ring import WindowRing
+
+REQUEST = struct.Struct("<iBB")  # rows per window, windows, result slot; then that many int32 first ring rows
+REPLY = struct.Struct("<Bq")     # result slot, invoke() time in ns
+READY = 0xFF                     # slot of the reply sent once the model is loaded
+
+
+def _attach(name):
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")  # The parent owns it and unlinks it
+    return shm
+
+
+def _read_exactly(fd, size):
+    data = b""
+    while len(data) < size:
+        chunk = os.read(fd, size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+class InferenceProcess:
+    """Runs the TFLite model in a child process so invoke() never holds this process's GIL.
+
+    `ring` is a WindowRing whose rows live in shared memory: fill it like
+    any other ring and pass its window() views to predict(). Only the
+    windows' row offsets cross a pipe (a few bytes, nothing pickled or
+    copied); the child fills its model's input straight from the shared
+    rows, scores up to `max_batch` windows with one invoke, and writes the
+    probabilities into one of `slots` shared result slots before replying
+    with the slot number and its invoke() time. `tflite_options`
+    (num_threads, xnnpack, warmup) go to the child's BatchInterpreter.
+    """
+
+    def __init__(self, model_path, sensors, capacity, outputs, axes=6, slots=4, max_batch=1, **tflite_options):
+        self.model_path = model_path
+        self.outputs = outputs
+        self.slots = slots
+        self.max_batch = max_batch
+        self._row_size = sensors * axes
+        self._free = list(range(slots))
+        self._sent_ns = [0] * slots
+        self._counts = [0] * slots
+        self.process = None
+        self.ring = self.results = None
+        self._ring_shm = self._result_shm = None
+        self._requests = self._replies = None
+        self.reset_counters()
+        try:
+            self._ring_shm = shared_memory.SharedMemory(create=True, size=WindowRing.nbytes(sensors, capacity, axes))
+            self._result_shm = shared_memory.SharedMemory(create=True, size=slots * max_batch * outputs * 4)
+            self.ring = WindowRing(sensors, capacity, axes, buffer=self._ring_shm.buf)
+            self.results = np.ndarray((slots, max_batch, outputs), dtype=np.float32, buffer=self._result_shm.buf)
+            self._start(model_path, sensors, capacity, axes, tflite_options)
+        except BaseException:
+            self.stop()  # Otherwise both shared memory blocks outlive a child that never came up
+            raise
+
+    def _start(self, model_path, sensors, capacity, axes, tflite_options):
+        options = ["--max-batch", str(self.max_batch)]
+        if tflite_options.get("num_threads") is not None:
+            options += ["--num-threads", str(tflite_options["num_threads"])]
+        xnnpack = tflite_options.get("xnnpack")
+        if xnnpack is not None:
+            options += ["--xnnpack", "off" if xnnpack is False else xnnpack]
+        if tflite_options.get("warmup") is not None:
+            options += ["--warmup", str(tflite_options["warmup"])]
+        child_requests, self._requests = os.pipe()
+        self._replies, child_replies = os.pipe()
+        # A fresh interpreter rather than a fork: nothing of this process's threads or I2C state is inherited
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, "-m", "signspeak.procinfer", model_path,
+                 self._ring_shm.name, str(sensors), str(capacity), str(axes),
+                 self._result_shm.name, str(self.slots), str(self.outputs), str(child_requests), str(child_replies),
+                 *options],
+                pass_fds=(child_requests, child_replies), env=env)
+        finally:
+            os.close(child_requests)
+            os.close(child_replies)
+        data = os.read(self._replies, REPLY.size)  # Wait for the model to load, so calls are timed warm
+        if len(data) < REPLY.size or REPLY.unpack(data)[0] != READY:
+            raise RuntimeError(f"Inference process failed to start (exit code {self.process.wait()})")
+
+    def reset_counters(self):
+        self.calls = 0
+        self.windows = 0
+        self.round_trip_ns_total = 0
+        self.round_trip_ns_max = 0
+        self.invoke_ns_total = 0
+        self.invoke_ns_max = 0
+
+    def submit(self, windows):
+        """Queue up to max_batch windows (views of `ring`) as one invoke in the child; returns its result slot."""
+        if not self._free:
+            raise RuntimeError(f"All {self.slots} result slots are in flight")
+        if not 0 < len(windows) <= self.max_batch:
+            raise ValueError(f"Need 1 to {self.max_batch} windows per request, got {len(windows)}")
+        rows = windows[0].size // self._row_size
+        slot = self._free.pop()
+        self._counts[slot] = len(windows)
+        self._sent_ns[slot] = time.monotonic_ns()
+        offsets = [self.ring.offset(window) for window in windows]
+        os.write(self._requests, REQUEST.pack(rows, len(windows), slot) + struct.pack(f"<{len(offsets)}i", *offsets))
+        return slot
+
+    def collect(self):
+        """Block for the next reply; returns (slot, probabilities shaped (windows, outputs))."""
+        data = os.read(self._replies, REPLY.size)
+        if len(data) < REPLY.size:
+            raise RuntimeError(f"Inference process exited with code {self.process.wait()}")
+        slot, invoke_ns = REPLY.unpack(data)
+        round_trip = time.monotonic_ns() - self._sent_ns[slot]
+        self.calls += 1
+        self.windows += self._counts[slot]
+        self.round_trip_ns_total += round_trip
+        self.round_trip_ns_max = max(self.round_trip_ns_max, round_trip)
+        self.invoke_ns_total += invoke_ns
+        self.invoke_ns_max = max(self.invoke_ns_max, invoke_ns)
+        predictions = self.results[slot, :self._counts[slot]].copy()
+        self._free.append(slot)
+        return slot, predictions
+
+    def predict(self, windows):
+        """Blocking: probabilities shaped (len(windows), outputs), like model.predict(), max_batch per invoke."""
+        results = []
+        for start in range(0, len(windows), self.max_batch):
+            self.submit(windows[start:start + self.max_batch])
+            results.append(self.collect()[1])
+        return np.concatenate(results)
+
+    async def predict_async(self, windows):
+        """predict() for an asyncio loop: waits on the reply pipe with add_reader, no thread."""
+        loop = asyncio.get_running_loop()
+        results = []
+        for start in range(0, len(windows), self.max_batch):
+            self.submit(windows[start:start + self.max_batch])
+            ready = loop.create_future()
+            loop.add_reader(self._replies, lambda: ready.done() or ready.set_result(None))
+            try:
+                await ready
+            finally:
+                loop.remove_reader(self._replies)
+            results.append(self.collect()[1])
+        return np.concatenate(results)
+
+    def stop(self):
+        """Close the request pipe (the child exits on EOF) and free the shared memory."""
+        if self._requests is not None:
+            os.close(self._requests)
+            self._requests = None
+        if self.process is not None:
+            try:
+                self.process.wait(2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+        if self._replies is not None:
+            os.close(self._replies)
+            self._replies = None
+        if self.ring is not None:
+            self.ring.close()
+        self.ring = self.results = None
+        for shm in (self._ring_shm, self._result_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._ring_shm = self._result_shm = None
+
+    def summary(self):
+        if not self.calls:
+            return "inference process: idle"
+        return (f"inference process: {self.windows} windows in {self.calls} calls, invoke {self.invoke_ns_total / self.calls / 1e6:.2f}/"
+                f"{self.invoke_ns_max / 1e6:.2f} ms, round trip {self.round_trip_ns_total / self.calls / 1e6:.2f}/"
+                f"{self.round_trip_ns_max / 1e6:.2f} ms mean/max")
+
+
+def serve(model_path, ring_name, sensors, capacity, axes, result_name, slots, outputs, requests, replies,
+          max_batch=1, **tflite_options):
+    """Child side: run the model on each requested batch of windows until the request pipe closes."""
+    ring_shm = _attach(ring_name)
+    result_shm = _attach(result_name)
+    rows = np.ndarray((2 * capacity, sensors, axes), dtype=np.float32, buffer=ring_shm.buf)
+    results = np.ndarray((slots, max_batch, outputs), dtype=np.float32, buffer=result_shm.buf)
+
+    model = open_model(model_path, max_batch, **tflite_options)  # TFLite (float or int8) or the NumPy engine
+    model.warm()
+    os.write(replies, REPLY.pack(READY, 0))
+
+    while True:
+        data = _read_exactly(requests, REQUEST.size)
+        if len(data) < REQUEST.size:
+            break  # Parent closed the pipe
+        n, count, slot = REQUEST.unpack(data)
+        offsets = struct.unpack(f"<{count}i", _read_exactly(requests, 4 * count))
+        start = time.monotonic_ns()
+        results[slot, :count] = model.predict([rows[row:row + n].reshape(1, -1) for row in offsets])
+        invoke_ns = time.monotonic_ns() - start
+        os.write(replies, REPLY.pack(slot, invoke_ns))
+
+    del rows, results
+    ring_shm.close()
+    result_shm.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inference worker started by InferenceProcess")
+    for name in ("model_path", "ring_name"):
+        parser.add_argument(name)
+    for name in ("sensors", "capacity", "axes"):
+        parser.add_argument(name, type=int)
+    parser.add_argument("result_name")
+    for name in ("slots", "outputs", "requests", "replies"):
+        parser.add_argument(name, type=int)
+    parser.add_argument("--max-batch", type=int, default=1)
+    parser.add_argument("--num-threads", type=int)
+    parser.add_argument("--xnnpack", help='"off" or a delegate library path')
+    parser.add_argument("--warmup", type=int)
+    args = vars(parser.parse_args())
+    if args["xnnpack"] == "off":
+        args["xnnpack"] = False
+    serve(**{key: value for key, value in args.items() if value is not None})
@@ -0,0 +1,22 @@
+import numpy as np
+
+
+def tensor_quantization(details):
+    """(scale, zero_point) of an integer tensor from get_input/output_details(), or None if it is float."""
+    scale, zero_point = details.get('quantization', (0.0, 0))
+    if np.issubdtype(details.get('dtype', np.float32), np.floating) or not scale:
+        return None
+    return scale, zero_point
+
+
+def quantize_into(values, out, quantization):
+    """Quantize float values into the integer array `out` (e.g. an input tensor) in one pass."""
+    scale, zero_point = quantization
+    limits = np.iinfo(out.dtype)
+    np.clip(np.rint(values / scale + zero_point), limits.min, limits.max, out=out, casting="unsafe")
+
+
+def dequantize(values, quantization):
+    """Float32 values of an integer output tensor."""
+    scale, zero_point = quantization
+    return (values.astype(np.float32) - zero_point) * np.float32(scale)
@@ -0,0 +1,172 @@
+import csv
+import random
+import threading
+import time
+
+import numpy as np
+
+from signspeak.mux import TCA9548A_ADDRESS
+
+LABEL_COLUMNS = ("gesture", "label")
+
+
+def load_csv(path, sensors=5, axes=6, window_s=1.0):
+    """Load recorded IMU data as an (n, sensors, axes) float32 stream, its period and labels.
+
+    Two layouts are understood:
+      windows: one gesture per row, timestep-major like the training data
+               (t1imu1accx ... t10imu5gyroz or Feature_1 ... Feature_300),
+               each row spanning `window_s`; rows are played back to back
+      stream:  one timestep per row with a "time" column in seconds
+    An optional "gesture"/"label" column gives one label per frame.
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row for row in reader if row]
+    label_col = next((i for i, name in enumerate(header) if name.strip().lower() in LABEL_COLUMNS), None)
+    time_col = next((i for i, name in enumerate(header) if name.strip().lower() == "time"), None)
+    value_cols = [i for i in range(len(header)) if i not in (label_col, time_col)]
+    if len(value_cols) % (sensors * axes):
+        raise ValueError(f"{path}: {len(value_cols)} value columns do not fit {sensors} sensors x {axes} axes")
+
+    values = np.array([[float(row[i]) for i in value_cols] for row in rows], dtype=np.float32)
+    per_row = len(value_cols) // (sensors * axes)
+    frames = values.reshape(len(rows) * per_row, sensors, axes)
+    labels = None
+    if label_col is not None:
+        labels = [row[label_col] for row in rows for _ in range(per_row)]
+    if time_col is not None:
+        times = np.array([float(row[time_col]) for row in rows])
+        period_s = float(np.median(np.diff(times))) / per_row if len(times) > 1 else window_s
+    else:
+        period_s = window_s / per_row
+    return frames, period_s, labels
+
+
+class ReplaySource:
+    """Recorded frames served on the wall clock, shared by every replayed sensor.
+
+    Like a sensor's data registers, the frame on offer changes once per
+    recorded period and holds in between, so polling faster than the
+    recording sees repeats. `speed` plays faster (>1) or slower (<1) than
+    real time; at the end the recording loops.
+    """
+
+    def __init__(self, frames, period_s, labels=None, speed=1.0):
+        self.frames = frames
+        self.period_s = period_s
+        self.labels = labels
+        self.speed = speed
+        self.start = time.monotonic()
+
+    @classmethod
+    def from_csv(cls, path, speed=1.0, sensors=5):
+        frames, period_s, labels = load_csv(path, sensors)
+        return cls(frames, period_s, labels, speed)
+
+    @property
+    def sensors(self):
+        return self.frames.shape[1]
+
+    def index(self):
+        elapsed = (time.monotonic() - self.start) * self.speed
+        return int(elapsed / self.period_s) % len(self.frames)
+
+    def label(self):
+        """Label of the frame currently on offer, for scoring recognition offline."""
+        return None if self.labels is None else self.labels[self.index()]
+
+
+class ReplaySensor:
+    """Stands in for a BMI270 and its I2CWrapper, fed from a ReplaySource.
+
+    Offers the driver's `acceleration` (m/s^2) and `gyro` (dps) properties
+    and I2CWrapper's read_imu()/read_imu_into(). Every read costs
+    `latency_s` (plus up to `jitter_s`) of blocking sleep, like an I2C
+    transfer does.
+    """
+
+    def __init__(self, source, sensor, latency_s=0.0, jitter_s=0.0):
+        self.source = source
+        self.sensor = sensor
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.reads = 0
+
+    def _frame(self):
+        delay = self.latency_s + (random.uniform(0, self.jitter_s) if self.jitter_s else 0.0)
+        if delay:
+            time.sleep(delay)
+        self.reads += 1
+        return self.source.frames[self.source.index(), self.sensor]
+
+    @property
+    def acceleration(self):
+        return tuple(float(v) for v in self._frame()[0:3])
+
+    @property
+    def gyro(self):
+        return tuple(float(v) for v in self._frame()[3:6])
+
+    def load_scales(self):
+        pass
+
+    def read_imu(self):
+        return [float(v) for v in self._frame()]
+
+    def read_imu_into(self, out):
+        out[:] = self._frame()
+
+
+class ReplayBus:
+    """busio.I2C stand-in for a bus carrying a TCA9548A with sensors on `channels`.
+
+    Wrap it in MuxManager to get `tca[channel].try_lock()`/`unlock()` and the
+    mux counters exactly as on the glove. Writes (mux selects, display
+    updates) cost `latency_s`. With `contention` > 0 a background thread
+    holds the bus for `hold_s` at a time, that fraction of the time, like
+    the OLED refreshing over the same wires.
+    """
+
+    def __init__(self, channels, sensor_address=0x68, mux_address=TCA9548A_ADDRESS,
+                 latency_s=0.0, contention=0.0, hold_s=0.025):
+        self.channels = set(channels)
+        self.sensor_address = sensor_address
+        self.mux_address = mux_address
+        self.latency_s = latency_s
+        self.selected = None
+        self.writes = 0
+        self._lock = threading.Lock()
+        if contention > 0:
+            threading.Thread(target=self._contend, args=(contention, hold_s), daemon=True).start()
+
+    def _contend(self, contention, hold_s):
+        idle_s = hold_s * (1 - contention) / contention
+        while True:
+            time.sleep(random.expovariate(1 / idle_s) if idle_s else 0)
+            with self._lock:
+                time.sleep(hold_s)
+
+    def try_lock(self):
+        return self._lock.acquire(False)
+
+    def unlock(self):
+        self._lock.release()
+
+    def deinit(self):
+        pass
+
+    def writeto(self, address, buffer, **kwargs):
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        self.writes += 1
+        if address == self.mux_address:
+            mask = buffer[0]
+            self.selected = mask.bit_length() - 1 if mask else None
+
+    def scan(self):
+        found = [self.mux_address]
+        if self.selected in self.channels:
+            found.append(self.sensor_address)
+        return sorted(found)
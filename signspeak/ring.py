@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class WindowRing:
+    """Preallocated float32 sample store shaped (capacity, sensors, axes).
+
+    Every row is stored twice (at i and i + capacity) so any run of up to
+    `capacity` consecutive samples is a contiguous view, which can be handed
+    to the model without copying. A window stays valid until the ring has
+    wrapped past it, so size `capacity` for every window that can be queued
+    at once. `buffer` (e.g. a shared_memory block of nbytes(...)) holds the
+    rows instead of a private array, so another process can read windows.
+    """
+
+    def __init__(self, sensors, capacity, axes=6, buffer=None):
+        self.capacity = capacity
+        self.count = 0  # samples committed so far
+        if buffer is None:
+            self._buf = np.zeros((2 * capacity, sensors, axes), dtype=np.float32)
+        else:
+            self._buf = np.ndarray((2 * capacity, sensors, axes), dtype=np.float32, buffer=buffer)
+
+    def close(self):
+        """Drop the rows, so a shared_memory `buffer` has no views left and can be closed."""
+        self._buf = None
+
+    @staticmethod
+    def nbytes(sensors, capacity, axes=6):
+        return 2 * capacity * sensors * axes * np.dtype(np.float32).itemsize
+
+    def reserve(self, n):
+        """Return writable rows for the next n samples; call commit(n) once filled."""
+        if n > self.capacity:
+            raise ValueError(f"Cannot reserve {n} samples in a ring of {self.capacity}")
+        start = self.count % self.capacity
+        return self._buf[start:start + n]
+
+    def commit(self, n):
+        """Publish n reserved rows by mirroring them into the other half."""
+        cap = self.capacity
+        start = self.count % cap
+        end = start + n
+        if end <= cap:
+            self._buf[start + cap:end + cap] = self._buf[start:end]
+        else:
+            self._buf[start + cap:] = self._buf[start:cap]
+            self._buf[:end - cap] = self._buf[cap:end]
+        self.count += n
+
+    def push(self, frame):
+        """Append one (sensors, axes) sample."""
+        self.reserve(1)[0] = frame
+        self.commit(1)
+
+    def window(self, n, end=None):
+        """Contiguous view of the n samples ending at sample number `end` (default: newest)."""
+        if end is None:
+            end = self.count
+        if n > self.capacity or end < n or end > self.count or self.count - end > self.capacity - n:
+            raise IndexError(f"Window of {n} ending at {end} is not in the ring")
+        stop = end % self.capacity + self.capacity
+        return self._buf[stop - n:stop]
+
+    def offset(self, view):
+        """Row in the underlying buffer where a view from window() (or a reshape of one) starts."""
+        row_bytes = self._buf.strides[0]
+        start = view.__array_interface__["data"][0] - self._buf.__array_interface__["data"][0]
+        if start < 0 or start % row_bytes or start + view.nbytes > self._buf.nbytes:
+            raise ValueError("View does not start on a row of this ring")
+        return start // row_bytes
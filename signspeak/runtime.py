@@ -0,0 +1,77 @@
+import asyncio
+import os
+import select
+import signal
+import stat
+
+
+class GpioWatch:
+    """GPIO edges on an asyncio loop, without a thread or a timeout poll.
+
+    sysfs value files report edges as POLLPRI but are always readable, so
+    they cannot go straight to loop.add_reader(). Each file is registered
+    for EPOLLPRI on a private epoll instead, and the loop watches that
+    epoll's descriptor, which turns readable exactly when an edge is
+    pending. Named pipes (drdy.FakeGpio) are watched for EPOLLIN, so tests
+    can drive it off-device. edge() returns the pin's value after the edge.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        self._fifo = stat.S_ISFIFO(os.fstat(self._fd).st_mode)
+        self._epoll = select.epoll()
+        self._epoll.register(self._fd, select.EPOLLIN if self._fifo else select.EPOLLPRI | select.EPOLLERR)
+        self._loop = None
+        self._edges = asyncio.Queue()
+        self._level = ""
+        self.value()  # Clear the initial event
+
+    def value(self):
+        """Read the pin and re-arm the edge; a pipe holds the last value written to it, like a level."""
+        if self._fifo:
+            data = b""
+            while True:
+                try:
+                    chunk = os.read(self._fd, 4096)
+                except BlockingIOError:  # Drained, writer still open
+                    break
+                if not chunk:
+                    break
+                data += chunk
+            self._level = data.decode().strip()[-1:] or self._level
+            return self._level
+        try:
+            return os.pread(self._fd, 8, 0).decode().strip()
+        except BlockingIOError:
+            return ""
+
+    def _on_ready(self):
+        if self._epoll.poll(0):
+            self._edges.put_nowait(self.value())
+
+    async def edge(self):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._loop.add_reader(self._epoll.fileno(), self._on_ready)
+        return await self._edges.get()
+
+    def close(self):
+        if self._loop is not None:
+            self._loop.remove_reader(self._epoll.fileno())
+        self._epoll.close()
+        os.close(self._fd)
+
+
+def stop_on_signals(stop, signals=(signal.SIGINT, signal.SIGTERM)):
+    """Set the asyncio.Event `stop` on SIGINT/SIGTERM instead of raising in whatever is running."""
+    loop = asyncio.get_running_loop()
+    for sig in signals:
+        loop.add_signal_handler(sig, stop.set)
+
+
+async def cancel_tasks(tasks):
+    """Cancel tasks and wait until every one has finished unwinding."""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,59 @@
+import time
+import numpy as np
+
+
+class DeadlineSampler:
+    """Calls a tick function on absolute time.monotonic_ns() deadlines.
+
+    Tick i is due at start + i * period, so time spent reading never pushes
+    later ticks back and a window of n ticks always spans (n - 1) periods.
+    A late tick runs immediately and the schedule stays on the original grid.
+    How late each tick started is kept in `lateness_ns`; a run can extend
+    the previous run's record, so several short runs report as one.
+    """
+
+    def __init__(self, period_s, max_ticks=64, spin_s=0.0):
+        self.period_ns = int(period_s * 1e9)
+        self.spin_ns = int(spin_s * 1e9)  # busy-wait this close to a deadline instead of sleeping
+        self.lateness_ns = np.zeros(max_ticks, dtype=np.int64)
+        self.ticks = 0
+        self.start_ns = 0  # start of the current run, which its deadlines count from
+        self.began_ns = 0  # start of the first run in the record
+        self.end_ns = 0
+
+    def wait_until(self, deadline_ns):
+        remaining = deadline_ns - time.monotonic_ns()
+        if remaining > self.spin_ns:
+            time.sleep((remaining - self.spin_ns) / 1e9)
+        while time.monotonic_ns() < deadline_ns:
+            pass
+        return time.monotonic_ns() - deadline_ns
+
+    def run(self, n, tick, start_ns=None, accumulate=False):
+        """Run tick(i) for i in range(n) and return the per-tick lateness (ns).
+
+        With `accumulate` the timing record (ticks, lateness, elapsed time)
+        extends the previous run's instead of starting over.
+        """
+        first = self.ticks if accumulate else 0
+        if first + n > len(self.lateness_ns):
+            grown = np.zeros(first + n, dtype=np.int64)
+            grown[:first] = self.lateness_ns[:first]
+            self.lateness_ns = grown
+        self.start_ns = time.monotonic_ns() if start_ns is None else start_ns
+        if not first:
+            self.began_ns = self.start_ns
+        for i in range(n):
+            self.lateness_ns[first + i] = self.wait_until(self.start_ns + i * self.period_ns)
+            tick(i)
+        self.ticks = first + n
+        self.end_ns = time.monotonic_ns()
+        return self.lateness_ns[first:first + n]
+
+    def summary(self):
+        """One-line timing report for the last run (and the runs it accumulated)."""
+        if not self.ticks:
+            return "no ticks recorded"
+        late = self.lateness_ns[:self.ticks] / 1e6
+        return (f"{self.ticks} ticks in {(self.end_ns - self.began_ns) / 1e9:.3f} s, "
+                f"lateness mean {late.mean():.2f} ms, max {late.max():.2f} ms")
@@ -0,0 +1,53 @@
+import numpy as np
+
+GYRO_AXES = slice(3, 6)
+
+
+def motion_level(window):
+    """Largest per-sensor gyro standard deviation (dps) over a (timesteps, sensors, 6) window.
+
+    A hand at rest stays near zero whatever its orientation, so this separates
+    gestures from idle stretches without depending on where gravity points.
+    """
+    return float(window[:, :, GYRO_AXES].std(axis=0).max())
+
+
+class StabilityFilter:
+    """Turns predictions on overlapping windows into discrete words.
+
+    Call update() once per hop. A label is emitted once it has won
+    `stable_hops` consecutive windows with at least `min_confidence`, and
+    it is not emitted again until the hand goes idle or another label
+    becomes stable, so holding a sign says it once. To repeat a word,
+    pause between the two signs.
+    """
+
+    def __init__(self, stable_hops=2, min_confidence=0.8):
+        self.stable_hops = stable_hops
+        self.min_confidence = min_confidence
+        self.reset()
+
+    def reset(self):
+        self._label = None
+        self._run = 0
+        self._emitted = None
+
+    def update(self, probs, active=True):
+        """Feed one window's class probabilities; returns a label index to emit or None."""
+        if not active:
+            self.reset()
+            return None
+        label = int(np.argmax(probs))
+        if probs[label] < self.min_confidence:
+            self._label = None
+            self._run = 0
+            return None
+        if label == self._label:
+            self._run += 1
+        else:
+            self._label = label
+            self._run = 1
+        if self._run >= self.stable_hops and label != self._emitted:
+            self._emitted = label
+            return label
+        return None
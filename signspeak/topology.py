@@ -0,0 +1,89 @@
+import json
+import os
+
+from signspeak.bmi270_fifo import ACC_RANGE, GYR_RANGE, PWR_CTRL
+from signspeak.multibus import SensorSlot
+
+# --------------------- BMI270 Registers ---------------------
+
+CHIP_ID = 0x00
+INTERNAL_STATUS = 0x21
+BMI270_CHIP_ID = 0x24
+INIT_OK = 0x01            # INTERNAL_STATUS message bits 3:0 once the config blob is running
+PWR_CTRL_ACC_GYR = 0x06   # acc_en | gyr_en
+
+CACHE_VERSION = 1
+
+
+def read_state(bus, address):
+    """Registers that show whether a BMI270 still holds its init; the caller holds the lock."""
+    buf = bytearray(3)
+    bus.writeto_then_readfrom(address, bytes([ACC_RANGE]), buf)  # ACC_RANGE, GYR_CONF, GYR_RANGE
+    pwr = bytearray(1)
+    bus.writeto_then_readfrom(address, bytes([PWR_CTRL]), pwr)
+    return {"acc_range": buf[0], "gyr_range": buf[GYR_RANGE - ACC_RANGE], "pwr_ctrl": pwr[0]}
+
+
+def sensor_ready(bus, address, state):
+    """Cheap check that a sensor survived since `state` was cached; the caller holds the lock.
+
+    Reads the chip id, INTERNAL_STATUS and the ranges instead of soft-resetting
+    and re-uploading the 8 KB config blob. Any NACK counts as not ready.
+    """
+    buf = bytearray(1)
+    try:
+        bus.writeto_then_readfrom(address, bytes([CHIP_ID]), buf)
+        if buf[0] != BMI270_CHIP_ID:
+            return False
+        bus.writeto_then_readfrom(address, bytes([INTERNAL_STATUS]), buf)
+        if buf[0] & 0x0F != INIT_OK:
+            return False
+        current = read_state(bus, address)
+    except OSError:
+        return False
+    return (current["acc_range"] == state["acc_range"] and current["gyr_range"] == state["gyr_range"]
+            and current["pwr_ctrl"] & PWR_CTRL_ACC_GYR == PWR_CTRL_ACC_GYR)
+
+
+class TopologyCache:
+    """Where the IMUs were found and the state they were left in, kept in a JSON file.
+
+    `slots` is the SensorSlot list from the last boot in feature order and
+    `states` maps each slot to its read_state() after init. A missing,
+    unreadable or outdated file simply loads as empty.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.slots = []
+        self.states = {}
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != CACHE_VERSION:
+            return False
+        self.slots = [SensorSlot(**entry["slot"]) for entry in data["sensors"]]
+        self.states = {slot: entry["state"] for slot, entry in zip(self.slots, data["sensors"])}
+        return bool(self.slots)
+
+    def save(self, slots, states):
+        self.slots = list(slots)
+        self.states = dict(states)
+        data = {"version": CACHE_VERSION,
+                "sensors": [{"slot": slot._asdict(), "state": states[slot]} for slot in slots]}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp, self.path)  # A crash mid-write leaves the old cache intact
+
+    def clear(self):
+        self.slots = []
+        self.states = {}
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,163 @@
+import threading
+import time
+
+from signspeak.bmi270_fifo import ACC_CONF, GYR_CONF, PWR_CONF, PWR_CTRL
+from signspeak.buslock import lock_bus
+from signspeak.drdy import GpioEdges
+
+# --------------------- BMI270 Registers ---------------------
+# Any-motion lives in feature page 1 at byte 0x0C (bmi270.h, BMI270_ANY_MOT_STRT_ADDR):
+#   word 0: duration (bits 12:0, 20 ms steps), x/y/z select (bits 13-15)
+#   word 1: threshold (bits 10:0, 0.48 mg steps), enable (bit 15)
+
+INT_STATUS_0 = 0x1C
+FEAT_PAGE = 0x2F
+FEATURES = 0x30
+INT1_IO_CTRL = 0x53
+INT_LATCH = 0x55
+INT1_MAP_FEAT = 0x56
+
+FEATURE_PAGE_BYTES = 16
+ANY_MOT_PAGE = 1
+ANY_MOT_OFFSET = 0x0C
+ANY_MOT_INT = 0x40             # any_mot bit in INT_STATUS_0 and INT1_MAP_FEAT
+INT1_OUTPUT_PUSH_PULL_HIGH = 0x0A  # output_en | active high, push-pull
+
+ACC_CONF_LOW_POWER = 0x17      # 50 Hz, 2x averaging, filter_perf off (duty-cycled)
+PWR_CONF_APS = 0x03            # adv_power_save on, fifo_self_wakeup on
+PWR_CTRL_ACC_ONLY = 0x04
+APS_WRITE_DELAY_S = 0.00045    # register writes need 450 us between them in low power
+GYR_STARTUP_S = 0.055          # gyro start-up time after PWR_CTRL turns it back on
+
+
+class AnyMotionWake:
+    """Parks the IMUs in accelerometer-only low power until the hand moves.
+
+    sleep_until_motion() saves each sensor's power and ODR registers,
+    enables the BMI270 any-motion feature (the config blob uploaded at init
+    contains it) with the gyro off, then waits for the first sensor that
+    reports motion and restores every register it touched. The wait is a
+    poll() on INT1 when `gpio_path` names the sysfs value file of a pin
+    wired to INT1 (edge set to "rising"): that blocks with no timeout and
+    reads the status registers only after an edge. Otherwise it is a
+    one-byte INT_STATUS_0 read per sensor every `poll_s`. cancel() from
+    another thread ends the wait early (at once on INT1, within `poll_s`
+    when polling), with None as the result.
+    """
+
+    def __init__(self, ports, addresses, threshold_g=0.08, duration_s=0.1, gpio_path=None, poll_s=0.1):
+        self.ports = list(ports)
+        self.addresses = list(addresses)
+        self.threshold = min(int(threshold_g / 0.00048), 0x7FF)
+        self.duration = min(int(duration_s / 0.02), 0x1FFF)
+        self.gpio_path = gpio_path
+        self.poll_s = poll_s
+        self.woken_by = None  # index of the sensor that reported motion last time
+        self._saved = []
+        self._status = bytearray(1)
+        self._cancel = threading.Event()
+        self._edges = None
+        self._edges_lock = threading.Lock()  # cancel() must not write to a pipe close() just freed
+
+    # I2C helpers, taking the bus lock for each access
+    def _write(self, index, reg, data):
+        bus = self._lock(index)
+        try:
+            bus.writeto(self.addresses[index], bytes([reg]) + bytes(data))
+        finally:
+            bus.unlock()
+        time.sleep(APS_WRITE_DELAY_S)
+
+    def _read(self, index, reg, buf):
+        bus = self._lock(index)
+        try:
+            bus.writeto_then_readfrom(self.addresses[index], bytes([reg]), buf)
+        finally:
+            bus.unlock()
+        return buf
+
+    def _lock(self, index):
+        bus = self.ports[index]
+        lock_bus(bus)
+        return bus
+
+    def _any_motion_page(self, index, enable):
+        self._write(index, FEAT_PAGE, [ANY_MOT_PAGE])
+        page = self._read(index, FEATURES, bytearray(FEATURE_PAGE_BYTES))
+        word0 = self.duration | 0xE000  # all three axes
+        word1 = self.threshold | (0x8000 if enable else 0)
+        page[ANY_MOT_OFFSET:ANY_MOT_OFFSET + 4] = bytes([word0 & 0xFF, word0 >> 8, word1 & 0xFF, word1 >> 8])
+        self._write(index, FEATURES, page)
+
+    def arm(self):
+        """Save the sensors' state and switch them to low-power any-motion detection."""
+        self._saved = []
+        for index in range(len(self.ports)):
+            regs = (PWR_CONF, PWR_CTRL, ACC_CONF, GYR_CONF, INT1_IO_CTRL, INT_LATCH, INT1_MAP_FEAT, FEAT_PAGE)
+            saved = {reg: self._read(index, reg, bytearray(1))[0] for reg in regs}
+            self._saved.append(saved)
+            self._write(index, PWR_CONF, [saved[PWR_CONF] & ~0x01])  # aps off while configuring
+            self._any_motion_page(index, True)
+            self._write(index, INT1_MAP_FEAT, [saved[INT1_MAP_FEAT] | ANY_MOT_INT])
+            self._write(index, INT1_IO_CTRL, [INT1_OUTPUT_PUSH_PULL_HIGH])
+            self._write(index, INT_LATCH, [0x01])
+            self._write(index, ACC_CONF, [ACC_CONF_LOW_POWER])
+            self._write(index, PWR_CTRL, [PWR_CTRL_ACC_ONLY])
+            self._read(index, INT_STATUS_0, self._status)  # clear anything pending
+            self._write(index, PWR_CONF, [PWR_CONF_APS])
+
+    def disarm(self):
+        """Turn any-motion off and restore the registers saved by arm()."""
+        for index, saved in enumerate(self._saved):
+            self._write(index, PWR_CONF, [saved[PWR_CONF] & ~0x01])
+            self._any_motion_page(index, False)
+            for reg in (FEAT_PAGE, INT1_MAP_FEAT, INT1_IO_CTRL, INT_LATCH, ACC_CONF, GYR_CONF, PWR_CTRL, PWR_CONF):
+                self._write(index, reg, [saved[reg]])
+        if self._saved:
+            time.sleep(GYR_STARTUP_S)
+        self._saved = []
+
+    def motion_pending(self):
+        """Read and clear INT_STATUS_0 on every sensor; returns the first one that moved or None."""
+        moved = None
+        for index in range(len(self.ports)):
+            if self._read(index, INT_STATUS_0, self._status)[0] & ANY_MOT_INT and moved is None:
+                moved = index
+        return moved
+
+    def _wait_gpio(self):
+        while not self._cancel.is_set():
+            if not self._edges.wait():
+                continue  # cancel()
+            moved = self.motion_pending()  # Also clears the latch, so the next motion is a new edge
+            if moved is not None:
+                return moved
+        return None
+
+    def cancel(self):
+        self._cancel.set()
+        with self._edges_lock:
+            if self._edges is not None:
+                self._edges.cancel()
+
+    def sleep_until_motion(self):
+        """Block until any sensor detects motion, with the IMUs in low power meanwhile."""
+        self._cancel.clear()
+        if self.gpio_path is not None:
+            # Watch the pin before arming: arm() clears the status, so any edge after it is new motion
+            self._edges = GpioEdges([self.gpio_path])
+        try:
+            self.arm()
+            if self._edges is not None:
+                self.woken_by = self._wait_gpio()
+            else:
+                self.woken_by = None
+                while self.woken_by is None and not self._cancel.wait(self.poll_s):
+                    self.woken_by = self.motion_pending()
+        finally:
+            self.disarm()
+            with self._edges_lock:
+                if self._edges is not None:
+                    self._edges.close()
+                    self._edges = None
+        return self.woken_by
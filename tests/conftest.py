@@ -0,0 +1,5 @@
+# Lets the tests import signspeak from the checkout, like the scripts do
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
@@ -0,0 +1,89 @@
+import threading
+import time
+
+from signspeak.audio import NullPlayer, SpeechWorker
+
+
+class GatePlayer:
+    """Plays a word until release() or the worker's stop event, recording what it played."""
+
+    def __init__(self):
+        self.words = []
+        self.playing = threading.Event()
+        self._release = threading.Event()
+
+    def play(self, clip, stop, started):
+        self.words.append(clip)
+        started()
+        self.playing.set()
+        while not (stop.is_set() or self._release.is_set()):
+            time.sleep(0.001)
+        self._release.clear()
+        self.playing.clear()
+
+    def release(self):
+        self._release.set()
+
+
+def wait_until(condition, timeout_s=2.0):
+    deadline = time.monotonic() + timeout_s
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def worker(policy, maxsize=4):
+    player = GatePlayer()
+    speech = SpeechWorker(lambda word: word, player.play, policy=policy, maxsize=maxsize).start()
+    return speech, player
+
+
+def play_out(speech, player, count):
+    for n in range(1, count + 1):
+        wait_until(lambda: len(player.words) >= n and player.playing.is_set())
+        player.release()
+    wait_until(lambda: speech.current is None and not speech._pending)
+
+
+def test_queue_plays_in_order_and_drops_the_oldest_when_full():
+    speech, player = worker("queue", maxsize=2)
+    speech.say("hello")
+    wait_until(player.playing.is_set)
+    for word in ("yes", "no", "thanks"):
+        speech.say(word)
+    play_out(speech, player, 3)
+    assert player.words == ["hello", "no", "thanks"]
+    assert (speech.played, speech.skipped, speech.interrupted) == (3, 1, 0)
+
+
+def test_interrupt_cuts_off_the_word_playing():
+    speech, player = worker("interrupt")
+    speech.say("hello")
+    wait_until(player.playing.is_set)
+    speech.say("yes")
+    wait_until(lambda: len(player.words) == 2 and player.playing.is_set())
+    player.release()
+    wait_until(lambda: speech.current is None)
+    assert player.words == ["hello", "yes"]
+    assert speech.interrupted == 1
+
+
+def test_skip_repeat_drops_the_word_playing_or_waiting_last():
+    speech, player = worker("skip_repeat")
+    speech.say("hello")
+    wait_until(player.playing.is_set)
+    for word in ("hello", "yes", "yes", "hello"):
+        speech.say(word)
+    play_out(speech, player, 3)
+    assert player.words == ["hello", "yes", "hello"]
+    assert speech.skipped == 2
+
+
+def test_summary_reports_prediction_to_first_sample_latency():
+    speech = SpeechWorker(lambda word: ([50] * 10, 1000), NullPlayer().play).start()
+    speech.say("hello", predicted_ns=time.monotonic_ns() - 50_000_000)
+    wait_until(lambda: speech.played == 1)
+    assert speech.latency_ns_max >= 50_000_000
+    assert "1 played" in speech.summary()
+    mean_ms = float(speech.summary().split("first sample ")[1].split("/")[0])
+    assert mean_ms >= 50
@@ -0,0 +1,112 @@
+import os
+import types
+
+import numpy as np
+import pytest
+
+batch = pytest.importorskip("signspeak.batch", reason="needs tflite_runtime or tensorflow")
+from signspeak.npmlp import NumpyMLP, extract  # noqa: E402
+from signspeak.ring import WindowRing  # noqa: E402
+
+MODEL = os.path.join(os.path.dirname(__file__), "..", "Machine Learning", "v3", "SIGNSPEAK_MLP_FINAL.tflite")
+
+
+@pytest.fixture(scope="module")
+def windows():
+    return np.random.default_rng(1).normal(0, 3, size=(10, 10, 5, 6)).astype(np.float32)
+
+
+def test_predict_on_the_real_model(windows):
+    model = batch.BatchInterpreter(MODEL, max_batch=4)
+    rows = windows.reshape(len(windows), -1)
+
+    together = model.predict(rows)  # 4 + 4 + 2 rows, three invokes
+    assert together.shape == (10, model.outputs)
+    np.testing.assert_allclose(together.sum(axis=1), 1.0, rtol=1e-5)
+    one_by_one = np.concatenate([model.predict(row[None]) for row in rows])
+    np.testing.assert_allclose(together, one_by_one, rtol=1e-5, atol=1e-6)
+    assert model.invokes == 3 + 10 and model.rows == 20
+
+
+def test_predict_from_ring_views_matches_numpy_engine(windows, tmp_path):
+    ring = WindowRing(5, 30)
+    views = []
+    for window in windows[:3]:
+        ring.reserve(10)[:] = window
+        ring.commit(10)
+        views.append(ring.window(10).reshape(1, -1))
+
+    model = batch.BatchInterpreter(MODEL, max_batch=4)
+    model.warm()
+    npz = tmp_path / "model.npz"
+    extract(MODEL, npz)
+    expected = NumpyMLP(str(npz)).predict(windows[:3].reshape(3, -1))
+    np.testing.assert_allclose(model.predict(views), expected, rtol=1e-4, atol=1e-5)
+
+
+class StubInterpreter:
+    """Records how BatchInterpreter builds and drives its interpreters, without a model."""
+
+    created = []
+
+    def __init__(self, model_path, **options):
+        self.options = options
+        self.shape = (1, 300)
+        self.invokes = 0
+        self.allocated = False
+        self._input = self._output = None
+        StubInterpreter.created.append(self)
+
+    def get_input_details(self):
+        return [{"index": 0, "shape": np.array(self.shape), "dtype": np.float32, "quantization": (0.0, 0)}]
+
+    def get_output_details(self):
+        return [{"index": 1, "shape": np.array([self.shape[0], 5]), "dtype": np.float32, "quantization": (0.0, 0)}]
+
+    def resize_tensor_input(self, index, shape):
+        self.shape = tuple(shape)
+
+    def allocate_tensors(self):
+        self.allocated = True
+        self._input = np.zeros(self.shape, np.float32)
+        self._output = np.zeros((self.shape[0], 5), np.float32)
+
+    def tensor(self, index):
+        return lambda: self._input if index == 0 else self._output
+
+    def invoke(self):
+        self.invokes += 1
+
+
+@pytest.fixture
+def stub_tflite(monkeypatch):
+    StubInterpreter.created = []
+    delegates = []
+    stub = types.SimpleNamespace(
+        Interpreter=StubInterpreter,
+        OpResolverType=types.SimpleNamespace(BUILTIN_WITHOUT_DEFAULT_DELEGATES="no-default-delegates"),
+        load_delegate=lambda path: delegates.append(path) or f"delegate:{path}")
+    monkeypatch.setattr(batch, "tflite", stub)
+    return delegates
+
+
+def test_options_and_warm_up_reach_every_interpreter(stub_tflite):
+    model = batch.BatchInterpreter("model.tflite", max_batch=3, num_threads=2, xnnpack=False, warmup=2)
+    model.warm()
+    probe, *interpreters = StubInterpreter.created
+    assert not probe.allocated and probe.invokes == 0  # Only read for shapes
+    assert [interpreter.shape for interpreter in interpreters] == [(1, 300), (2, 300), (3, 300)]
+    for interpreter in interpreters:
+        assert interpreter.options == {"num_threads": 2, "experimental_op_resolver_type": "no-default-delegates"}
+        assert interpreter.invokes == 2
+    model.predict(np.zeros((2, 300), np.float32))
+    assert interpreters[1].invokes == 3 and model.invokes == 1
+
+
+def test_delegate_path_is_loaded_once_for_all_interpreters(stub_tflite):
+    model = batch.BatchInterpreter("model.tflite", max_batch=2, xnnpack="/usr/lib/libxnnpack_delegate.so", warmup=0)
+    model.warm()
+    assert stub_tflite == ["/usr/lib/libxnnpack_delegate.so"]
+    for interpreter in StubInterpreter.created[1:]:
+        assert interpreter.options == {"experimental_delegates": ["delegate:/usr/lib/libxnnpack_delegate.so"]}
+        assert interpreter.invokes == 0
@@ -0,0 +1,35 @@
+import struct
+
+import numpy as np
+
+from signspeak.bmi270_fifo import FRAME_BYTES, decode_frames
+
+
+def frame(gyr, acc):
+    return struct.pack("<6h", *gyr, *acc)
+
+
+def test_decode_frames_drops_dummy_empty_and_partial_frames():
+    raw = b"".join([
+        frame((1, 2, 3), (10, 20, 30)),
+        frame((0x7F02, -0x8000, 0), (11, 21, 31)),  # Dummy gyro
+        frame((4, 5, 6), (40, 50, 60)),
+        frame((7, 8, 9), (0x7F01, -0x8000, 0)),      # Dummy accel
+        frame((-0x8000,) * 3, (-0x8000,) * 3),       # Read past the fill level
+        frame((-7, -8, -9), (-70, -80, -90)),
+    ]) + b"\x01\x02\x03"  # A frame cut short by the burst length
+
+    scale = np.array([0.5] * 3 + [2.0] * 3, np.float32)
+    frames = decode_frames(memoryview(raw), scale)
+
+    # acc x, y, z then gyr x, y, z, like sensor.acceleration + sensor.gyro
+    expected = np.array([[10, 20, 30, 1, 2, 3],
+                         [40, 50, 60, 4, 5, 6],
+                         [-70, -80, -90, -7, -8, -9]], np.float32) * scale
+    np.testing.assert_array_equal(frames, expected)
+    assert frames.dtype == np.float32
+
+
+def test_decode_frames_of_nothing():
+    frames = decode_frames(b"\x00" * (FRAME_BYTES - 1), np.ones(6, np.float32))
+    assert frames.shape == (0, 6)
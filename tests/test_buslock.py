@@ -0,0 +1,23 @@
+import threading
+import time
+
+from signspeak.buslock import lock_bus
+from signspeak.replay import ReplayBus
+
+
+def test_lock_bus_gives_up_at_the_deadline():
+    bus = ReplayBus([0])
+    assert bus.try_lock()
+    start = time.monotonic_ns()
+    assert not lock_bus(bus, start + 5_000_000)
+    assert time.monotonic_ns() - start < 50_000_000
+
+
+def test_lock_bus_waits_for_the_holder():
+    bus = ReplayBus([0])
+    assert bus.try_lock()
+    timer = threading.Timer(0.02, bus.unlock)
+    timer.start()
+    assert lock_bus(bus)
+    bus.unlock()
+    timer.join()
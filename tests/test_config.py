@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from signspeak.config import DEFAULTS, load_config
+
+
+def write_json(tmp_path, values):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(values))
+    return str(path)
+
+
+def test_defaults_then_json_then_overrides(tmp_path):
+    path = write_json(tmp_path, {"acquisition_hz": 200, "display": "console", "infer_queue": [3, "block"]})
+    config = load_config(path, display="null")
+    assert config.acquisition_hz == 200                 # from the file
+    assert config.display == "null"                     # override beats the file
+    assert config.audio == DEFAULTS["audio"]            # untouched default
+    assert config.infer_queue == (3, "block")           # JSON list back to a tuple
+    assert load_config().acquisition_hz == DEFAULTS["acquisition_hz"]
+
+
+@pytest.mark.parametrize("source", ["file", "overrides"])
+def test_unknown_keys_are_rejected(tmp_path, source):
+    if source == "file":
+        with pytest.raises(ValueError, match=r"\['acquistion_hz'\] in .*config.json"):
+            load_config(write_json(tmp_path, {"acquistion_hz": 200}))
+    else:
+        with pytest.raises(ValueError, match=r"\['acquistion_hz'\] in overrides"):
+            load_config(acquistion_hz=200)
+
+
+@pytest.mark.parametrize("key, value", [("sensors", "spi"), ("display", "lcd"), ("audio", "bluetooth")])
+def test_bad_backend_names_are_rejected(key, value):
+    with pytest.raises(ValueError, match=f"{key} must be one of"):
+        load_config(**{key: value})
+
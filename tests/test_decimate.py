@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from signspeak.decimate import Decimator, decimate_window, fir_taps, grid_timesteps
+
+
+def ramp(n, sensors=2):
+    return np.repeat(np.arange(n, dtype=np.float32), sensors * 6).reshape(n, sensors, 6)
+
+
+def test_pick_takes_the_first_frame_of_each_interval():
+    out = decimate_window(ramp(100), 10, "pick")
+    np.testing.assert_array_equal(out[:, 0, 0], np.arange(0, 100, 10))
+
+
+def test_mean_averages_uneven_intervals():
+    out = decimate_window(ramp(7, 1), 3, "mean")
+    np.testing.assert_allclose(out[:, 0, 0], [0.5, 2.5, 5.0])  # [0, 1], [2, 3], [4, 5, 6]
+
+
+def test_fir_passes_dc_and_rejects_alternation():
+    constant = np.full((100, 1, 6), 3.0, np.float32)
+    np.testing.assert_allclose(decimate_window(constant, 10, "fir"), 3.0, rtol=1e-5)
+    alternating = np.where(np.arange(100) % 2, 1.0, -1.0).astype(np.float32).reshape(-1, 1, 1)
+    filtered = decimate_window(alternating, 10, "fir")
+    assert np.abs(filtered[2:-2]).max() < 0.01  # Edge padding leaks a little at either end
+    assert fir_taps(10).sum() == pytest.approx(1.0)
+
+
+def test_decimate_into_out_and_errors():
+    out = np.empty((5, 2, 6), np.float32)
+    assert decimate_window(ramp(20), 5, "mean", out=out) is out
+    with pytest.raises(ValueError):
+        decimate_window(ramp(4), 5)
+    with pytest.raises(ValueError):
+        decimate_window(ramp(20), 5, "median")
+
+
+@pytest.mark.parametrize("mode", ["pick", "mean"])
+def test_decimator_in_uneven_chunks_matches_whole_window(mode):
+    frames = np.random.default_rng(0).normal(size=(100, 2, 6)).astype(np.float32)
+    decimator = Decimator(10, 2, mode=mode)
+    pieces = [decimator.push(frames[start:start + 25]) for start in range(0, 100, 25)]
+    assert [len(piece) for piece in pieces] == [2, 3, 2, 3]
+    np.testing.assert_allclose(np.concatenate(pieces), decimate_window(frames, 10, mode), rtol=1e-5, atol=1e-6)
+
+
+def test_grid_timesteps_from_model_input():
+    assert grid_timesteps((1, 300), 5) == 10
+    with pytest.raises(ValueError):
+        grid_timesteps((1, 300), 7)
@@ -0,0 +1,70 @@
+import struct
+
+import numpy as np
+
+from signspeak.bmi270_fifo import ACC_CONF
+from signspeak.drdy import (DRDY_INT1, INT1_IO_CTRL, INT_MAP_DATA, INT_OUTPUT_PUSH_PULL_HIGH, DataReadySampler,
+                            FakeGpio, enable_data_ready)
+from signspeak.i2cdev import FakeI2C
+from signspeak.imu import BMI270_ADDRESS, I2CWrapper, IMU_DATA_REG
+
+
+def sensor():
+    regs = bytearray(256)
+    regs[IMU_DATA_REG:IMU_DATA_REG + 12] = struct.pack("<6h", 1, 2, 3, 4, 5, 6)
+    bus = FakeI2C({BMI270_ADDRESS: regs})
+    return bus, I2CWrapper(bus, BMI270_ADDRESS)  # Unit scale until load_scales()
+
+
+def test_each_edge_fills_the_next_row():
+    gpio = FakeGpio()
+    try:
+        sampler = DataReadySampler([sensor()], [gpio.path], odr_hz=25)
+        gpio.start(rate_hz=200)
+        block = sampler.collect(np.zeros((5, 1, 6), np.float32))
+        gpio.stop()
+        assert sampler.valid.all()
+        assert sampler.edge_count == 5
+        np.testing.assert_array_equal(block[:, 0], np.tile(np.arange(1, 7, dtype=np.float32), (5, 1)))
+    finally:
+        sampler.edges.close()
+        gpio.close()
+
+
+def test_quiet_pin_times_out_with_rows_invalid():
+    gpio = FakeGpio()
+    try:
+        sampler = DataReadySampler([sensor()], [gpio.path], odr_hz=200, timeout_periods=2)
+        sampler.collect(np.zeros((3, 1, 6), np.float32))
+        assert not sampler.valid.any()
+        assert "3 reads missed" in sampler.summary()
+    finally:
+        sampler.edges.close()
+        gpio.close()
+
+
+def test_shared_pin_reads_its_bus_in_one_transfer():
+    regs = sensor()[0].devices[BMI270_ADDRESS]
+    bus = FakeI2C({BMI270_ADDRESS: regs, BMI270_ADDRESS + 1: regs})
+    gpio = FakeGpio()
+    try:
+        sampler = DataReadySampler([(bus, I2CWrapper(bus, address)) for address in (BMI270_ADDRESS, BMI270_ADDRESS + 1)],
+                                   [gpio.path], odr_hz=25)
+        gpio.start(rate_hz=200)
+        sampler.collect(np.zeros((4, 2, 6), np.float32))
+        gpio.stop()
+        assert sampler.valid.all()
+        assert bus.transfers == 4
+    finally:
+        sampler.edges.close()
+        gpio.close()
+
+
+def test_clocked_sensor_gets_the_rate_but_no_interrupt():
+    bus = FakeI2C({BMI270_ADDRESS: bytearray(256), BMI270_ADDRESS + 1: bytearray(256)})
+    enable_data_ready(bus, BMI270_ADDRESS, 100)
+    enable_data_ready(bus, BMI270_ADDRESS + 1, 100, pin=None)
+    clock, clocked = bus.devices[BMI270_ADDRESS], bus.devices[BMI270_ADDRESS + 1]
+    assert clock[ACC_CONF] == clocked[ACC_CONF] != 0
+    assert (clock[INT_MAP_DATA], clock[INT1_IO_CTRL]) == (DRDY_INT1, INT_OUTPUT_PUSH_PULL_HIGH)
+    assert (clocked[INT_MAP_DATA], clocked[INT1_IO_CTRL]) == (0, 0)
@@ -0,0 +1,118 @@
+import struct
+
+import numpy as np
+import pytest
+
+from signspeak.decimate import decimate_window
+from signspeak.i2cdev import FakeI2C, ReplayI2C
+from signspeak.imu import BMI270_ADDRESS, GRAVITY, I2CWrapper, IMU_DATA_REG
+from signspeak.multibus import MultiBusSampler
+from signspeak.mux import TCA9548A_ADDRESS, MuxManager
+
+TICKS = 10
+
+
+def bmi270_registers():
+    regs = bytearray(256)
+    regs[0x41] = 0x02  # ACC_RANGE +-8 g
+    regs[0x43] = 0x00  # GYR_RANGE +-2000 dps
+    return regs
+
+
+def raw_samples():
+    return np.arange(TICKS * 6, dtype=np.int16).reshape(TICKS, 6) * 37 - 1000
+
+
+def record(path):
+    """Log a scale read and TICKS data reads from a FakeI2C whose data registers change every read."""
+    with open(path, "w") as log:
+        fake = FakeI2C({BMI270_ADDRESS: bmi270_registers()}, log=log)
+        reader = I2CWrapper(fake, BMI270_ADDRESS)
+        reader.load_scales()
+        row = np.empty(6, np.float32)
+        for sample in raw_samples():
+            fake.devices[BMI270_ADDRESS][IMU_DATA_REG:IMU_DATA_REG + 12] = struct.pack("<6h", *sample)
+            reader.read_imu_into(row)
+    return fake
+
+
+def test_replay_window_matches_recording(tmp_path):
+    path = tmp_path / "bus.jsonl"
+    fake = record(path)
+    assert fake.transfers == TICKS + 1
+
+    bus = ReplayI2C(path)
+    reader = I2CWrapper(bus, BMI270_ADDRESS)
+    reader.load_scales()
+    sampler = MultiBusSampler([(None, bus, reader)], 0.001, TICKS)
+    block = sampler.collect(np.empty((TICKS, 1, 6), np.float32))
+
+    scale = np.array([GRAVITY / 4096] * 3 + [1 / 16.4] * 3, np.float32)
+    expected = raw_samples() * scale
+    assert sampler.valid.all()
+    assert bus.position == len(bus.records)
+    np.testing.assert_allclose(block[:, 0], expected, rtol=1e-6)
+    np.testing.assert_allclose(decimate_window(block, 5, "pick")[:, 0], expected[::2], rtol=1e-6)
+
+
+def test_replay_rejects_a_different_transfer(tmp_path):
+    path = tmp_path / "bus.jsonl"
+    record(path)
+    bus = ReplayI2C(path)
+    with pytest.raises(OSError, match="Transfer 0"):
+        bus.writeto(BMI270_ADDRESS, bytes([0x7E, 0xB6]))
+
+
+def test_fake_i2c_nacks_unknown_address():
+    bus = FakeI2C({BMI270_ADDRESS: bytearray(256)})
+    with pytest.raises(OSError):
+        bus.writeto_then_readfrom(0x69, bytes([0x00]), bytearray(1))
+
+
+def two_sensor_bus(log=None):
+    devices = {BMI270_ADDRESS: bmi270_registers(), BMI270_ADDRESS + 1: bmi270_registers()}
+    for offset, regs in enumerate(devices.values()):
+        regs[IMU_DATA_REG:IMU_DATA_REG + 12] = struct.pack("<6h", *(raw_samples()[offset]))
+    return FakeI2C(devices, log=log)
+
+
+def test_tick_is_one_transfer_per_bus(tmp_path):
+    path = tmp_path / "bus.jsonl"
+    with open(path, "w") as log:
+        fake = two_sensor_bus(log)
+        readers = [I2CWrapper(fake, address) for address in sorted(fake.devices)]
+        fake.reset_counters()
+        sampler = MultiBusSampler([(None, fake, reader) for reader in readers], 0.001, TICKS)
+        block = sampler.collect(np.empty((TICKS, 2, 6), np.float32))
+    assert fake.transfers == TICKS
+    assert sampler.valid.all()
+    np.testing.assert_array_equal(block[:, 0], np.broadcast_to(raw_samples()[0], (TICKS, 6)))
+    np.testing.assert_array_equal(block[:, 1], np.broadcast_to(raw_samples()[1], (TICKS, 6)))
+
+    bus = ReplayI2C(path)
+    readers = [I2CWrapper(bus, address) for address in sorted(fake.devices)]
+    sampler = MultiBusSampler([(None, bus, reader) for reader in readers], 0.001, TICKS)
+    np.testing.assert_array_equal(sampler.collect(np.empty((TICKS, 2, 6), np.float32)), block)
+    assert bus.position == len(bus.records)
+
+
+def test_muxed_tick_is_one_transfer():
+    fake = FakeI2C({TCA9548A_ADDRESS: bytearray(256), BMI270_ADDRESS: bmi270_registers()})
+    mux = MuxManager(fake)
+    reader = I2CWrapper(fake, BMI270_ADDRESS)
+    sampler = MultiBusSampler([(None, mux[channel], reader) for channel in (2, 5)], 0.001, TICKS)
+    sampler.collect(np.empty((TICKS, 2, 6), np.float32))
+    assert sampler.valid.all()
+    assert fake.transfers == TICKS
+    # Alternating order leaves the last channel of a tick selected for the next one
+    assert mux.switches == TICKS + 1
+    assert mux.saved == TICKS - 1
+
+
+def test_failed_batch_falls_back_to_single_reads():
+    fake = two_sensor_bus()
+    readers = [I2CWrapper(fake, address) for address in (BMI270_ADDRESS, 0x6A, BMI270_ADDRESS + 1)]
+    sampler = MultiBusSampler([(None, fake, reader) for reader in readers], 0.001, 2)
+    sampler.collect(np.empty((2, 3, 6), np.float32))
+    assert sampler.valid[:, [0, 2]].all()
+    assert not sampler.valid[:, 1].any()
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from signspeak.multibus import fill_gaps
+
+
+def block_of(values):
+    """(ticks, 1 sensor, 1 axis) block from a list of readings."""
+    return np.array(values, np.float32).reshape(-1, 1, 1)
+
+
+def test_fill_gaps_interpolates_inside_and_holds_edges():
+    block = block_of([0, 1, 99, 3, 99])
+    valid = np.array([False, True, False, True, False]).reshape(-1, 1)
+    assert fill_gaps(block, valid) == 3
+    np.testing.assert_array_equal(block.ravel(), [1, 1, 2, 3, 3])
+
+
+def test_fill_gaps_leaves_complete_sensors_alone():
+    block = np.arange(24, dtype=np.float32).reshape(4, 2, 3)
+    expected = block.copy()
+    valid = np.ones((4, 2), bool)
+    valid[2, 1] = False
+    assert fill_gaps(block, valid) == 1
+    np.testing.assert_array_equal(block[:, 0], expected[:, 0])
+    np.testing.assert_array_equal(block[2, 1], (expected[1, 1] + expected[3, 1]) / 2)
+
+
+def test_fill_gaps_single_reading_fills_everything():
+    block = block_of([99, 99, 5, 99])
+    assert fill_gaps(block, np.array([[False], [False], [True], [False]])) == 3
+    np.testing.assert_array_equal(block.ravel(), [5, 5, 5, 5])
+
+
+def test_fill_gaps_sensor_without_readings_raises():
+    with pytest.raises(RuntimeError, match="IMU 0"):
+        fill_gaps(block_of([1, 2]), np.zeros((2, 1), bool))
+
+
+def test_accumulated_blocks_report_as_one():
+    from signspeak.multibus import MultiBusSampler
+    from signspeak.replay import ReplayBus, ReplaySensor, ReplaySource
+
+    source = ReplaySource(np.zeros((4, 2, 6), np.float32), 0.001)
+    bus = ReplayBus([0, 1])
+    sampler = MultiBusSampler([(None, bus, ReplaySensor(source, i)) for i in range(2)], 0.001, 10)
+    block = np.empty((10, 2, 6), np.float32)
+    start_ns = None
+    for t in range(0, 10, 5):
+        sampler.collect(block[t:t + 5], start_ns, accumulate=t > 0)
+        start_ns = sampler.next_ns
+    assert sampler.summary().startswith("bus None: 10 ticks")
+    sampler.collect(block[:5])
+    assert sampler.summary().startswith("bus None: 5 ticks")
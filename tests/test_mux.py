@@ -0,0 +1,46 @@
+import io
+import json
+
+import pytest
+
+from signspeak.i2cdev import FakeI2C
+from signspeak.imu import BMI270_ADDRESS
+from signspeak.mux import TCA9548A_ADDRESS, MuxManager
+
+
+def mux_writes(log):
+    records = [json.loads(line) for line in log.getvalue().splitlines()]
+    return [msg["data"] for record in records for msg in record if msg["addr"] == TCA9548A_ADDRESS]
+
+
+def read_on(mux, channel):
+    port = mux[channel]
+    assert port.try_lock()
+    try:
+        port.writeto_then_readfrom(BMI270_ADDRESS, bytes([0x00]), bytearray(1))
+    finally:
+        port.unlock()
+
+
+def test_repeated_reads_on_a_channel_select_it_once():
+    log = io.StringIO()
+    bus = FakeI2C({TCA9548A_ADDRESS: bytearray(256), BMI270_ADDRESS: bytearray(256)}, log=log)
+    mux = MuxManager(bus)
+    for channel in (3, 3, 3, 5, 5, 3):
+        read_on(mux, channel)
+    assert mux_writes(log) == ["08", "20", "08"]
+    assert (mux.switches, mux.saved) == (3, 3)
+    assert mux.summary() == "mux writes 3 of 12 (9 saved)"
+
+
+def test_failed_select_forces_a_write_next_time():
+    bus = FakeI2C({BMI270_ADDRESS: bytearray(256)})  # No mux answering yet
+    mux = MuxManager(bus)
+    with pytest.raises(OSError):
+        mux[2].try_lock()
+    assert mux.selected is None
+    assert bus.try_lock()  # try_lock() gave the bus back when the select failed
+    bus.unlock()
+    bus.devices[TCA9548A_ADDRESS] = bytearray(256)
+    read_on(mux, 2)
+    assert (mux.switches, mux.saved) == (1, 0)
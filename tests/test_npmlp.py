@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pytest
+
+from signspeak.npmlp import NumpyMLP, StreamingMLP, extract
+
+MODEL = os.path.join(os.path.dirname(__file__), "..", "Machine Learning", "v3", "SIGNSPEAK_MLP_FINAL.tflite")
+
+
+@pytest.fixture(scope="module")
+def model(tmp_path_factory):
+    npz = tmp_path_factory.mktemp("model") / "model.npz"
+    extract(MODEL, npz)  # Reads the flatbuffer directly, no tflite needed
+    return NumpyMLP(str(npz))
+
+
+def test_streamed_first_layer_matches_full_inference(model):
+    windows = np.random.default_rng(2).normal(0, 3, size=(3, 10, 5, 6)).astype(np.float32)
+    streaming = StreamingMLP(model, 10, verify=True)
+    for window in windows:
+        streaming.start()
+        for timestep in window:
+            streaming.add(timestep)
+        streamed = streaming.finish(window)
+        np.testing.assert_allclose(streamed, model.predict(window.reshape(1, -1)), rtol=1e-4, atol=1e-6)
+    assert streaming.windows == 3
+    assert streaming.max_diff < 1e-5
+
+
+def test_streamed_window_must_be_complete(model):
+    streaming = StreamingMLP(model, 10)
+    streaming.start()
+    streaming.add(np.zeros((5, 6), np.float32))
+    with pytest.raises(ValueError, match="1 of 10"):
+        streaming.finish()
+    with pytest.raises(ValueError):
+        StreamingMLP(model, 7)
+
+
+def test_numpy_engine_batches_match_single_rows(model):
+    rows = np.random.default_rng(3).normal(size=(11, 300)).astype(np.float32)
+    batched = NumpyMLP(model.model_path, max_batch=4).predict(rows)
+    single = np.concatenate([model.predict([row[None]]) for row in rows])
+    np.testing.assert_allclose(batched, single, rtol=1e-5, atol=1e-7)
+    np.testing.assert_allclose(batched.sum(axis=1), 1.0, rtol=1e-5)
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+
+from signspeak.pipeline import AsyncStageQueue, Pipeline
+
+
+def test_drop_oldest_and_coalesce():
+    async def main():
+        dropping = AsyncStageQueue("drop", 2, "drop_oldest")
+        coalescing = AsyncStageQueue("coalesce", 5, "coalesce")
+        for i in range(4):
+            dropping.put_nowait(i)
+            coalescing.put_nowait(i)
+        assert dropping.dropped == 2 and coalescing.dropped == 3
+        return [await dropping.get(), await dropping.get(), await coalescing.get()]
+
+    assert [item for item, _ in asyncio.run(main())] == [2, 3, 3]
+
+
+def test_block_waits_for_room_and_stale_items_are_skipped():
+    async def main():
+        queue = AsyncStageQueue("block", 1, "block", max_age_s=1.0)
+        queue.put_nowait("stale", born_ns=time.monotonic_ns() - int(2e9))
+        with pytest.raises(asyncio.QueueFull):
+            queue.put_nowait("full")
+        producer = asyncio.create_task(queue.put("fresh"))
+        item, _ = await queue.get()
+        await producer
+        return item, queue.stale
+
+    assert asyncio.run(main()) == ("fresh", 1)
+
+
+def test_stages_batch_in_order():
+    async def main():
+        async def source():
+            for i in range(6):
+                yield i
+
+        seen = []
+        pipeline = Pipeline()
+        pipeline.add("acquire", source)
+        pipeline.add("double", lambda x: 2 * x, AsyncStageQueue("double", 8))
+
+        async def collect(items):
+            seen.append(list(items))
+            return [None] * len(items)
+
+        pipeline.add("collect", collect, AsyncStageQueue("collect", 8), batch=4)
+        tasks = pipeline.start()
+        while sum(map(len, seen)) < 6:
+            await asyncio.sleep(0.01)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return seen, pipeline.summary()
+
+    seen, summary = asyncio.run(main())
+    assert [x for batch in seen for x in batch] == [0, 2, 4, 6, 8, 10]
+    assert all(len(batch) <= 4 for batch in seen)
+    assert "collect: 6 items" in summary
+
+
+def test_failing_stage_ends_its_task_with_the_error():
+    async def main():
+        async def source():
+            yield 1
+
+        def fail(item):
+            raise RuntimeError("stage failed")
+
+        pipeline = Pipeline()
+        pipeline.add("acquire", source)
+        pipeline.add("fail", fail, AsyncStageQueue("fail"))
+        tasks = pipeline.start()
+        done, pending = await asyncio.wait(tasks, timeout=1, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        return [task.exception() for task in tasks if task in done and task.get_name() == "fail"]
+
+    errors = asyncio.run(main())
+    assert len(errors) == 1 and str(errors[0]) == "stage failed"
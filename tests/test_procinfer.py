@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pytest
+
+from signspeak.npmlp import NumpyMLP, extract
+from signspeak.procinfer import InferenceProcess
+
+MODEL = os.path.join(os.path.dirname(__file__), "..", "Machine Learning", "v3", "SIGNSPEAK_MLP_FINAL.tflite")
+
+
+@pytest.fixture(scope="module")
+def npz(tmp_path_factory):
+    path = tmp_path_factory.mktemp("model") / "model.npz"
+    extract(MODEL, path)
+    return str(path)
+
+
+def test_batches_match_the_model_in_process(npz):
+    model = NumpyMLP(npz)
+    process = InferenceProcess(npz, 5, 40, model.outputs, slots=2, max_batch=3)
+    try:
+        rng = np.random.default_rng(4)
+        windows = []
+        for _ in range(4):
+            for _ in range(10):
+                process.ring.push(rng.normal(0, 3, size=(5, 6)).astype(np.float32))
+            windows.append(process.ring.window(10))
+        predictions = process.predict(windows)
+        expected = model.predict([window.reshape(1, -1) for window in windows])
+        np.testing.assert_allclose(predictions, expected, rtol=1e-5, atol=1e-7)
+        assert (process.calls, process.windows) == (2, 4)  # 3 windows then 1
+    finally:
+        process.stop()
+
+
+def test_failed_start_frees_shared_memory(tmp_path):
+    before = set(os.listdir("/dev/shm"))
+    with pytest.raises(RuntimeError, match="failed to start"):
+        InferenceProcess(str(tmp_path / "missing.npz"), 5, 40, 4)
+    assert set(os.listdir("/dev/shm")) <= before
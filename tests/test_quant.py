@@ -0,0 +1,29 @@
+import numpy as np
+
+from signspeak.quant import dequantize, quantize_into, tensor_quantization
+
+
+def int8_details(scale=0.05, zero_point=-10):
+    return {"dtype": np.int8, "quantization": (scale, zero_point)}
+
+
+def test_float_tensors_have_no_quantization():
+    assert tensor_quantization({"dtype": np.float32, "quantization": (0.0, 0)}) is None
+    assert tensor_quantization({"dtype": np.int8, "quantization": (0.0, 0)}) is None
+    assert tensor_quantization(int8_details()) == (0.05, -10)
+
+
+def test_quantize_clips_to_int8():
+    out = np.empty(6, np.int8)
+    quantize_into(np.array([-100.0, -6.9, 0.0, 6.85, 6.9, 100.0], np.float32), out, (0.05, -10))
+    np.testing.assert_array_equal(out, [-128, -128, -10, 127, 127, 127])  # -148 and 128 clip
+
+
+def test_round_trip_within_half_a_step():
+    quantization = tensor_quantization(int8_details())
+    values = np.linspace(-5.8, 6.3, 50, dtype=np.float32)  # inside the int8 range at this scale
+    out = np.empty(values.shape, np.int8)
+    quantize_into(values, out, quantization)
+    restored = dequantize(out, quantization)
+    assert restored.dtype == np.float32
+    np.testing.assert_allclose(restored, values, atol=0.05 / 2 + 1e-6)
@@ -0,0 +1,61 @@
+import types
+
+import numpy as np
+import pytest
+
+from signspeak import replay
+from signspeak.replay import ReplaySensor, ReplaySource, load_csv
+
+
+def write_csv(path, header, rows):
+    path.write_text("\n".join(",".join(str(v) for v in row) for row in [header] + rows) + "\n")
+    return str(path)
+
+
+def test_windows_layout_is_timestep_major(tmp_path):
+    # 2 gestures x 2 timesteps x 2 sensors x 6 axes, value = its flat position in the file
+    header = [f"t{t}imu{s}{axis}" for t in (1, 2) for s in (1, 2)
+              for axis in ("accx", "accy", "accz", "gyrox", "gyroy", "gyroz")] + ["gesture"]
+    rows = [list(range(g * 24, g * 24 + 24)) + [name] for g, name in enumerate(("hello", "yes"))]
+    frames, period_s, labels = load_csv(write_csv(tmp_path / "windows.csv", header, rows), sensors=2, window_s=1.0)
+    assert frames.shape == (4, 2, 6)
+    np.testing.assert_array_equal(frames.ravel(), np.arange(48))
+    assert period_s == 0.5
+    assert labels == ["hello", "hello", "yes", "yes"]
+
+
+def test_stream_layout_takes_the_period_from_the_time_column(tmp_path):
+    header = ["time"] + [f"v{i}" for i in range(6)]
+    rows = [[f"{t * 0.02:.2f}"] + [t] * 6 for t in range(5)]
+    frames, period_s, labels = load_csv(write_csv(tmp_path / "stream.csv", header, rows), sensors=1)
+    assert frames.shape == (5, 1, 6)
+    np.testing.assert_array_equal(frames[:, 0, 0], np.arange(5))
+    assert period_s == pytest.approx(0.02)
+    assert labels is None
+
+
+def test_column_count_must_fit_the_sensors(tmp_path):
+    path = write_csv(tmp_path / "bad.csv", [f"v{i}" for i in range(7)], [list(range(7))])
+    with pytest.raises(ValueError, match="7 value columns"):
+        load_csv(path, sensors=1)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = types.SimpleNamespace(value=100.0)
+    monkeypatch.setattr(replay, "time", types.SimpleNamespace(monotonic=lambda: now.value, sleep=lambda s: None))
+    return now
+
+
+def test_speed_scales_playback_and_the_recording_loops(clock):
+    frames = np.arange(4 * 6, dtype=np.float32).reshape(4, 1, 6)
+    source = ReplaySource(frames, 0.1, labels=list("abcd"), speed=2.0)
+    sensor = ReplaySensor(source, 0)
+    out = np.empty(6, np.float32)
+    seen = []
+    for elapsed in (0.0, 0.04, 0.06, 0.16, 0.21, 0.26):  # wall seconds; 2x speed means 0.05 s per frame
+        clock.value = 100.0 + elapsed
+        sensor.read_imu_into(out)
+        seen.append((source.index(), source.label(), out[0]))
+    assert seen == [(0, "a", 0), (0, "a", 0), (1, "b", 6), (3, "d", 18), (0, "a", 0), (1, "b", 6)]
+    assert sensor.reads == 6
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from signspeak.ring import WindowRing
+
+
+def frame(i):
+    return np.full((2, 6), i, np.float32)
+
+
+def test_window_is_contiguous_across_wraparound():
+    ring = WindowRing(2, 4)
+    for i in range(7):
+        ring.push(frame(i))
+    window = ring.window(4)
+    assert window.flags.c_contiguous
+    np.testing.assert_array_equal(window[:, 0, 0], [3, 4, 5, 6])
+    np.testing.assert_array_equal(ring.window(2, end=5)[:, 1, 5], [3, 4])
+
+
+def test_reserve_and_commit_across_the_end():
+    ring = WindowRing(1, 5)
+    for n, start in ((3, 0), (4, 3)):
+        ring.reserve(n)[:, 0, 0] = np.arange(start, start + n)
+        ring.commit(n)
+    np.testing.assert_array_equal(ring.window(5)[:, 0, 0], [2, 3, 4, 5, 6])
+    with pytest.raises(ValueError):
+        ring.reserve(6)
+
+
+def test_window_outside_the_ring_raises():
+    ring = WindowRing(1, 4)
+    for i in range(6):
+        ring.push(np.full((1, 6), i, np.float32))
+    with pytest.raises(IndexError):
+        ring.window(4, end=3)  # Overwritten
+    with pytest.raises(IndexError):
+        ring.window(2, end=7)  # Not sampled yet
+    with pytest.raises(IndexError):
+        ring.window(5)
+
+
+def test_offset_locates_windows_and_their_reshapes():
+    ring = WindowRing(2, 4)
+    for i in range(6):
+        ring.push(frame(i))
+    window = ring.window(3)
+    offset = ring.offset(window)
+    assert ring.offset(window.reshape(1, -1)) == offset
+    np.testing.assert_array_equal(ring._buf[offset:offset + 3], window)
+    with pytest.raises(ValueError):
+        ring.offset(np.zeros((3, 2, 6), np.float32))
+    with pytest.raises(ValueError):
+        ring.offset(window[:, 1])  # Starts halfway into a row
+
+
+def test_shared_buffer_holds_the_rows():
+    buffer = bytearray(WindowRing.nbytes(2, 4))
+    ring = WindowRing(2, 4, buffer=buffer)
+    ring.push(frame(7))
+    assert np.frombuffer(buffer, np.float32)[0] == 7
+
+
+def test_close_releases_a_shared_memory_buffer():
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(create=True, size=WindowRing.nbytes(2, 4))
+    try:
+        ring = WindowRing(2, 4, buffer=shm.buf)
+        ring.push(frame(1))
+        ring.close()
+        shm.close()  # BufferError while the ring still exported a view
+    finally:
+        shm.unlink()
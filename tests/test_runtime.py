@@ -0,0 +1,25 @@
+import asyncio
+import os
+
+from signspeak.drdy import FakeGpio
+from signspeak.runtime import GpioWatch
+
+
+def test_gpio_watch_reports_edges_and_holds_the_level():
+    gpio = FakeGpio()
+    watch = GpioWatch(gpio.path)
+    writer = os.open(gpio.path, os.O_WRONLY | os.O_NONBLOCK)  # Stays open, like a pin that keeps its level
+
+    async def main():
+        os.write(writer, b"0\n")
+        first = await asyncio.wait_for(watch.edge(), 1)
+        os.write(writer, b"1\n")
+        second = await asyncio.wait_for(watch.edge(), 1)
+        return first, second, watch.value()
+
+    try:
+        assert asyncio.run(main()) == ("0", "1", "1")
+    finally:
+        watch.close()
+        os.close(writer)
+        gpio.close()
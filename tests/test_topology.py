@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from signspeak.bmi270_fifo import ACC_RANGE, GYR_RANGE, PWR_CTRL
+from signspeak.i2cdev import FakeI2C
+from signspeak.imu import BMI270_ADDRESS
+from signspeak.multibus import SensorSlot
+from signspeak.topology import (BMI270_CHIP_ID, CHIP_ID, INIT_OK, INTERNAL_STATUS, TopologyCache, read_state,
+                                sensor_ready)
+
+
+def initialized_sensor():
+    regs = bytearray(256)
+    regs[CHIP_ID] = BMI270_CHIP_ID
+    regs[INTERNAL_STATUS] = INIT_OK
+    regs[ACC_RANGE] = 0x02
+    regs[GYR_RANGE] = 0x00
+    regs[PWR_CTRL] = 0x0E  # acc, gyr and temperature on
+    bus = FakeI2C({BMI270_ADDRESS: regs})
+    return bus, bus.devices[BMI270_ADDRESS], read_state(bus, BMI270_ADDRESS)
+
+
+def test_untouched_sensor_is_ready():
+    bus, _, state = initialized_sensor()
+    assert state == {"acc_range": 0x02, "gyr_range": 0x00, "pwr_ctrl": 0x0E}
+    assert sensor_ready(bus, BMI270_ADDRESS, state)
+
+
+@pytest.mark.parametrize("reg, value", [
+    (CHIP_ID, 0x26),            # a different chip answering at the address
+    (INTERNAL_STATUS, 0x00),    # reset since, config blob gone
+    (ACC_RANGE, 0x03),          # ranges changed under us
+    (GYR_RANGE, 0x01),
+    (PWR_CTRL, 0x00),           # acc and gyr powered off
+])
+def test_changed_sensor_forces_a_rescan(reg, value):
+    bus, regs, state = initialized_sensor()
+    regs[reg] = value
+    assert not sensor_ready(bus, BMI270_ADDRESS, state)
+
+
+def test_missing_sensor_is_not_ready():
+    _, _, state = initialized_sensor()
+    assert not sensor_ready(FakeI2C({}), BMI270_ADDRESS, state)
+
+
+def test_cache_round_trip(tmp_path):
+    path = str(tmp_path / "topology.json")
+    slots = [SensorSlot(None, 0x70, 0, 0x68), SensorSlot(2, None, None, 0x69)]
+    states = {slot: {"acc_range": 2, "gyr_range": 0, "pwr_ctrl": 14} for slot in slots}
+    TopologyCache(path).save(slots, states)
+    cache = TopologyCache(path)
+    assert cache.load()
+    assert (cache.slots, cache.states) == (slots, states)
+    cache.clear()
+    assert not TopologyCache(path).load()
+
+
+@pytest.mark.parametrize("content", ["{not json", json.dumps({"version": 0, "sensors": []})])
+def test_unreadable_or_outdated_cache_loads_empty(tmp_path, content):
+    path = tmp_path / "topology.json"
+    path.write_text(content)
+    cache = TopologyCache(str(path))
+    assert not cache.load()
+    assert cache.slots == []
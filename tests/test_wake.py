@@ -0,0 +1,67 @@
+import threading
+import time
+
+from signspeak.drdy import FakeGpio
+from signspeak.i2cdev import FakeI2C
+from signspeak.imu import BMI270_ADDRESS
+from signspeak.wake import (ACC_CONF, ACC_CONF_LOW_POWER, ANY_MOT_INT, ANY_MOT_OFFSET, ANY_MOT_PAGE, FEAT_PAGE,
+                            FEATURE_PAGE_BYTES, FEATURES, INT1_MAP_FEAT, INT_STATUS_0, PWR_CONF, PWR_CONF_APS, PWR_CTRL,
+                            PWR_CTRL_ACC_ONLY, AnyMotionWake)
+
+
+def wake_bus():
+    return FakeI2C({BMI270_ADDRESS: bytearray(256)})
+
+
+def test_gpio_wait_is_silent_until_the_edge():
+    bus = wake_bus()
+    gpio = FakeGpio()
+    wake = AnyMotionWake([bus], [BMI270_ADDRESS], gpio_path=gpio.path)
+    counts = []
+
+    def move():
+        counts.append(bus.transfers)
+        time.sleep(0.1)
+        counts.append(bus.transfers)
+        bus.devices[BMI270_ADDRESS][INT_STATUS_0] = ANY_MOT_INT
+        gpio.pulse()
+
+    try:
+        threading.Timer(0.1, move).start()
+        assert wake.sleep_until_motion() == 0
+        assert counts[0] == counts[1]  # No status polling while the pin is quiet
+    finally:
+        gpio.close()
+
+
+def test_cancel_ends_the_gpio_wait_at_once():
+    gpio = FakeGpio()
+    wake = AnyMotionWake([wake_bus()], [BMI270_ADDRESS], gpio_path=gpio.path, poll_s=10)
+    try:
+        threading.Timer(0.1, wake.cancel).start()
+        start = time.monotonic()
+        assert wake.sleep_until_motion() is None
+        assert time.monotonic() - start < 1
+    finally:
+        gpio.close()
+
+
+def test_arm_writes_the_feature_page_and_disarm_restores_the_registers():
+    bus = wake_bus()
+    regs = bus.devices[BMI270_ADDRESS]
+    regs[:] = bytes(range(256))[::-1]  # Arbitrary, distinct starting values
+    regs[INT_STATUS_0] = 0
+    before = bytes(regs)
+    wake = AnyMotionWake([bus], [BMI270_ADDRESS], threshold_g=0.096, duration_s=0.2)
+
+    wake.arm()
+    page = FEATURES + ANY_MOT_OFFSET
+    assert regs[FEAT_PAGE] == ANY_MOT_PAGE
+    assert regs[page:page + 4] == bytes([10, 0xE0, 200, 0x80])  # 10 x 20 ms, xyz; 200 x 0.48 mg, enabled
+    assert regs[INT1_MAP_FEAT] & ANY_MOT_INT
+    assert (regs[PWR_CONF], regs[PWR_CTRL], regs[ACC_CONF]) == (PWR_CONF_APS, PWR_CTRL_ACC_ONLY, ACC_CONF_LOW_POWER)
+
+    wake.disarm()
+    assert regs[page + 3] & 0x80 == 0  # any-motion off again
+    outside_page = [reg for reg in range(256) if not FEATURES <= reg < FEATURES + FEATURE_PAGE_BYTES]
+    assert [regs[reg] for reg in outside_page] == [before[reg] for reg in outside_page]